@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+"""
+Serviço HTTP/JSON de Precificação (Local)
+-----------------------------------------
+Expõe as fórmulas do simulador para outras ferramentas internas, sem abrir
+a GUI. Usa apenas a biblioteca padrão: ThreadingHTTPServer em HTTP/1.1
+(conexões keep-alive, todas as respostas com Content-Length), uma thread
+por conexão e um semáforo que limita quantos PDFs são montados ao mesmo
+tempo. Quando todas as vagas de PDF estão ocupadas, o pedido espera até
+`espera_pdf` segundos e depois recebe 503 com Retry-After, em vez de se
+acumular.
+
+Rotas (corpo e resposta em JSON, com os mesmos campos dos registros de
+main_lote.py; datas em DD/MM/AAAA ou AAAA-MM-DD):
+    GET  /saude                       estado do serviço e impressão digital de core/constants.py
+    POST /validar     {"perfil": {...}}            erros de validação e alertas
+    POST /taxa        {"perfil": {...}}            taxa horária e fatores (?detalhes=1 inclui as explicações)
+    POST /precificar  {"perfil": {...}, "servicos": [{...}, ...]}
+                                                   preço de vários serviços do mesmo perfil num só pedido
+    POST /relatorio?formato=pdf|json|html|csv  {"perfil": {...}}
+                                                   relatório completo (PDF limitado pelo semáforo)
+
+Exemplo:
+    python main_servico.py --porta 8765
+    curl -s localhost:8765/precificar -d '{"perfil": {...}, "servicos": [{"horas_estimadas_servico": 10}]}'
+"""
+
+import json
+import threading
+from collections.abc import Mapping
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from core import formulas
+from core.processamento_lote import converter_registro
+from core.utils import impressao_constantes
+from core.validacao import validar_dados_simulacao, verificar_alertas
+
+LIMITE_CORPO: int = 1024 * 1024 # Maior corpo de pedido aceito (bytes)
+LIMITE_SERVICOS: int = 1000     # Máximo de serviços por pedido em /precificar
+# Campos que só afetam o preço do serviço (não a taxa horária)
+CAMPOS_SERVICO: frozenset[str] = frozenset({
+    'horas_estimadas_servico', 'nivel_complexidade_servico', 'nivel_urgencia_servico',
+    'valor_estimado_causa_ganha', 'percentual_exito',
+})
+TIPOS_RELATORIO: dict[str, str] = {
+    'pdf': "application/pdf",
+    'json': "application/json; charset=utf-8",
+    'html': "text/html; charset=utf-8",
+    'csv': "text/csv; charset=utf-8",
+}
+
+
+class ErroPedido(Exception):
+    """Erro atribuível ao pedido (não ao servidor): vira uma resposta JSON com o status informado."""
+
+    def __init__(self, status: HTTPStatus, mensagem: str, cabecalhos: dict | None = None):
+        super().__init__(mensagem)
+        self.status = status
+        self.cabecalhos = cabecalhos or {}
+
+
+def _json_padrao(valor):
+    """Serialização dos tipos que o json não conhece (explicações, datas)."""
+    if isinstance(valor, Mapping):
+        return dict(valor)
+    if isinstance(valor, date):
+        return valor.isoformat()
+    return str(valor)
+
+
+def _constante_invalida(nome: str):
+    """NaN, Infinity e -Infinity não fazem parte do JSON padrão: o json do Python os aceitaria."""
+    raise ErroPedido(HTTPStatus.BAD_REQUEST, f"JSON inválido: {nome} não é um número válido.")
+
+
+def _perfil(corpo: dict, hoje: date, extra: dict | None = None) -> dict:
+    """Converte e valida o perfil do pedido (com os campos de `extra` sobrepostos); ValueError se inválido."""
+    registro = corpo.get('perfil')
+    if not isinstance(registro, dict):
+        raise ErroPedido(HTTPStatus.BAD_REQUEST, "Informe o objeto 'perfil' no corpo do pedido.")
+    dados = converter_registro({**registro, **(extra or {})}, hoje)
+    validar_dados_simulacao(dados, hoje)
+    return dados
+
+
+# --- Rotas ---
+# Cada rota recebe (servidor, corpo, consulta, hoje) e devolve (conteúdo, tipo):
+# um objeto serializável em JSON (tipo None) ou bytes já prontos com o Content-Type.
+
+def _rota_saude(servidor, corpo, consulta, hoje):
+    return {'status': 'ok', 'constantes': impressao_constantes(), 'vagas_pdf': servidor.limite_pdf}, None
+
+
+def _rota_validar(servidor, corpo, consulta, hoje):
+    try:
+        dados = _perfil(corpo, hoje)
+    except ValueError as ve:
+        return {'valido': False, 'erro': str(ve), 'alertas': []}, None
+    return {'valido': True, 'erro': None, 'alertas': verificar_alertas(dados)}, None
+
+
+def _rota_taxa(servidor, corpo, consulta, hoje):
+    dados = _perfil(corpo, hoje)
+    taxa, detalhes = formulas.calcular_taxa_horaria_sugerida(dados, data_referencia=hoje)
+    resposta = {'taxa_horaria_sugerida': taxa, 'fatores': detalhes['Fatores Multiplicadores']}
+    if consulta.get('detalhes') in ('1', 'true', 'sim'): # As explicações só são formatadas se pedidas
+        resposta['detalhes'] = detalhes['Detalhes dos Fatores']
+    return resposta, None
+
+
+def _rota_precificar(servidor, corpo, consulta, hoje):
+    servicos = corpo.get('servicos', [{}])
+    if not isinstance(servicos, list) or not all(isinstance(s, dict) for s in servicos):
+        raise ErroPedido(HTTPStatus.BAD_REQUEST, "'servicos' deve ser uma lista de objetos.")
+    if len(servicos) > LIMITE_SERVICOS:
+        raise ErroPedido(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"No máximo {LIMITE_SERVICOS} serviços por pedido.")
+
+    # A taxa horária não depende dos campos do serviço: é calculada uma vez por combinação
+    # dos demais campos sobrepostos ao perfil (normalmente só a área)
+    taxas = {}
+    resultados = []
+    for servico in servicos:
+        try:
+            dados = _perfil(corpo, hoje, servico)
+        except ValueError as ve:
+            resultados.append({'status': 'erro', 'erro': str(ve)})
+            continue
+        chave_taxa = json.dumps({k: v for k, v in servico.items() if k not in CAMPOS_SERVICO}, sort_keys=True, default=str)
+        if chave_taxa not in taxas:
+            taxas[chave_taxa] = formulas.calcular_taxa_horaria_sugerida(dados, data_referencia=hoje)[0]
+        taxa = taxas[chave_taxa]
+        preco, _ = formulas.calcular_preco_final_servico(taxa, dados)
+        percentual = dados.get('percentual_exito', 0.0)
+        resultados.append({
+            'status': 'ok',
+            'taxa_horaria_sugerida': taxa,
+            'preco_final': preco,
+            'preco_exito_sugerido': preco * percentual / 100.0 if percentual > 0 else None,
+            'alertas': verificar_alertas(dados),
+        })
+    return {'resultados': resultados}, None
+
+
+def _rota_relatorio(servidor, corpo, consulta, hoje):
+    formato = consulta.get('formato', 'pdf').lower()
+    if formato not in TIPOS_RELATORIO:
+        raise ErroPedido(HTTPStatus.BAD_REQUEST, f"Formato inválido: '{formato}'. Use um de: {', '.join(TIPOS_RELATORIO)}.")
+    dados = _perfil(corpo, hoje)
+    calculos = formulas.calcular_simulacao(dados, data_referencia=hoje)
+
+    if formato != 'pdf': # Escritores leves: sem ReportLab e sem disputar as vagas de PDF
+        from reports.exportadores import exportar_texto
+        return exportar_texto(dados, calculos, formato).encode("utf-8"), TIPOS_RELATORIO[formato]
+
+    if not servidor.vagas_pdf.acquire(timeout=servidor.espera_pdf):
+        raise ErroPedido(HTTPStatus.SERVICE_UNAVAILABLE, "Geração de PDF ocupada; tente novamente.",
+                         {'Retry-After': "1"})
+    try:
+        from reports.pdf_generator import gerar_pdf_memoria
+        return gerar_pdf_memoria(dados, calculos), TIPOS_RELATORIO['pdf']
+    finally:
+        servidor.vagas_pdf.release()
+
+
+ROTAS = {
+    ('GET', '/saude'): _rota_saude,
+    ('POST', '/validar'): _rota_validar,
+    ('POST', '/taxa'): _rota_taxa,
+    ('POST', '/precificar'): _rota_precificar,
+    ('POST', '/relatorio'): _rota_relatorio,
+}
+
+
+# --- Servidor ---
+
+class _Manipulador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Mantém a conexão aberta entre pedidos (keep-alive)
+    timeout = 30                  # Fecha conexões ociosas (libera a thread)
+    disable_nagle_algorithm = True # Respostas pequenas saem sem esperar o ACK atrasado do cliente (~40 ms)
+    server_version = "SimuladorHonorarios/1.0"
+
+    def do_GET(self):
+        self._atender('GET')
+
+    def do_POST(self):
+        self._atender('POST')
+
+    def _ler_corpo(self) -> dict:
+        if self.headers.get('Transfer-Encoding'): # Corpo em partes (chunked) não é suportado
+            self.close_connection = True
+            raise ErroPedido(HTTPStatus.LENGTH_REQUIRED, "Informe o corpo com Content-Length.")
+        try:
+            tamanho = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0:
+            self.close_connection = True # Sem tamanho válido, não há como saber onde o corpo termina
+            raise ErroPedido(HTTPStatus.BAD_REQUEST, "Content-Length inválido.")
+        if tamanho > LIMITE_CORPO:
+            self.close_connection = True # O corpo não será lido
+            raise ErroPedido(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Corpo maior que {LIMITE_CORPO} bytes.")
+        if not tamanho:
+            return {}
+        dados = self.rfile.read(tamanho)
+        try:
+            corpo = json.loads(dados, parse_constant=_constante_invalida)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ErroPedido(HTTPStatus.BAD_REQUEST, f"JSON inválido: {e}")
+        if not isinstance(corpo, dict):
+            raise ErroPedido(HTTPStatus.BAD_REQUEST, "O corpo deve ser um objeto JSON.")
+        return corpo
+
+    def _atender(self, metodo: str) -> None:
+        url = urlsplit(self.path)
+        consulta = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+        cabecalhos = {}
+        try:
+            # O corpo é lido antes de tudo: na conexão keep-alive, o próximo pedido começa logo depois dele
+            corpo = self._ler_corpo() if metodo == 'POST' else {}
+            rota = ROTAS.get((metodo, url.path.rstrip('/') or '/'))
+            if rota is None:
+                raise ErroPedido(HTTPStatus.NOT_FOUND, f"Rota desconhecida: {metodo} {url.path}")
+            conteudo, tipo = rota(self.server, corpo, consulta, date.today())
+            status = HTTPStatus.OK
+        except ErroPedido as erro:
+            status, conteudo, tipo, cabecalhos = erro.status, {'erro': str(erro)}, None, erro.cabecalhos
+        except ValueError as ve: # Regras de validação (core/validacao.py)
+            status, conteudo, tipo = HTTPStatus.UNPROCESSABLE_ENTITY, {'erro': str(ve)}, None
+        except Exception as e:
+            self.log_error("Erro ao atender %s %s: %s: %s", metodo, self.path, type(e).__name__, e)
+            status, conteudo, tipo = HTTPStatus.INTERNAL_SERVER_ERROR, {'erro': "Erro interno do servidor."}, None
+
+        if tipo is None:
+            try: # allow_nan=False: a resposta nunca leva NaN/Infinity, que clientes JSON padrão não leem
+                conteudo = json.dumps(conteudo, ensure_ascii=False, allow_nan=False, default=_json_padrao)
+            except ValueError as e:
+                self.log_error("Resposta não serializável para %s %s: %s", metodo, self.path, e)
+                status, cabecalhos = HTTPStatus.INTERNAL_SERVER_ERROR, {}
+                conteudo = json.dumps({'erro': "Erro interno do servidor."}, ensure_ascii=False)
+            conteudo = conteudo.encode("utf-8")
+            tipo = "application/json; charset=utf-8"
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(conteudo)))
+        for nome, valor in cabecalhos.items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def log_message(self, formato, *args):
+        if self.server.registrar_acessos:
+            super().log_message(formato, *args)
+
+
+class ServicoPrecificacao(ThreadingHTTPServer):
+    """Servidor HTTP do serviço de precificação (uma thread por conexão, PDFs limitados por semáforo)."""
+
+    daemon_threads = True
+    request_queue_size = 128 # Fila de conexões pendentes do socket (rajadas de clientes)
+
+    def __init__(self, endereco: tuple[str, int] = ("127.0.0.1", 8765), limite_pdf: int = 2,
+                 espera_pdf: float = 5.0, registrar_acessos: bool = False):
+        if limite_pdf < 1:
+            raise ValueError("O limite de PDFs simultâneos deve ser de pelo menos 1.")
+        super().__init__(endereco, _Manipulador)
+        self.limite_pdf = limite_pdf
+        self.vagas_pdf = threading.BoundedSemaphore(limite_pdf)
+        self.espera_pdf = espera_pdf
+        self.registrar_acessos = registrar_acessos
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+
+"""
+Fila de Tarefas Assíncrona (asyncio) com Controle de Admissão
+-------------------------------------------------------------
+Recebe tarefas de precificação e de relatório vindas de vários front ends.
+Precificações são baratas e rodam na hora, no próprio loop. Relatórios
+entram numa fila limitada (asyncio.Queue com `capacidade_relatorios`) e
+são renderizados por `limite_relatorios` trabalhadores, cada um com um
+processo "aquecido" do pool (ReportLab e estilos carregados na
+inicialização). O PDF fica fora do GIL do loop, que continua atendendo.
+
+Com a fila cheia, enviar_relatorio() recusa na hora com FilaCheia
+(descarte de carga: o cliente pode tentar de novo), enquanto
+enviar_relatorio_aguardando() aplica contrapressão, suspendendo o produtor
+até abrir vaga. Tarefas concluídas ficam consultáveis até serem
+descartadas pelas `tarefas_guardadas` mais recentes, então a memória não
+cresce com o tempo de execução. Tarefas canceladas saem da fila na hora,
+liberando a vaga; se um processo do pool morrer (BrokenProcessPool), as
+tarefas afetadas terminam com erro e o pool é recriado.
+
+Exemplo:
+    async with FilaTarefas(limite_relatorios=2, capacidade_relatorios=32) as fila:
+        tarefa = fila.enviar_relatorio(registro, formato='pdf')
+        await fila.aguardar(tarefa.id, timeout=30)
+        pdf = tarefa.resultado  # bytes
+"""
+
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+
+from core import formulas
+from core.processamento_lote import converter_registro
+from core.validacao import validar_dados_simulacao, verificar_alertas
+
+FORMATOS_RELATORIO: tuple[str, ...] = ('pdf', 'json', 'html', 'csv')
+
+
+class FilaCheia(Exception):
+    """A fila de relatórios está sem vaga: o pedido foi recusado sem ser enfileirado."""
+
+
+class Tarefa:
+    """Estado e resultado de uma tarefa (estados: na_fila, executando, concluida, erro, cancelada)."""
+
+    __slots__ = ('id', 'tipo', 'estado', 'resultado', 'erro', 'criada_em', 'concluida_em', '_fim')
+
+    def __init__(self, id_tarefa: int, tipo: str):
+        self.id = id_tarefa
+        self.tipo = tipo
+        self.estado = 'na_fila'
+        self.resultado = None
+        self.erro = None
+        self.criada_em = time.time()
+        self.concluida_em = None
+        self._fim = asyncio.Event()
+
+    def _finalizar(self, estado: str, resultado=None, erro: str | None = None) -> None:
+        self.estado = estado
+        self.resultado = resultado
+        self.erro = erro
+        self.concluida_em = time.time()
+        self._fim.set()
+
+    def resumo(self) -> dict:
+        """Estado da tarefa sem o conteúdo (relatórios são informados só pelo tamanho)."""
+        resumo = {'id': self.id, 'tipo': self.tipo, 'estado': self.estado, 'erro': self.erro,
+                  'criada_em': self.criada_em, 'concluida_em': self.concluida_em}
+        if isinstance(self.resultado, bytes):
+            resumo['tamanho'] = len(self.resultado)
+        elif self.resultado is not None:
+            resumo['resultado'] = self.resultado
+        return resumo
+
+    def __repr__(self) -> str:
+        return f"Tarefa({self.id}, {self.tipo!r}, {self.estado!r})"
+
+
+# --- Execução nos processos do pool ---
+
+def _aquecer_processo() -> None:
+    """Inicializador dos processos: importa o ReportLab e monta os estilos antes do primeiro relatório."""
+    from reports.pdf_generator import estilos_relatorio
+    estilos_relatorio()
+
+
+def _renderizar(dados: dict, formato: str, hoje: date) -> bytes:
+    """Calcula a simulação e gera o relatório no formato pedido (executado num processo do pool)."""
+    calculos = formulas.calcular_simulacao(dados, data_referencia=hoje)
+    if formato == 'pdf':
+        from reports.pdf_generator import gerar_pdf_memoria
+        return bytes(gerar_pdf_memoria(dados, calculos))
+    from reports.exportadores import exportar_texto
+    return exportar_texto(dados, calculos, formato).encode("utf-8")
+
+
+# --- Fila ---
+
+class _FilaRelatorios(asyncio.Queue):
+    """asyncio.Queue que permite retirar uma tarefa cancelada, liberando a vaga na hora."""
+
+    def remover(self, tarefa: Tarefa) -> bool:
+        for item in self._queue:
+            if item[0] is tarefa:
+                self._queue.remove(item)
+                self.task_done()
+                self._wakeup_next(self._putters) # Um produtor aguardando vaga pode seguir
+                return True
+        return False
+
+
+class FilaTarefas:
+    """Admissão, execução e consulta de tarefas de precificação e de relatório."""
+
+    def __init__(self, limite_relatorios: int = 2, capacidade_relatorios: int = 64,
+                 tarefas_guardadas: int = 1000):
+        if limite_relatorios < 1 or capacidade_relatorios < 1 or tarefas_guardadas < 1:
+            raise ValueError("Limite, capacidade e tarefas guardadas devem ser de pelo menos 1.")
+        self.limite_relatorios = limite_relatorios
+        self.capacidade_relatorios = capacidade_relatorios
+        self.tarefas_guardadas = tarefas_guardadas
+        self._ids = itertools.count(1)
+        self._tarefas: dict[int, Tarefa] = {}
+        self._finalizadas: OrderedDict[int, None] = OrderedDict() # Ordem de conclusão, para o descarte
+        self._descartadas = 0 # Pedidos recusados por falta de vaga
+        self._fila: _FilaRelatorios | None = None
+        self._trabalhadores: list[asyncio.Task] = []
+        self._pool: Executor | None = None
+
+    def _novo_pool(self) -> Executor:
+        return ProcessPoolExecutor(max_workers=self.limite_relatorios, initializer=_aquecer_processo)
+
+    async def iniciar(self) -> None:
+        """Cria a fila, o pool de processos e os trabalhadores (chamar dentro do loop)."""
+        self._fila = _FilaRelatorios(maxsize=self.capacidade_relatorios)
+        self._pool = self._novo_pool()
+        self._trabalhadores = [asyncio.create_task(self._trabalhador()) for _ in range(self.limite_relatorios)]
+
+    async def encerrar(self) -> None:
+        """Cancela as tarefas ainda na fila, para os trabalhadores e libera os processos."""
+        while self._fila is not None and not self._fila.empty():
+            tarefa, _, _, _ = self._fila.get_nowait()
+            self._concluir(tarefa, 'cancelada', erro="Fila encerrada.")
+        for trabalhador in self._trabalhadores:
+            trabalhador.cancel()
+        await asyncio.gather(*self._trabalhadores, return_exceptions=True)
+        self._trabalhadores = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def __aenter__(self):
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *excecao):
+        await self.encerrar()
+
+    # --- Registro das tarefas ---
+
+    def _nova(self, tipo: str) -> Tarefa:
+        tarefa = Tarefa(next(self._ids), tipo)
+        self._tarefas[tarefa.id] = tarefa
+        return tarefa
+
+    def _concluir(self, tarefa: Tarefa, estado: str, resultado=None, erro: str | None = None) -> None:
+        """Finaliza a tarefa e descarta as concluídas mais antigas além de `tarefas_guardadas`."""
+        tarefa._finalizar(estado, resultado, erro)
+        self._finalizadas[tarefa.id] = None
+        while len(self._finalizadas) > self.tarefas_guardadas:
+            antiga, _ = self._finalizadas.popitem(last=False)
+            self._tarefas.pop(antiga, None)
+
+    def _preparar(self, tipo: str, registro: dict, hoje: date) -> tuple[Tarefa, dict | None]:
+        """Cria a tarefa e valida o registro; se inválido, a tarefa já sai com estado 'erro'."""
+        tarefa = self._nova(tipo)
+        try:
+            dados = converter_registro(registro, hoje)
+            validar_dados_simulacao(dados, hoje)
+        except ValueError as ve:
+            self._concluir(tarefa, 'erro', erro=str(ve))
+            return tarefa, None
+        return tarefa, dados
+
+    # --- Envio ---
+
+    def precificar(self, registro: dict) -> Tarefa:
+        """Precificação (barata): executada na hora; a tarefa retorna já concluída (ou com erro)."""
+        hoje = date.today()
+        tarefa, dados = self._preparar('precificacao', registro, hoje)
+        if dados is not None:
+            calculos = formulas.calcular_simulacao(dados, data_referencia=hoje)
+            self._concluir(tarefa, 'concluida', {
+                'taxa_horaria_sugerida': calculos['taxa_horaria_sugerida'],
+                'preco_final': calculos['preco_horario_sugerido'],
+                'preco_exito_sugerido': calculos['preco_exito_sugerido'],
+                'alertas': verificar_alertas(dados),
+            })
+        return tarefa
+
+    def _validar_formato(self, formato: str) -> str:
+        formato = formato.lower()
+        if formato not in FORMATOS_RELATORIO:
+            raise ValueError(f"Formato inválido: '{formato}'. Use um de: {', '.join(FORMATOS_RELATORIO)}.")
+        if self._fila is None:
+            raise RuntimeError("A fila não foi iniciada (use 'async with FilaTarefas()' ou await iniciar()).")
+        return formato
+
+    def enviar_relatorio(self, registro: dict, formato: str = 'pdf') -> Tarefa:
+        """Enfileira um relatório; com a fila cheia, recusa imediatamente com FilaCheia."""
+        formato = self._validar_formato(formato)
+        if self._fila.full(): # Checado antes de criar a tarefa: pedidos recusados não ocupam memória
+            self._descartadas += 1
+            raise FilaCheia(f"Fila de relatórios cheia ({self.capacidade_relatorios} na fila).")
+        hoje = date.today()
+        tarefa, dados = self._preparar('relatorio', registro, hoje)
+        if dados is not None:
+            self._fila.put_nowait((tarefa, dados, formato, hoje))
+        return tarefa
+
+    async def enviar_relatorio_aguardando(self, registro: dict, formato: str = 'pdf') -> Tarefa:
+        """Enfileira um relatório, aguardando vaga na fila se ela estiver cheia (contrapressão)."""
+        formato = self._validar_formato(formato)
+        hoje = date.today()
+        tarefa, dados = self._preparar('relatorio', registro, hoje)
+        if dados is not None:
+            try:
+                await self._fila.put((tarefa, dados, formato, hoje))
+            except asyncio.CancelledError: # O produtor desistiu enquanto aguardava vaga
+                if tarefa.estado == 'na_fila':
+                    self._concluir(tarefa, 'cancelada')
+                raise
+            if tarefa.estado == 'cancelada': # Cancelada enquanto aguardava vaga: não ocupa a fila
+                self._fila.remover(tarefa)
+        return tarefa
+
+    # --- Consulta ---
+
+    def consultar(self, id_tarefa: int) -> Tarefa | None:
+        """A tarefa com o id informado, ou None se não existir (ou já tiver sido descartada)."""
+        return self._tarefas.get(id_tarefa)
+
+    async def aguardar(self, id_tarefa: int, timeout: float | None = None) -> Tarefa:
+        """Espera a tarefa terminar (asyncio.TimeoutError se passar de `timeout` segundos)."""
+        tarefa = self._tarefas.get(id_tarefa)
+        if tarefa is None:
+            raise KeyError(f"Tarefa {id_tarefa} não encontrada.")
+        await asyncio.wait_for(tarefa._fim.wait(), timeout)
+        return tarefa
+
+    def cancelar(self, id_tarefa: int) -> bool:
+        """Cancela uma tarefa que ainda está na fila (as em execução vão até o fim)."""
+        tarefa = self._tarefas.get(id_tarefa)
+        if tarefa is None or tarefa.estado != 'na_fila':
+            return False
+        self._concluir(tarefa, 'cancelada')
+        if self._fila is not None:
+            self._fila.remover(tarefa) # Libera a vaga (se ainda aguardava vaga, sai ao ser enfileirada)
+        return True
+
+    def estatisticas(self) -> dict:
+        estados = [tarefa.estado for tarefa in self._tarefas.values()]
+        return {
+            'na_fila': self._fila.qsize() if self._fila is not None else 0,
+            'executando': estados.count('executando'),
+            'concluidas': estados.count('concluida'),
+            'erros': estados.count('erro'),
+            'descartadas': self._descartadas,
+        }
+
+    # --- Trabalhadores ---
+
+    async def _trabalhador(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            tarefa, dados, formato, hoje = await self._fila.get()
+            try:
+                if tarefa.estado != 'na_fila': # Cancelada enquanto esperava
+                    continue
+                tarefa.estado = 'executando'
+                pool = self._pool
+                try:
+                    conteudo = await loop.run_in_executor(pool, _renderizar, dados, formato, hoje)
+                except asyncio.CancelledError:
+                    self._concluir(tarefa, 'cancelada', erro="Fila encerrada.")
+                    raise
+                except BrokenProcessPool:
+                    # Um processo morreu (falta de memória, sinal): o pool não aceita mais nada
+                    self._concluir(tarefa, 'erro', erro="O processo de renderização foi interrompido; envie de novo.")
+                    if self._pool is pool: # Só o primeiro trabalhador a notar recria o pool
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        self._pool = self._novo_pool()
+                except Exception as e:
+                    self._concluir(tarefa, 'erro', erro=f"{type(e).__name__}: {e}")
+                else:
+                    self._concluir(tarefa, 'concluida', conteudo)
+            finally:
+                self._fila.task_done()
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+"""
+Varredura de Parâmetros para Calibração de core/constants.py
+------------------------------------------------------------
+Avalia muitos conjuntos de parâmetros (pesos e multiplicadores de
+core/constants.py) contra uma carteira de perfis com preços históricos
+já cotados, e informa o erro de cada conjunto. A carteira é convertida
+em colunas uma única vez e enviada a cada processo do pool apenas na
+inicialização; cada tarefa recebe só o conjunto de parâmetros e roda o
+motor vetorizado de core/lote.py.
+
+Nomes de parâmetros são os nomes das constantes (ex: 'PESO_ANO_POS_OAB').
+Entradas dos multiplicadores usam 'TABELA.nível'
+(ex: 'MULTIPLICADOR_COMPLEXIDADE.Alta').
+
+Exemplo:
+    carteira, precos = carregar_carteira("historico.csv")
+    conjuntos = grade_parametros({'PESO_ANO_POS_OAB': [0.02, 0.03, 0.04],
+                                  'MULTIPLICADOR_URGENCIA.Imediata': [1.4, 1.6, 1.8]})
+    resultados = varrer_parametros(conjuntos, carteira, precos)
+    melhor = resultados[0]  # Ordenados pelo menor erro (MAPE)
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import product
+from typing import Iterable, Iterator
+
+import numpy as np
+
+import core.constants as constants
+from core import lote
+from core.parametros import Parametros, parametros_de_constantes
+from core.processamento_lote import converter_registro, ler_registros
+from core.validacao import validar_dados_simulacao
+
+# Parâmetros numéricos que podem ser calibrados (os limites e listas da GUI ficam de fora)
+PARAMETROS_CALIBRAVEIS: list[str] = [
+    'PESO_ANO_POS_OAB', 'PESO_ANO_POS_GRAD', 'VALOR_BASE_POS_GRAD',
+    'PESO_VOLUME_ACOES', 'PESO_TAXA_SUCESSO_GERAL', 'PESO_TAXA_SUCESSO_ESPECIFICA',
+    'PESO_GASTO_EDUCACAO_SOBRE_TAXA_MIN_ANUAL', 'HORAS_NORMAIS_POR_ANO', 'PESO_DEDICACAO_HORAS_FDS',
+]
+TABELAS_CALIBRAVEIS: list[str] = ['MULTIPLICADOR_COMPLEXIDADE', 'MULTIPLICADOR_URGENCIA']
+
+
+# --- Conjuntos de Parâmetros ---
+
+def _validar_nome(nome: str) -> None:
+    """Garante que o nome corresponde a uma constante calibrável (ou entrada de tabela existente)."""
+    if '.' in nome:
+        tabela, nivel = nome.split('.', 1)
+        if tabela in TABELAS_CALIBRAVEIS and nivel in getattr(constants, tabela):
+            return
+    elif nome in PARAMETROS_CALIBRAVEIS:
+        return
+    raise ValueError(f"Parâmetro não calibrável: '{nome}'.")
+
+
+def grade_parametros(grade: dict[str, Iterable[float]]) -> Iterator[dict[str, float]]:
+    """Gera todas as combinações (produto cartesiano) dos valores informados para cada parâmetro."""
+    for nome in grade:
+        _validar_nome(nome)
+    nomes = list(grade)
+    for valores in product(*(list(grade[nome]) for nome in nomes)):
+        yield dict(zip(nomes, valores))
+
+
+def amostra_parametros(intervalos: dict[str, tuple[float, float]], n: int,
+                       semente: int | None = None) -> Iterator[dict[str, float]]:
+    """Gera n conjuntos sorteados uniformemente dentro do intervalo (mínimo, máximo) de cada parâmetro."""
+    for nome in intervalos:
+        _validar_nome(nome)
+    rng = random.Random(semente)
+    for _ in range(n):
+        yield {nome: rng.uniform(minimo, maximo) for nome, (minimo, maximo) in intervalos.items()}
+
+
+# --- Carteira e Métricas ---
+
+def carregar_carteira(caminho: str, formato: str | None = None, hoje: date | None = None,
+                      parametros: Parametros | None = None) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    """
+    Lê uma carteira CSV/JSONL (mesmo formato de main_lote.py) com a coluna extra
+    'preco_historico' (valor efetivamente cotado). Perfis inválidos ou sem preço
+    histórico são descartados. Retorna (colunas do lote, preços históricos).
+    Os níveis seguem o perfil `parametros`, que deve ser o mesmo `base` da avaliação.
+    """
+    formato = formato or ('jsonl' if caminho.lower().endswith(('.jsonl', '.ndjson')) else 'csv')
+    hoje = hoje or date.today()
+    lista_dados, precos = [], []
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        for registro in ler_registros(arquivo, formato):
+            try:
+                dados = converter_registro(registro, hoje, parametros)
+                validar_dados_simulacao(dados, hoje, parametros)
+                preco = float(str(registro.get('preco_historico') or 0).replace(',', '.'))
+            except ValueError:
+                continue
+            if preco > 0:
+                lista_dados.append(dados)
+                precos.append(preco)
+    if not lista_dados:
+        raise ValueError(f"Nenhum perfil válido com 'preco_historico' em '{caminho}'.")
+    return lote.colunas_de_dados(lista_dados, parametros), np.array(precos, dtype=np.float64)
+
+
+def metricas_erro(previstos: np.ndarray, historicos: np.ndarray) -> dict[str, float]:
+    """Erro dos preços previstos em relação aos históricos: MAE, RMSE, MAPE e viés (erro médio)."""
+    erro = previstos - historicos
+    return {
+        'mae': float(np.abs(erro).mean()),
+        'rmse': float(np.sqrt((erro ** 2).mean())),
+        'mape': float((np.abs(erro) / historicos).mean()),
+        'vies': float(erro.mean()),
+    }
+
+
+def avaliar_parametros(parametros: dict[str, float], colunas: dict[str, np.ndarray],
+                       precos_historicos: np.ndarray, hoje_ordinal: int | None = None,
+                       base: Parametros | None = None) -> dict[str, float]:
+    """
+    Precifica a carteira com um conjunto de parâmetros e devolve as métricas de erro.
+    O conjunto é aplicado sobre o perfil `base` (padrão: os valores atuais de core.constants)
+    e passado explicitamente ao motor em lote, sem alterar core.constants.
+    """
+    for nome in parametros:
+        _validar_nome(nome)
+    perfil = (base or parametros_de_constantes()).com_alteracoes(parametros)
+    resultado = lote.calcular_lote(colunas, hoje_ordinal, perfil)
+    return metricas_erro(resultado['preco_final'], precos_historicos)
+
+
+# --- Execução em Paralelo ---
+
+# Carteira carregada em cada processo do pool (enviada uma vez, na inicialização)
+_carteira_processo: tuple[dict[str, np.ndarray], np.ndarray, int] | None = None
+
+
+def _inicializar_processo(colunas: dict[str, np.ndarray], precos_historicos: np.ndarray, hoje_ordinal: int) -> None:
+    global _carteira_processo
+    _carteira_processo = (colunas, precos_historicos, hoje_ordinal)
+
+
+def _avaliar_no_processo(parametros: dict[str, float]) -> dict[str, float]:
+    colunas, precos_historicos, hoje_ordinal = _carteira_processo
+    return avaliar_parametros(parametros, colunas, precos_historicos, hoje_ordinal)
+
+
+def varrer_parametros(conjuntos: Iterable[dict[str, float]], colunas: dict[str, np.ndarray],
+                      precos_historicos: np.ndarray, processos: int | None = None,
+                      hoje_ordinal: int | None = None, ordenar_por: str = 'mape') -> list[dict]:
+    """
+    Avalia cada conjunto de parâmetros num pool de processos.
+    Retorna uma lista de {'parametros': ..., <métricas>} ordenada pela métrica `ordenar_por`
+    (o menor erro primeiro). Com processos=1, avalia no próprio processo.
+    """
+    conjuntos = list(conjuntos)
+    hoje_ordinal = hoje_ordinal or date.today().toordinal() # Mesma data para todos os processos
+    processos = processos or os.cpu_count() or 1
+
+    if processos == 1 or len(conjuntos) <= 1:
+        metricas = [avaliar_parametros(p, colunas, precos_historicos, hoje_ordinal) for p in conjuntos]
+    else:
+        # Blocos de tarefas por envio reduzem a troca de mensagens entre processos
+        tamanho_bloco = max(1, len(conjuntos) // (processos * 4))
+        with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_processo,
+                                 initargs=(colunas, precos_historicos, hoje_ordinal)) as executor:
+            metricas = list(executor.map(_avaliar_no_processo, conjuntos, chunksize=tamanho_bloco))
+
+    resultados = [{'parametros': p, **m} for p, m in zip(conjuntos, metricas)]
+    resultados.sort(key=lambda r: r[ordenar_por] if ordenar_por != 'vies' else abs(r['vies']))
+    return resultados
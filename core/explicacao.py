@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""
+Explicações Preguiçosas dos Fatores
+-----------------------------------
+Cada fator de core/formulas.py devolve, junto com o valor, uma Explicacao:
+um registro compacto com os números usados no cálculo. Os textos de
+exibição (moeda, percentuais, etc.) só são montados quando alguém lê a
+explicação como dicionário (relatório, GUI, depuração).
+Precificações sem relatório não formatam nada.
+"""
+
+from collections.abc import Mapping
+from typing import Callable
+
+
+class Explicacao(Mapping):
+    """Registro numérico de um cálculo, exibido como dicionário formatado sob demanda."""
+
+    __slots__ = ('formatador', 'valores', '_texto')
+
+    def __init__(self, formatador: Callable[..., dict], *valores):
+        self.formatador = formatador # Monta o dicionário de exibição a partir dos valores
+        self.valores = valores       # Números (e rótulos) usados no cálculo
+        self._texto = None           # Dicionário formatado, criado no primeiro acesso
+
+    def formatar(self) -> dict:
+        """Retorna o dicionário de exibição, montando-o apenas uma vez."""
+        if self._texto is None:
+            self._texto = self.formatador(*self.valores)
+        return self._texto
+
+    def __getitem__(self, chave):
+        return self.formatar()[chave]
+
+    def __iter__(self):
+        return iter(self.formatar())
+
+    def __len__(self):
+        return len(self.formatar())
+
+    def __repr__(self):
+        return f"Explicacao({self.formatador.__name__}, {self.valores!r})"
+
+
+def detalhe_simples(mensagem: str) -> dict:
+    """Formatador para os casos em que o fator não se aplica (fator 1.0)."""
+    return {"Detalhe": mensagem}
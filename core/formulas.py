@@ -1,54 +1,126 @@
 import math
 from datetime import date
+from typing import Callable
 # Importa o módulo de constantes e as funções utilitárias
 import core.constants as constants 
 from core.utils import calcular_anos_desde, formatar_numero, formatar_moeda
+from core.explicacao import Explicacao, detalhe_simples
+from core.parametros import Parametros
 
-# (As definições de constantes foram MOVIDAS para constants.py)
+# Cada cálculo aceita `parametros` (perfil compilado por core/parametros.py); sem ele,
+# lê os valores atuais de core.constants. Ambos têm os mesmos nomes de atributo.
 
-# --- Funções de Cálculo dos Fatores (agora usam constants.) ---
+# Tipo do gancho de rastreio: recebe uma linha de texto (ex: print, logger.info).
+# Quando nenhum gancho é informado, os cálculos não imprimem nem formatam nada.
+Rastreio = Callable[[str], None]
 
-def calcular_fator_tempo_experiencia(data_graduacao: date, data_oab: date, datas_pos: list[date]) -> tuple[float, dict]:
+# --- Formatadores das Explicações (só executados quando alguém lê os detalhes) ---
+
+def _detalhes_tempo(parametros: Parametros | None, anos_desde_grad: float, anos_desde_oab: float,
+                    anos_desde_pos_media: float, tem_pos: bool) -> dict:
+    """Detalhes do fator tempo de experiência."""
+    p = parametros or constants
+    return {
+        "Anos desde Graduação": formatar_numero(anos_desde_grad, 1),
+        "Anos desde Inscrição OAB": formatar_numero(anos_desde_oab, 1),
+        "Anos Médios desde Pós-Graduações": formatar_numero(anos_desde_pos_media, 1) if tem_pos else "N/A",
+        "Peso Ano Pós-OAB (const)": p.PESO_ANO_POS_OAB,
+        "Peso Ano Médio Pós (const)": p.PESO_ANO_POS_GRAD
+    }
+
+def _detalhes_especializacao(parametros: Parametros | None, num_pos: int) -> dict:
+    """Detalhes do fator especialização (pós)."""
+    p = parametros or constants
+    return {
+        "Número de Pós-Graduações": num_pos,
+        "Bônus por Pós-Graduação (const)": p.VALOR_BASE_POS_GRAD
+    }
+
+def _detalhes_pratica(parametros: Parametros | None, total_acoes: int, total_ganhas: int, area_servico_atual: str, ganhas_na_area_atual: int,
+                      taxa_sucesso_geral: float, taxa_sucesso_especifica_proxy: float, log_volume: float) -> dict:
+    """Detalhes do fator experiência prática (casos)."""
+    p = parametros or constants
+    return {
+        "Total de Ações Atuadas": total_acoes,
+        "Total de Ações Ganhas": total_ganhas,
+        f"Ações Ganhas em {area_servico_atual}": ganhas_na_area_atual,
+        "Taxa de Sucesso Geral Estimada": f"{taxa_sucesso_geral:.1%}" if total_acoes >= p.MIN_ACOES_PARA_SUCESSO_GERAL else f"< {p.MIN_ACOES_PARA_SUCESSO_GERAL} ações",
+        "Taxa Sucesso Específica Usada (Proxy)": f"{taxa_sucesso_especifica_proxy:.1%}",
+        "Log(Volume + 1)": formatar_numero(log_volume, 3),
+        "Peso Volume (const)": p.PESO_VOLUME_ACOES,
+        "Peso Sucesso Geral (const)": p.PESO_TAXA_SUCESSO_GERAL,
+        "Peso Sucesso Específico (const)": p.PESO_TAXA_SUCESSO_ESPECIFICA,
+        "Mínimo Ações Sucesso Geral (const)": p.MIN_ACOES_PARA_SUCESSO_GERAL,
+    }
+
+def _detalhes_investimento(parametros: Parametros | None, gastos_educacao: float, taxa_horaria_minima: float,
+                           receita_anual_minima_estimada: float, proporcao_gasto_receita: float) -> dict:
+    """Detalhes do fator investimento educacional."""
+    p = parametros or constants
+    return {
+        "Gasto Total com Educação": formatar_moeda(gastos_educacao),
+        "Taxa Horária Mínima Informada": formatar_moeda(taxa_horaria_minima),
+        "Receita Anual Mínima Estimada": formatar_moeda(receita_anual_minima_estimada),
+        "Proporção Gasto/Receita Anual Min.": f"{proporcao_gasto_receita:.2%}",
+        "Peso Gasto Educação (const)": p.PESO_GASTO_EDUCACAO_SOBRE_TAXA_MIN_ANUAL,
+        "Horas Normais/Ano (const)": p.HORAS_NORMAIS_POR_ANO,
+    }
+
+def _detalhes_dedicacao(parametros: Parametros | None, horas_fds: int, anos_desde_oab: float, total_horas_normais_estimadas_carreira: float,
+                        proporcao_horas_fds: float) -> dict:
+    """Detalhes do fator dedicação (horas extras)."""
+    p = parametros or constants
+    return {
+        "Total Horas Estimadas FDS/Feriados": horas_fds,
+        "Anos de Prática (OAB)": formatar_numero(anos_desde_oab, 1),
+        "Total Horas Normais Estimadas (Carreira)": formatar_numero(total_horas_normais_estimadas_carreira, 0),
+        "Proporção Horas FDS / Normais": f"{proporcao_horas_fds:.2%}",
+        "Peso Dedicação (Horas FDS) (const)": p.PESO_DEDICACAO_HORAS_FDS,
+        "Horas Normais/Ano (const)": p.HORAS_NORMAIS_POR_ANO,
+    }
+
+
+# --- Funções de Cálculo dos Fatores (usam o perfil `parametros` ou core.constants) ---
+
+def calcular_fator_tempo_experiencia(data_graduacao: date, data_oab: date, datas_pos: list[date],
+                                     data_referencia: date | None = None,
+                                     parametros: Parametros | None = None) -> tuple[float, Explicacao]:
     """Calcula o fator baseado no tempo de formado, prática (OAB) e pós-graduações."""
-    anos_desde_grad = calcular_anos_desde(data_graduacao)
-    anos_desde_oab = calcular_anos_desde(data_oab) # Prática efetiva
+    p = parametros or constants
+    data_referencia = data_referencia or date.today()
+    anos_desde_grad = calcular_anos_desde(data_graduacao, data_referencia)
+    anos_desde_oab = calcular_anos_desde(data_oab, data_referencia) # Prática efetiva
 
-    anos_desde_pos_lista = [calcular_anos_desde(dt) for dt in datas_pos if dt]
+    anos_desde_pos_lista = [calcular_anos_desde(dt, data_referencia) for dt in datas_pos if dt]
     anos_desde_pos_media = sum(anos_desde_pos_lista) / len(anos_desde_pos_lista) if anos_desde_pos_lista else 0
 
     # Fórmula: Base 1 + Bônus por ano de OAB + Bônus por ano médio de pós
-    fator = 1.0 + (constants.PESO_ANO_POS_OAB * anos_desde_oab) \
-                + (constants.PESO_ANO_POS_GRAD * anos_desde_pos_media)
+    fator = 1.0 + (p.PESO_ANO_POS_OAB * anos_desde_oab) \
+                + (p.PESO_ANO_POS_GRAD * anos_desde_pos_media)
 
-    detalhes = {
-        "Anos desde Graduação": formatar_numero(anos_desde_grad, 1),
-        "Anos desde Inscrição OAB": formatar_numero(anos_desde_oab, 1),
-        "Anos Médios desde Pós-Graduações": formatar_numero(anos_desde_pos_media, 1) if anos_desde_pos_lista else "N/A",
-        "Peso Ano Pós-OAB (const)": constants.PESO_ANO_POS_OAB,
-        "Peso Ano Médio Pós (const)": constants.PESO_ANO_POS_GRAD
-    }
+    detalhes = Explicacao(_detalhes_tempo, parametros, anos_desde_grad, anos_desde_oab, anos_desde_pos_media, bool(anos_desde_pos_lista))
     return max(1.0, fator), detalhes
 
-def calcular_fator_especializacao_pos(datas_pos: list[date]) -> tuple[float, dict]:
+def calcular_fator_especializacao_pos(datas_pos: list[date], parametros: Parametros | None = None) -> tuple[float, Explicacao]:
     """Calcula o fator baseado na quantidade de pós-graduações."""
+    p = parametros or constants
     num_pos = len(datas_pos)
     # Fórmula: Base 1 + Bônus por cada pós
-    fator = 1.0 + (constants.VALOR_BASE_POS_GRAD * num_pos)
+    fator = 1.0 + (p.VALOR_BASE_POS_GRAD * num_pos)
 
-    detalhes = {
-        "Número de Pós-Graduações": num_pos,
-        "Bônus por Pós-Graduação (const)": constants.VALOR_BASE_POS_GRAD
-    }
+    detalhes = Explicacao(_detalhes_especializacao, parametros, num_pos)
     return max(1.0, fator), detalhes
 
 def calcular_fator_experiencia_pratica(
     total_acoes: int,
     ganhas_prev: int, ganhas_emp: int, ganhas_civil: int, ganhas_trab: int, ganhas_trib: int, ganhas_outras: int, # Adicionado Trab e Trib
-    area_servico_atual: str
-) -> tuple[float, dict]:
+    area_servico_atual: str,
+    parametros: Parametros | None = None,
+) -> tuple[float, Explicacao]:
     """Calcula o fator baseado no volume e sucesso em ações judiciais."""
+    p = parametros or constants
     total_ganhas = ganhas_prev + ganhas_emp + ganhas_civil + ganhas_trab + ganhas_trib + ganhas_outras
-    taxa_sucesso_geral = (total_ganhas / total_acoes) if total_acoes >= constants.MIN_ACOES_PARA_SUCESSO_GERAL else 0.0
+    taxa_sucesso_geral = (total_ganhas / total_acoes) if total_acoes >= p.MIN_ACOES_PARA_SUCESSO_GERAL else 0.0
 
     # --- Taxa de sucesso específica ---
     # Idealmente, o input coletaria o TOTAL de ações atuadas POR ÁREA.
@@ -71,92 +143,102 @@ def calcular_fator_experiencia_pratica(
     log_volume = math.log(total_acoes + 1) if total_acoes > 0 else 0
 
     # Fórmula: Base 1 + Bônus Volume (Log) + Bônus Sucesso Geral + Bônus Sucesso Específico (Proxy)
-    fator = 1.0 + (constants.PESO_VOLUME_ACOES * log_volume) \
-                + (constants.PESO_TAXA_SUCESSO_GERAL * taxa_sucesso_geral) \
-                + (constants.PESO_TAXA_SUCESSO_ESPECIFICA * taxa_sucesso_especifica_proxy)
+    fator = 1.0 + (p.PESO_VOLUME_ACOES * log_volume) \
+                + (p.PESO_TAXA_SUCESSO_GERAL * taxa_sucesso_geral) \
+                + (p.PESO_TAXA_SUCESSO_ESPECIFICA * taxa_sucesso_especifica_proxy)
 
-    detalhes = {
-        "Total de Ações Atuadas": total_acoes,
-        "Total de Ações Ganhas": total_ganhas,
-        f"Ações Ganhas em {area_servico_atual}": ganhas_na_area_atual,
-        "Taxa de Sucesso Geral Estimada": f"{taxa_sucesso_geral:.1%}" if total_acoes >= constants.MIN_ACOES_PARA_SUCESSO_GERAL else f"< {constants.MIN_ACOES_PARA_SUCESSO_GERAL} ações",
-        "Taxa Sucesso Específica Usada (Proxy)": f"{taxa_sucesso_especifica_proxy:.1%}",
-        "Log(Volume + 1)": formatar_numero(log_volume, 3),
-        "Peso Volume (const)": constants.PESO_VOLUME_ACOES,
-        "Peso Sucesso Geral (const)": constants.PESO_TAXA_SUCESSO_GERAL,
-        "Peso Sucesso Específico (const)": constants.PESO_TAXA_SUCESSO_ESPECIFICA,
-        "Mínimo Ações Sucesso Geral (const)": constants.MIN_ACOES_PARA_SUCESSO_GERAL,
-    }
+    detalhes = Explicacao(_detalhes_pratica, parametros, total_acoes, total_ganhas, area_servico_atual, ganhas_na_area_atual,
+                          taxa_sucesso_geral, taxa_sucesso_especifica_proxy, log_volume)
     return max(1.0, fator), detalhes
 
 
-def calcular_fator_investimento_educacional(gastos_educacao: float, taxa_horaria_minima: float) -> tuple[float, dict]:
+def calcular_fator_investimento_educacional(gastos_educacao: float, taxa_horaria_minima: float,
+                                            parametros: Parametros | None = None) -> tuple[float, Explicacao]:
     """Calcula o fator baseado no investimento em educação."""
-    if taxa_horaria_minima <= 0: return 1.0, {"Detalhe": "Taxa horária mínima inválida."}
+    p = parametros or constants
+    if taxa_horaria_minima <= 0: return 1.0, Explicacao(detalhe_simples, "Taxa horária mínima inválida.")
 
     # Estimativa de receita anual baseada na taxa mínima
-    receita_anual_minima_estimada = taxa_horaria_minima * constants.HORAS_NORMAIS_POR_ANO
+    receita_anual_minima_estimada = taxa_horaria_minima * p.HORAS_NORMAIS_POR_ANO
 
-    if receita_anual_minima_estimada <= 0: return 1.0, {"Detalhe": "Receita anual mínima estimada inválida."}
+    if receita_anual_minima_estimada <= 0: return 1.0, Explicacao(detalhe_simples, "Receita anual mínima estimada inválida.")
 
     # Proporção do gasto educacional sobre a receita anual mínima
     proporcao_gasto_receita = gastos_educacao / receita_anual_minima_estimada
 
     # Fórmula: Base 1 + Peso * Proporção
-    fator = 1.0 + (constants.PESO_GASTO_EDUCACAO_SOBRE_TAXA_MIN_ANUAL * proporcao_gasto_receita)
+    fator = 1.0 + (p.PESO_GASTO_EDUCACAO_SOBRE_TAXA_MIN_ANUAL * proporcao_gasto_receita)
 
-    detalhes = {
-        "Gasto Total com Educação": formatar_moeda(gastos_educacao),
-        "Taxa Horária Mínima Informada": formatar_moeda(taxa_horaria_minima),
-        "Receita Anual Mínima Estimada": formatar_moeda(receita_anual_minima_estimada),
-        "Proporção Gasto/Receita Anual Min.": f"{proporcao_gasto_receita:.2%}",
-        "Peso Gasto Educação (const)": constants.PESO_GASTO_EDUCACAO_SOBRE_TAXA_MIN_ANUAL,
-        "Horas Normais/Ano (const)": constants.HORAS_NORMAIS_POR_ANO,
-    }
+    detalhes = Explicacao(_detalhes_investimento, parametros, gastos_educacao, taxa_horaria_minima,
+                          receita_anual_minima_estimada, proporcao_gasto_receita)
     return max(1.0, fator), detalhes
 
 
-def calcular_fator_dedicacao(horas_fds: int, data_oab: date) -> tuple[float, dict]:
+def calcular_fator_dedicacao(horas_fds: int, data_oab: date,
+                             data_referencia: date | None = None,
+                             parametros: Parametros | None = None) -> tuple[float, Explicacao]:
     """Calcula o fator baseado nas horas trabalhadas em fins de semana/feriados."""
-    anos_desde_oab = calcular_anos_desde(data_oab)
+    p = parametros or constants
+    anos_desde_oab = calcular_anos_desde(data_oab, data_referencia)
     if anos_desde_oab <= 0:
-        return 1.0, {"Detalhe": "Menos de um ano de prática (OAB)."}
+        return 1.0, Explicacao(detalhe_simples, "Menos de um ano de prática (OAB).")
 
-    total_horas_normais_estimadas_carreira = anos_desde_oab * constants.HORAS_NORMAIS_POR_ANO
+    total_horas_normais_estimadas_carreira = anos_desde_oab * p.HORAS_NORMAIS_POR_ANO
     if total_horas_normais_estimadas_carreira <= 0:
-         return 1.0, {"Detalhe": "Horas normais estimadas inválidas."}
+         return 1.0, Explicacao(detalhe_simples, "Horas normais estimadas inválidas.")
 
     proporcao_horas_fds = horas_fds / total_horas_normais_estimadas_carreira if total_horas_normais_estimadas_carreira > 0 else 0
 
     # Fórmula: Base 1 + Peso * Proporção
-    fator = 1.0 + (constants.PESO_DEDICACAO_HORAS_FDS * proporcao_horas_fds)
+    fator = 1.0 + (p.PESO_DEDICACAO_HORAS_FDS * proporcao_horas_fds)
 
-    detalhes = {
-        "Total Horas Estimadas FDS/Feriados": horas_fds,
-        "Anos de Prática (OAB)": formatar_numero(anos_desde_oab, 1),
-        "Total Horas Normais Estimadas (Carreira)": formatar_numero(total_horas_normais_estimadas_carreira, 0),
-        "Proporção Horas FDS / Normais": f"{proporcao_horas_fds:.2%}",
-        "Peso Dedicação (Horas FDS) (const)": constants.PESO_DEDICACAO_HORAS_FDS,
-        "Horas Normais/Ano (const)": constants.HORAS_NORMAIS_POR_ANO,
-    }
+    detalhes = Explicacao(_detalhes_dedicacao, parametros, horas_fds, anos_desde_oab,
+                          total_horas_normais_estimadas_carreira, proporcao_horas_fds)
     return max(1.0, fator), detalhes
 
 
 # --- Funções Principais de Cálculo ---
 
-def calcular_taxa_horaria_sugerida(dados: dict) -> tuple[float, dict]:
-    """Calcula a taxa horária final combinando todos os fatores."""
+def _rastrear_taxa_horaria(rastreio: Rastreio, taxa_base: float, fatores_aplicados: dict, taxa_final: float) -> None:
+    """Envia ao gancho de rastreio o passo a passo da aplicação dos fatores."""
+    rastreio("\nAplicando Fatores à Taxa Base:")
+    rastreio(f"- Taxa Base Informada: {formatar_moeda(taxa_base)}")
+    for nome, fator in fatores_aplicados.items():
+        rastreio(f"- Fator {nome}: {formatar_numero(fator, 3)}x")
+    rastreio(f"\n=> Taxa Horária Sugerida: {formatar_moeda(taxa_final)}")
+
+
+def _rastrear_preco_servico(rastreio: Rastreio, detalhes: dict) -> None:
+    """Envia ao gancho de rastreio o passo a passo do preço do serviço."""
+    rastreio(f"\nCalculando Preço do Serviço Específico:")
+    rastreio(f"- Horas Estimadas: {formatar_numero(detalhes['Horas Estimadas'], 1)} h")
+    rastreio(f"- Nível Complexidade: {detalhes['Nível de Complexidade']} ({detalhes['Fator Complexidade']:.2f}x)")
+    rastreio(f"- Nível Urgência: {detalhes['Nível de Urgência']} ({detalhes['Fator Urgência']:.2f}x)")
+    rastreio(f"- Preço Base (Taxa * Horas): {formatar_moeda(detalhes['Preço Base (Taxa * Horas)'])}")
+    rastreio(f"=> Preço Final Sugerido (Base * Complexidade * Urgência): {formatar_moeda(detalhes['Preço Final Sugerido'])}")
+
+
+def calcular_taxa_horaria_sugerida(dados: dict, rastreio: Rastreio | None = None,
+                                   data_referencia: date | None = None,
+                                   parametros: Parametros | None = None) -> tuple[float, dict]:
+    """
+    Calcula a taxa horária final combinando todos os fatores.
+    Se `rastreio` for informado (ex: print), recebe o passo a passo do cálculo.
+    `data_referencia` fixa o "hoje" usado nos anos de experiência (padrão: date.today()),
+    tornando a simulação reproduzível. `parametros` é o perfil a usar (padrão: core.constants).
+    """
+    data_referencia = data_referencia or date.today()
     taxa_base = dados['taxa_horaria_base_minima']
     fatores_aplicados = {}
     detalhes_fatores = {}
 
     fator_tempo, det_tempo = calcular_fator_tempo_experiencia(
-        dados['data_graduacao'], dados['data_oab'], dados['datas_pos_graduacao']
+        dados['data_graduacao'], dados['data_oab'], dados['datas_pos_graduacao'], data_referencia, parametros
     )
     fatores_aplicados['Tempo Experiência'] = fator_tempo
     detalhes_fatores['Tempo Experiência'] = det_tempo
 
-    fator_pos, det_pos = calcular_fator_especializacao_pos(dados['datas_pos_graduacao'])
+    fator_pos, det_pos = calcular_fator_especializacao_pos(dados['datas_pos_graduacao'], parametros)
     fatores_aplicados['Especialização (Pós)'] = fator_pos
     detalhes_fatores['Especialização (Pós)'] = det_pos
 
@@ -165,29 +247,26 @@ def calcular_taxa_horaria_sugerida(dados: dict) -> tuple[float, dict]:
         dados['acoes_ganhas_previdenciaria'], dados['acoes_ganhas_empresarial'],
         dados['acoes_ganhas_civil'], dados['acoes_ganhas_trabalhista'], # Adicionado
         dados['acoes_ganhas_tributaria'], dados['acoes_ganhas_outra'], # Adicionado 'acoes_ganhas_outra' 'outra' no sigular
-        dados['area_servico_atual']
+        dados['area_servico_atual'], parametros
     )
     fatores_aplicados['Experiência Prática (Casos)'] = fator_pratica
     detalhes_fatores['Experiência Prática (Casos)'] = det_pratica
 
     fator_invest_edu, det_invest = calcular_fator_investimento_educacional(
-        dados['gastos_educacao'], dados['taxa_horaria_base_minima']
+        dados['gastos_educacao'], dados['taxa_horaria_base_minima'], parametros
     )
     fatores_aplicados['Investimento Educacional'] = fator_invest_edu
     detalhes_fatores['Investimento Educacional'] = det_invest
 
     fator_dedic, det_dedic = calcular_fator_dedicacao(
-        dados['horas_trabalhadas_fds_total'], dados['data_oab']
+        dados['horas_trabalhadas_fds_total'], dados['data_oab'], data_referencia, parametros
     )
     fatores_aplicados['Dedicação (Horas Extras)'] = fator_dedic
     detalhes_fatores['Dedicação (Horas Extras)'] = det_dedic
 
     taxa_calculada = taxa_base
-    print("\nAplicando Fatores à Taxa Base:")
-    print(f"- Taxa Base Informada: {formatar_moeda(taxa_base)}")
-    for nome, fator in fatores_aplicados.items():
+    for fator in fatores_aplicados.values():
         taxa_calculada *= fator
-        print(f"- Fator {nome}: {formatar_numero(fator, 3)}x")
 
     detalhes_calculo_taxa = {
         "Taxa Horária Base Informada": taxa_base,
@@ -202,30 +281,30 @@ def calcular_taxa_horaria_sugerida(dados: dict) -> tuple[float, dict]:
 
     detalhes_calculo_taxa["Taxa Horária Sugerida Final"] = taxa_final_ajustada
 
-    print(f"\n=> Taxa Horária Sugerida: {formatar_moeda(taxa_final_ajustada)}")
+    if rastreio is not None:
+        _rastrear_taxa_horaria(rastreio, taxa_base, fatores_aplicados, taxa_final_ajustada)
 
     return taxa_final_ajustada, detalhes_calculo_taxa
 
 
-def calcular_preco_final_servico(taxa_horaria_sugerida: float, dados_servico: dict) -> tuple[float, dict]:
-    """Calcula o preço final do serviço aplicando complexidade e urgência."""
+def calcular_preco_final_servico(taxa_horaria_sugerida: float, dados_servico: dict,
+                                 rastreio: Rastreio | None = None,
+                                 parametros: Parametros | None = None) -> tuple[float, dict]:
+    """
+    Calcula o preço final do serviço aplicando complexidade e urgência.
+    Se `rastreio` for informado (ex: print), recebe o passo a passo do cálculo.
+    """
+    p = parametros or constants
     horas = dados_servico['horas_estimadas_servico']
     complexidade_str = dados_servico['nivel_complexidade_servico']
     urgencia_str = dados_servico['nivel_urgencia_servico']
 
-    fator_complexidade = constants.MULTIPLICADOR_COMPLEXIDADE.get(complexidade_str, 1.0)
-    fator_urgencia = constants.MULTIPLICADOR_URGENCIA.get(urgencia_str, 1.0)
+    fator_complexidade = p.MULTIPLICADOR_COMPLEXIDADE.get(complexidade_str, 1.0)
+    fator_urgencia = p.MULTIPLICADOR_URGENCIA.get(urgencia_str, 1.0)
 
     preco_base = taxa_horaria_sugerida * horas
     preco_final = preco_base * fator_complexidade * fator_urgencia
 
-    print(f"\nCalculando Preço do Serviço Específico:")
-    print(f"- Horas Estimadas: {formatar_numero(horas, 1)} h")
-    print(f"- Nível Complexidade: {complexidade_str} ({fator_complexidade:.2f}x)")
-    print(f"- Nível Urgência: {urgencia_str} ({fator_urgencia:.2f}x)")
-    print(f"- Preço Base (Taxa * Horas): {formatar_moeda(preco_base)}")
-    print(f"=> Preço Final Sugerido (Base * Complexidade * Urgência): {formatar_moeda(preco_final)}")
-
     detalhes = {
         "Taxa Horária Utilizada": taxa_horaria_sugerida,
         "Horas Estimadas": horas,
@@ -236,4 +315,34 @@ def calcular_preco_final_servico(taxa_horaria_sugerida: float, dados_servico: di
         "Preço Base (Taxa * Horas)": preco_base,
         "Preço Final Sugerido": preco_final
     }
-    return preco_final, detalhes
\ No newline at end of file
+    if rastreio is not None:
+        _rastrear_preco_servico(rastreio, detalhes)
+    return preco_final, detalhes
+
+def calcular_simulacao(dados: dict, rastreio: Rastreio | None = None,
+                       data_referencia: date | None = None, parametros: Parametros | None = None) -> dict:
+    """
+    Executa a simulação completa de um perfil já validado e devolve o dicionário `calculos`
+    usado pelos relatórios: taxa horária, preço do serviço e, se houver 'percentual_exito' (%)
+    em `dados`, o valor de referência por êxito (percentual sobre o preço da base horária).
+    """
+    taxa, detalhes_taxa = calcular_taxa_horaria_sugerida(dados, rastreio, data_referencia, parametros)
+    preco, detalhes_preco = calcular_preco_final_servico(taxa, dados, rastreio, parametros)
+
+    preco_exito, detalhes_exito = None, {}
+    percentual = dados.get('percentual_exito', 0.0)
+    if percentual > 0:
+        preco_exito = preco * percentual / 100.0
+        detalhes_exito = {
+            "Valor Estimado Causa Cliente": dados.get('valor_estimado_causa_ganha', 0.0),
+            "Percentual Êxito Aplicado": percentual / 100.0,
+        }
+    return {
+        "taxa_horaria_sugerida": taxa,
+        "preco_horario_sugerido": preco,
+        "detalhes_taxa_horaria": detalhes_taxa,
+        "detalhes_preco_horario": detalhes_preco,
+        "preco_exito_sugerido": preco_exito,
+        "detalhes_preco_exito": detalhes_exito,
+        "faixa_preco_horario": None,
+    }
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""
+Histórico de Simulações (SQLite Indexado)
+-----------------------------------------
+Guarda cada simulação executada num banco SQLite local
+(output/historico.sqlite3): entradas completas (JSON), os cinco fatores da
+taxa horária, os fatores de complexidade e urgência, taxa, preço, preço de
+êxito e a impressão digital de core/constants.py em vigor no cálculo.
+
+Colunas filtráveis (advogado, área, nível do serviço, data, preço) têm
+índices compostos terminados na data, então consultas como "cotações de
+Tributária acima de R$ 50 mil neste trimestre" percorrem só o trecho do
+índice que interessa, mesmo com milhões de linhas. O banco usa WAL
+(leitores não bloqueiam a gravação) e as inclusões são agrupadas: registrar()
+acumula as linhas em memória e grava tudo numa única transação ao atingir
+`tamanho_lote` linhas, ou na chamada seguinte depois de `intervalo_descarga`
+segundos. registrar() não tem temporizador próprio: quem registra poucas
+simulações espaçadas (a GUI) chama descarregar() ao fim do intervalo (na GUI,
+via after()). buscar() grava as pendentes antes de consultar.
+
+Exemplo:
+    historico = HistoricoSimulacoes()
+    historico.registrar(dados_input, calculos)
+    historico.descarregar()
+    historico.buscar(area="Tributária", preco_minimo=50000, desde=date(2025, 7, 1))
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from core.utils import impressao_constantes
+
+DIRETORIO_SAIDA = "output"
+NOME_HISTORICO = "historico.sqlite3"
+
+# Chave em detalhes_taxa_horaria['Fatores Multiplicadores'] -> coluna
+COLUNAS_FATORES: dict[str, str] = {
+    'Tempo Experiência': 'fator_tempo',
+    'Especialização (Pós)': 'fator_pos',
+    'Experiência Prática (Casos)': 'fator_pratica',
+    'Investimento Educacional': 'fator_educacao',
+    'Dedicação (Horas Extras)': 'fator_dedicacao',
+}
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS simulacoes (
+    id INTEGER PRIMARY KEY,
+    criado_em TEXT NOT NULL,       -- ISO 8601 (ordenável como texto)
+    data_referencia TEXT NOT NULL, -- "Hoje" usado nos anos de experiência
+    advogado TEXT NOT NULL,
+    area TEXT,
+    complexidade TEXT,
+    urgencia TEXT,
+    horas REAL,
+    taxa_base REAL,
+    fator_tempo REAL,
+    fator_pos REAL,
+    fator_pratica REAL,
+    fator_educacao REAL,
+    fator_dedicacao REAL,
+    fator_complexidade REAL,
+    fator_urgencia REAL,
+    taxa_horaria REAL,
+    preco REAL,
+    preco_exito REAL,
+    constantes TEXT NOT NULL,      -- core.utils.impressao_constantes() no momento do cálculo
+    entradas TEXT NOT NULL         -- dados_input completo em JSON (datas em ISO)
+);
+CREATE INDEX IF NOT EXISTS idx_simulacoes_advogado ON simulacoes (advogado, criado_em);
+CREATE INDEX IF NOT EXISTS idx_simulacoes_area ON simulacoes (area, criado_em);
+CREATE INDEX IF NOT EXISTS idx_simulacoes_nivel ON simulacoes (complexidade, urgencia, criado_em);
+CREATE INDEX IF NOT EXISTS idx_simulacoes_criado_em ON simulacoes (criado_em);
+CREATE INDEX IF NOT EXISTS idx_simulacoes_preco ON simulacoes (preco);
+"""
+
+_INCLUIR = f"INSERT INTO simulacoes VALUES (NULL{', ?' * 20})"
+
+
+def _json_entrada(valor):
+    """Serialização dos tipos que o json não conhece nas entradas (datas)."""
+    return valor.isoformat() if isinstance(valor, date) else str(valor)
+
+
+def linha_historico(dados_input: dict, calculos: dict, constantes: str, instante: datetime | None = None,
+                    data_referencia: date | None = None) -> tuple:
+    """Valores de uma linha da tabela `simulacoes` (na ordem das colunas, sem o id)."""
+    detalhes_taxa = calculos.get('detalhes_taxa_horaria') or {}
+    fatores = detalhes_taxa.get('Fatores Multiplicadores') or {}
+    detalhes_preco = calculos.get('detalhes_preco_horario') or {}
+    return (
+        (instante or datetime.now()).isoformat(timespec='seconds'),
+        (data_referencia or date.today()).isoformat(),
+        dados_input.get('nome_advogado') or "Advogado",
+        dados_input.get('area_servico_atual'),
+        dados_input.get('nivel_complexidade_servico'),
+        dados_input.get('nivel_urgencia_servico'),
+        dados_input.get('horas_estimadas_servico'),
+        dados_input.get('taxa_horaria_base_minima'),
+        *(fatores.get(nome) for nome in COLUNAS_FATORES),
+        detalhes_preco.get('Fator Complexidade'),
+        detalhes_preco.get('Fator Urgência'),
+        calculos.get('taxa_horaria_sugerida'),
+        calculos.get('preco_horario_sugerido'),
+        calculos.get('preco_exito_sugerido'),
+        constantes,
+        json.dumps(dados_input, ensure_ascii=False, sort_keys=True, default=_json_entrada),
+    )
+
+
+class HistoricoSimulacoes:
+    """Histórico SQLite (WAL) das simulações, com inclusões agrupadas em lotes e consultas indexadas."""
+
+    __slots__ = ('caminho', 'tamanho_lote', 'intervalo_descarga', '_pendentes', '_ultima_descarga', '_trava')
+
+    def __init__(self, diretorio: str = DIRETORIO_SAIDA, tamanho_lote: int = 50, intervalo_descarga: float = 5.0):
+        if tamanho_lote < 1 or intervalo_descarga < 0:
+            raise ValueError("O tamanho do lote deve ser de pelo menos 1 e o intervalo não pode ser negativo.")
+        os.makedirs(diretorio, exist_ok=True)
+        self.caminho = os.path.join(diretorio, NOME_HISTORICO)
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_descarga = intervalo_descarga
+        self._pendentes: list[tuple] = []
+        self._ultima_descarga = time.monotonic()
+        self._trava = threading.Lock() # Protege os pendentes entre threads do mesmo processo
+        with self._conexao() as conexao:
+            conexao.execute("PRAGMA journal_mode=WAL") # Persistente: vale para todas as conexões futuras
+            conexao.executescript(_ESQUEMA)
+
+    @contextmanager
+    def _conexao(self):
+        """Conexão curta por operação (segura entre threads); confirma a transação ao sair sem erro."""
+        conexao = sqlite3.connect(self.caminho, timeout=10)
+        conexao.row_factory = sqlite3.Row
+        conexao.execute("PRAGMA synchronous=NORMAL") # Com WAL, seguro contra corrupção e sem fsync a cada transação
+        try:
+            with conexao:
+                yield conexao
+        finally:
+            conexao.close()
+
+    # --- Gravação ---
+
+    def registrar(self, dados_input: dict, calculos: dict, instante: datetime | None = None,
+                  data_referencia: date | None = None) -> None:
+        """Acumula uma simulação; grava o lote quando ele enche ou o intervalo de descarga passa."""
+        linha = linha_historico(dados_input, calculos, impressao_constantes(), instante, data_referencia)
+        with self._trava:
+            self._pendentes.append(linha)
+            cheio = (len(self._pendentes) >= self.tamanho_lote
+                     or time.monotonic() - self._ultima_descarga >= self.intervalo_descarga)
+        if cheio:
+            self.descarregar()
+
+    def registrar_lote(self, simulacoes: Iterable[tuple[dict, dict]], data_referencia: date | None = None) -> int:
+        """Grava de uma vez (uma transação) pares (dados_input, calculos). Retorna quantos foram gravados."""
+        constantes = impressao_constantes() # Os parâmetros não mudam no meio do lote
+        instante = datetime.now()
+        linhas = [linha_historico(dados, calculos, constantes, instante, data_referencia)
+                  for dados, calculos in simulacoes]
+        with self._conexao() as conexao:
+            conexao.executemany(_INCLUIR, linhas)
+        return len(linhas)
+
+    def descarregar(self) -> int:
+        """Grava as simulações pendentes numa única transação. Retorna quantas foram gravadas."""
+        with self._trava:
+            linhas, self._pendentes = self._pendentes, []
+            self._ultima_descarga = time.monotonic()
+        if linhas:
+            with self._conexao() as conexao:
+                conexao.executemany(_INCLUIR, linhas)
+        return len(linhas)
+
+    # --- Consulta ---
+
+    def buscar(self, advogado: str | None = None, area: str | None = None, complexidade: str | None = None,
+               urgencia: str | None = None, desde: date | None = None, ate: date | None = None,
+               preco_minimo: float | None = None, preco_maximo: float | None = None,
+               limite: int = 100) -> list[dict]:
+        """Simulações que atendem aos filtros, da mais recente à mais antiga (as pendentes são gravadas antes)."""
+        self.descarregar()
+        condicoes, parametros = [], []
+        for coluna, valor in (('advogado', advogado), ('area', area),
+                              ('complexidade', complexidade), ('urgencia', urgencia)):
+            if valor is not None:
+                condicoes.append(f"{coluna} = ?")
+                parametros.append(valor)
+        if desde is not None:
+            condicoes.append("criado_em >= ?")
+            parametros.append(desde.isoformat())
+        if ate is not None:
+            condicoes.append("criado_em < ?") # Inclui o dia inteiro de `ate`
+            parametros.append((ate + timedelta(days=1)).isoformat())
+        if preco_minimo is not None:
+            condicoes.append("preco >= ?")
+            parametros.append(preco_minimo)
+        if preco_maximo is not None:
+            condicoes.append("preco <= ?")
+            parametros.append(preco_maximo)
+        filtro = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        with self._conexao() as conexao:
+            linhas = conexao.execute(f"SELECT * FROM simulacoes {filtro} ORDER BY criado_em DESC LIMIT ?",
+                                     (*parametros, limite)).fetchall()
+        return [{**dict(linha), 'entradas': json.loads(linha['entradas'])} for linha in linhas]
+
+    def estatisticas(self) -> dict:
+        """Quantidade de simulações gravadas e pendentes."""
+        with self._conexao() as conexao:
+            (quantidade,) = conexao.execute("SELECT COUNT(*) FROM simulacoes").fetchone()
+        return {'simulacoes': quantidade, 'pendentes': len(self._pendentes)}
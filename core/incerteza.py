@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+"""
+Simulação de Incerteza (Monte Carlo) do Preço do Serviço
+--------------------------------------------------------
+As horas estimadas e o valor da causa são palpites, e complexidade e
+urgência nem sempre estão definidas no momento do orçamento. Aqui cada
+entrada pode ser um valor fixo ou uma distribuição (Triangular, LogNormal,
+Discreta); simular_preco_servico sorteia todas de uma vez com NumPy e
+devolve a faixa de preços (P10/P50/P90) e estatísticas de exposição
+em relação ao valor da causa.
+
+O preço de cada sorteio segue exatamente a fórmula de
+core.formulas.calcular_preco_final_servico (taxa * horas * complexidade * urgência).
+"""
+
+import numpy as np
+
+import core.constants as constants
+from core.parametros import Parametros
+
+SIMULACOES_PADRAO: int = 100_000
+PERCENTIS: tuple[int, ...] = (10, 50, 90)
+
+
+# --- Distribuições ---
+
+class Triangular:
+    """Distribuição triangular (mínimo, mais provável, máximo), usual para estimativas de horas."""
+
+    __slots__ = ('minimo', 'moda', 'maximo')
+
+    def __init__(self, minimo: float, moda: float, maximo: float):
+        # Mínimo positivo: horas e valores negativos gerariam preços negativos
+        if not 0 < minimo <= moda <= maximo or minimo == maximo:
+            raise ValueError(f"Triangular inválida: é preciso 0 < mínimo <= mais provável <= máximo e mínimo < máximo "
+                             f"(recebido {minimo}, {moda}, {maximo}).")
+        self.minimo = float(minimo)
+        self.moda = float(moda)
+        self.maximo = float(maximo)
+
+    def amostrar(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return rng.triangular(self.minimo, self.moda, self.maximo, size=n)
+
+    def __repr__(self):
+        return f"Triangular({self.minimo!r}, {self.moda!r}, {self.maximo!r})"
+
+
+class LogNormal:
+    """Distribuição lognormal definida pela mediana e pelo desvio (sigma) do logaritmo."""
+
+    __slots__ = ('mediana', 'sigma')
+
+    def __init__(self, mediana: float, sigma: float):
+        if mediana <= 0 or sigma < 0:
+            raise ValueError(f"LogNormal inválida: mediana > 0 e sigma >= 0 (recebido {mediana}, {sigma}).")
+        self.mediana = float(mediana)
+        self.sigma = float(sigma)
+
+    @classmethod
+    def de_percentis(cls, p50: float, p90: float) -> "LogNormal":
+        """Cria a distribuição a partir de dois palpites: valor mediano e valor 'pessimista' (P90)."""
+        if p90 < p50:
+            raise ValueError("O P90 deve ser maior ou igual ao P50.")
+        # z(0,90) da normal padrão
+        return cls(p50, np.log(p90 / p50) / 1.2815515655446004)
+
+    def amostrar(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return rng.lognormal(np.log(self.mediana), self.sigma, size=n)
+
+    def __repr__(self):
+        return f"LogNormal({self.mediana!r}, {self.sigma!r})"
+
+
+class Discreta:
+    """Probabilidades por nível (ex: {'Média': 0.6, 'Alta': 0.4}), sorteadas como multiplicadores da tabela."""
+
+    __slots__ = ('probabilidades',)
+
+    def __init__(self, probabilidades: dict[str, float]):
+        total = sum(probabilidades.values())
+        if not probabilidades or total <= 0 or any(p < 0 for p in probabilidades.values()):
+            raise ValueError("Informe ao menos um nível com probabilidade positiva (nenhuma negativa).")
+        # Normaliza para somar 1 (aceita pesos como 3:1 ou percentuais)
+        self.probabilidades = {nivel: p / total for nivel, p in probabilidades.items()}
+
+    def multiplicadores(self, tabela: dict[str, float], nome: str) -> tuple[np.ndarray, np.ndarray]:
+        """Retorna (multiplicadores, probabilidades) dos níveis, validando-os contra a tabela."""
+        desconhecidos = [nivel for nivel in self.probabilidades if nivel not in tabela]
+        if desconhecidos:
+            raise ValueError(f"Nível de {nome} desconhecido: {', '.join(desconhecidos)}.")
+        valores = np.array([tabela[nivel] for nivel in self.probabilidades], dtype=np.float64)
+        return valores, np.array(list(self.probabilidades.values()), dtype=np.float64)
+
+    def __repr__(self):
+        return f"Discreta({self.probabilidades!r})"
+
+
+def _amostrar_valor(entrada, rng: np.random.Generator, n: int) -> np.ndarray:
+    """Sorteia uma distribuição ou repete um valor fixo n vezes."""
+    if hasattr(entrada, 'amostrar'):
+        return entrada.amostrar(rng, n)
+    return np.full(n, float(entrada))
+
+
+def _amostrar_nivel(entrada, tabela: dict[str, float], nome: str, rng: np.random.Generator, n: int) -> np.ndarray:
+    """Sorteia multiplicadores de complexidade/urgência; um nome de nível fixo usa o multiplicador da tabela."""
+    if isinstance(entrada, Discreta):
+        valores, probabilidades = entrada.multiplicadores(tabela, nome)
+        return rng.choice(valores, size=n, p=probabilidades)
+    if entrada not in tabela:
+        raise ValueError(f"Nível de {nome} desconhecido: {entrada}.")
+    return np.full(n, tabela[entrada])
+
+
+def _percentis(valores: np.ndarray, prefixo: str) -> dict[str, float]:
+    """P10/P50/P90 de um array, com chaves '<prefixo>_p10' etc."""
+    return {f"{prefixo}_p{p}": float(v) for p, v in zip(PERCENTIS, np.percentile(valores, PERCENTIS))}
+
+
+# --- Simulação ---
+
+def simular_preco_servico(
+    taxa_horaria_sugerida: float,
+    horas_estimadas_servico,
+    nivel_complexidade_servico,
+    nivel_urgencia_servico,
+    valor_estimado_causa_ganha=0.0,
+    n_simulacoes: int = SIMULACOES_PADRAO,
+    semente: int | None = None,
+    parametros: Parametros | None = None,
+) -> dict[str, float]:
+    """
+    Simula o preço final do serviço sob incerteza.
+    Horas e valor da causa: número fixo, Triangular ou LogNormal.
+    Complexidade e urgência: nome do nível ou Discreta, com as tabelas do perfil
+    `parametros` (padrão: core.constants).
+    Retorna percentis e estatísticas do preço e, se houver valor da causa,
+    a exposição: fração do ganho do cliente consumida pelos honorários e a
+    probabilidade de o preço superar esse ganho.
+    """
+    if n_simulacoes < 1:
+        raise ValueError("O número de simulações deve ser pelo menos 1.")
+    rng = np.random.default_rng(semente)
+    p = parametros or constants
+
+    horas = _amostrar_valor(horas_estimadas_servico, rng, n_simulacoes)
+    fator_complexidade = _amostrar_nivel(nivel_complexidade_servico, p.MULTIPLICADOR_COMPLEXIDADE,
+                                         "complexidade", rng, n_simulacoes)
+    fator_urgencia = _amostrar_nivel(nivel_urgencia_servico, p.MULTIPLICADOR_URGENCIA,
+                                     "urgência", rng, n_simulacoes)
+
+    # Mesma ordem de operações de calcular_preco_final_servico
+    preco_base = taxa_horaria_sugerida * horas
+    precos = preco_base * fator_complexidade * fator_urgencia
+
+    resultado = {
+        "n_simulacoes": n_simulacoes,
+        **_percentis(precos, "preco"),
+        "preco_medio": float(precos.mean()),
+        "preco_desvio_padrao": float(precos.std()),
+        "preco_minimo": float(precos.min()),
+        "preco_maximo": float(precos.max()),
+        "horas_p50": float(np.median(horas)),
+    }
+
+    valor_causa = _amostrar_valor(valor_estimado_causa_ganha, rng, n_simulacoes)
+    com_causa = valor_causa > 0
+    if com_causa.any():
+        proporcao = precos[com_causa] / valor_causa[com_causa]
+        resultado.update(_percentis(proporcao, "preco_sobre_causa"))
+        resultado["prob_preco_acima_causa"] = float((proporcao > 1.0).mean())
+    return resultado
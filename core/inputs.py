@@ -2,6 +2,7 @@ from datetime import date
 # Importa utils E constants agora
 from core.utils import parse_data, formatar_moeda # Importar formatar_moeda para o alerta
 from core import constants # Para usar as listas de opções
+from core.validacao import total_acoes_ganhas # Mesma regra usada pela GUI e pelo lote
 
 # (Funções obter_input_* e obter_input_opcao permanecem as mesmas)
 # ... (Inclua as funções obter_input_float, obter_input_int, etc. aqui) ...
@@ -117,13 +118,9 @@ def coletar_dados_simulacao() -> dict:
         dados['acoes_ganhas_civil'] = obter_input_int("  - Área Civil (inclui família, consumidor, etc.): ")
         dados['acoes_ganhas_trabalhista'] = obter_input_int("  - Área Trabalhista: ")
         dados['acoes_ganhas_tributaria'] = obter_input_int("  - Área Tributária: ")
-        dados['acoes_ganhas_outras'] = obter_input_int("  - Outras Áreas: ")
+        dados['acoes_ganhas_outra'] = obter_input_int("  - Outras Áreas: ") # Mesma chave usada em core/formulas.py
 
-        total_ganhas = (
-            dados['acoes_ganhas_previdenciaria'] + dados['acoes_ganhas_empresarial'] +
-            dados['acoes_ganhas_civil'] + dados['acoes_ganhas_trabalhista'] +
-            dados['acoes_ganhas_tributaria'] + dados['acoes_ganhas_outras']
-        )
+        total_ganhas = total_acoes_ganhas(dados)
 
         if total_ganhas > dados['total_acoes_defendidas']:
             print("\n" + "="*25 + " ERRO DE VALIDAÇÃO " + "="*25)
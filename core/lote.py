@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+"""
+Motor de Cálculo em Lote (Vetorizado)
+-------------------------------------
+Versão colunar das fórmulas de core/formulas.py. Em vez de um dicionário
+`dados` por advogado, recebe arrays NumPy (uma posição por perfil) e calcula
+os cinco fatores, a taxa horária e o preço final do serviço com operações
+sobre o array inteiro. Os resultados reproduzem o caminho escalar
+(calcular_taxa_horaria_sugerida / calcular_preco_final_servico).
+
+Convenções das colunas:
+- Datas são ordinais de dia (date.toordinal()); 0 indica data ausente.
+- As datas de pós-graduação formam uma matriz (n_perfis, max_pos),
+  preenchida com 0 nas posições sem pós.
+- Complexidade e urgência são códigos inteiros: o índice do nível em
+  constants.NIVEIS_COMPLEXIDADE / constants.NIVEIS_URGENCIA (ou do perfil), ou -1 para
+  nível desconhecido (multiplicador 1.0, como o .get(..., 1.0) escalar).
+"""
+
+from datetime import date
+
+import numpy as np
+
+import core.constants as constants
+from core.parametros import Parametros
+from core.utils import parse_data
+from core.validacao import total_acoes_ganhas
+
+# Mesmo divisor usado em core.utils.calcular_anos_desde
+DIAS_POR_ANO: float = 365.2425
+
+# Ordinal de 01/01/1970, origem do datetime64 do NumPy
+_ORDINAL_EPOCH: int = date(1970, 1, 1).toordinal()
+
+
+# --- Conversão de Dados para Colunas ---
+
+def codificar_niveis(valores, niveis: list[str]) -> np.ndarray:
+    """Converte nomes de nível (ex: 'Alta') em códigos inteiros; -1 para nomes desconhecidos."""
+    indice = {nome: i for i, nome in enumerate(niveis)}
+    return np.fromiter((indice.get(v, -1) for v in valores), dtype=np.int64)
+
+
+def ordinais_de_textos(textos) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converte uma coluna de datas em texto (mesmos formatos de utils.parse_data)
+    em ordinais de dia, no formato das colunas do lote. Retorna (ordinais, validos):
+    posições inválidas ou vazias ficam com ordinal 0 e validos=False.
+    """
+    cache = {}  # Textos repetidos (muito comuns em planilhas) são convertidos uma só vez
+
+    def _ordinal(texto):
+        if texto not in cache:
+            data_obj = parse_data(texto) if isinstance(texto, str) else None
+            cache[texto] = data_obj.toordinal() if data_obj else 0
+        return cache[texto]
+
+    ordinais = np.fromiter((_ordinal(t) for t in textos), dtype=np.int64)
+    return ordinais, ordinais > 0
+
+
+def ordinais_para_datetime64(ordinais: np.ndarray) -> np.ndarray:
+    """Converte ordinais de dia em datetime64[D]; ordinais 0 (data ausente) viram NaT."""
+    ordinais = np.asarray(ordinais, dtype=np.int64)
+    dias_epoch = ordinais - _ORDINAL_EPOCH
+    return np.where(ordinais > 0, dias_epoch, np.iinfo(np.int64).min).astype('datetime64[D]')
+
+
+def colunas_de_dados(lista_dados: list[dict], parametros: Parametros | None = None) -> dict[str, np.ndarray]:
+    """
+    Monta as colunas do lote a partir de uma lista de dicionários `dados` (formato da GUI).
+    Os códigos de complexidade e urgência seguem os níveis do perfil `parametros` (padrão: core.constants).
+    """
+    p = parametros or constants
+    n = len(lista_dados)
+    max_pos = max((len(d.get('datas_pos_graduacao') or []) for d in lista_dados), default=0)
+    datas_pos = np.zeros((n, max(max_pos, 1)), dtype=np.int64)
+    for i, d in enumerate(lista_dados):
+        for j, dt in enumerate(d.get('datas_pos_graduacao') or []):
+            datas_pos[i, j] = dt.toordinal() if dt else 0
+
+    def _ordinal(dt):
+        return dt.toordinal() if dt else 0
+
+    def _coluna(chave, dtype):
+        return np.fromiter((d[chave] for d in lista_dados), dtype=dtype, count=n)
+
+    # Mesmas chaves somadas pelo caminho escalar (CHAVES_ACOES_GANHAS): outras chaves acoes_ganhas_* são ignoradas
+    total_ganhas = np.fromiter((total_acoes_ganhas(d) for d in lista_dados), dtype=np.int64, count=n)
+    return {
+        'data_graduacao': np.fromiter((_ordinal(d['data_graduacao']) for d in lista_dados), dtype=np.int64, count=n),
+        'data_oab': np.fromiter((_ordinal(d['data_oab']) for d in lista_dados), dtype=np.int64, count=n),
+        'datas_pos_graduacao': datas_pos,
+        'total_acoes_defendidas': _coluna('total_acoes_defendidas', np.int64),
+        'total_acoes_ganhas': total_ganhas,
+        'gastos_educacao': _coluna('gastos_educacao', np.float64),
+        'horas_trabalhadas_fds_total': _coluna('horas_trabalhadas_fds_total', np.float64),
+        'taxa_horaria_base_minima': _coluna('taxa_horaria_base_minima', np.float64),
+        'horas_estimadas_servico': _coluna('horas_estimadas_servico', np.float64),
+        'codigo_complexidade': codificar_niveis((d['nivel_complexidade_servico'] for d in lista_dados), p.NIVEIS_COMPLEXIDADE),
+        'codigo_urgencia': codificar_niveis((d['nivel_urgencia_servico'] for d in lista_dados), p.NIVEIS_URGENCIA),
+    }
+
+
+# --- Fatores Vetorizados ---
+
+def anos_desde_lote(ordinais: np.ndarray, hoje_ordinal: int) -> np.ndarray:
+    """Anos fracionados entre cada data (ordinal) e hoje; 0.0 para datas ausentes ou futuras."""
+    ordinais = np.asarray(ordinais, dtype=np.int64)
+    dias = hoje_ordinal - ordinais
+    valido = (ordinais > 0) & (dias >= 0)
+    return np.where(valido, dias, 0) / DIAS_POR_ANO
+
+
+def fator_tempo_experiencia_lote(data_oab: np.ndarray, datas_pos: np.ndarray, hoje_ordinal: int,
+                                 parametros: Parametros | None = None) -> np.ndarray:
+    """Equivalente vetorizado de calcular_fator_tempo_experiencia."""
+    p = parametros or constants
+    anos_oab = anos_desde_lote(data_oab, hoje_ordinal)
+    datas_pos = np.atleast_2d(np.asarray(datas_pos, dtype=np.int64))
+    presentes = datas_pos > 0
+    num_pos = presentes.sum(axis=1)
+    soma_anos_pos = anos_desde_lote(datas_pos, hoje_ordinal).sum(axis=1)
+    media_pos = np.divide(soma_anos_pos, num_pos, out=np.zeros_like(soma_anos_pos), where=num_pos > 0)
+    fator = 1.0 + (p.PESO_ANO_POS_OAB * anos_oab) + (p.PESO_ANO_POS_GRAD * media_pos)
+    return np.maximum(1.0, fator)
+
+
+def fator_especializacao_pos_lote(datas_pos: np.ndarray, parametros: Parametros | None = None) -> np.ndarray:
+    """Equivalente vetorizado de calcular_fator_especializacao_pos."""
+    p = parametros or constants
+    num_pos = (np.atleast_2d(np.asarray(datas_pos, dtype=np.int64)) > 0).sum(axis=1)
+    return np.maximum(1.0, 1.0 + (p.VALOR_BASE_POS_GRAD * num_pos))
+
+
+def fator_experiencia_pratica_lote(total_acoes: np.ndarray, total_ganhas: np.ndarray,
+                                   parametros: Parametros | None = None) -> np.ndarray:
+    """Equivalente vetorizado de calcular_fator_experiencia_pratica (a área não altera o fator)."""
+    p = parametros or constants
+    total_acoes = np.asarray(total_acoes, dtype=np.float64)
+    total_ganhas = np.asarray(total_ganhas, dtype=np.float64)
+    significativo = total_acoes >= p.MIN_ACOES_PARA_SUCESSO_GERAL
+    taxa_sucesso_geral = np.divide(total_ganhas, total_acoes, out=np.zeros_like(total_acoes), where=significativo)
+    # Mesma expressão do escalar (log(total + 1)) para manter os resultados idênticos
+    log_volume = np.log(np.where(total_acoes > 0, total_acoes, 0.0) + 1.0)
+    fator = 1.0 + (p.PESO_VOLUME_ACOES * log_volume) \
+                + (p.PESO_TAXA_SUCESSO_GERAL * taxa_sucesso_geral) \
+                + (p.PESO_TAXA_SUCESSO_ESPECIFICA * taxa_sucesso_geral)
+    return np.maximum(1.0, fator)
+
+
+def fator_investimento_educacional_lote(gastos_educacao: np.ndarray, taxa_horaria_minima: np.ndarray,
+                                        parametros: Parametros | None = None) -> np.ndarray:
+    """Equivalente vetorizado de calcular_fator_investimento_educacional."""
+    p = parametros or constants
+    gastos_educacao = np.asarray(gastos_educacao, dtype=np.float64)
+    receita_anual = np.asarray(taxa_horaria_minima, dtype=np.float64) * p.HORAS_NORMAIS_POR_ANO
+    valido = receita_anual > 0
+    proporcao = np.divide(gastos_educacao, receita_anual, out=np.zeros_like(receita_anual), where=valido)
+    fator = 1.0 + (p.PESO_GASTO_EDUCACAO_SOBRE_TAXA_MIN_ANUAL * proporcao)
+    return np.where(valido, np.maximum(1.0, fator), 1.0)
+
+
+def fator_dedicacao_lote(horas_fds: np.ndarray, data_oab: np.ndarray, hoje_ordinal: int,
+                         parametros: Parametros | None = None) -> np.ndarray:
+    """Equivalente vetorizado de calcular_fator_dedicacao."""
+    p = parametros or constants
+    horas_normais_carreira = anos_desde_lote(data_oab, hoje_ordinal) * p.HORAS_NORMAIS_POR_ANO
+    valido = horas_normais_carreira > 0
+    proporcao = np.divide(np.asarray(horas_fds, dtype=np.float64), horas_normais_carreira,
+                          out=np.zeros_like(horas_normais_carreira), where=valido)
+    fator = 1.0 + (p.PESO_DEDICACAO_HORAS_FDS * proporcao)
+    return np.where(valido, np.maximum(1.0, fator), 1.0)
+
+
+# --- Funções Principais do Lote ---
+
+def _multiplicadores(codigos: np.ndarray, tabela: tuple[float, ...], nome: str) -> np.ndarray:
+    """Converte códigos de nível em multiplicadores pela tabela compilada (última posição: código -1 -> 1.0)."""
+    codigos = np.asarray(codigos, dtype=np.int64)
+    niveis = len(tabela) - 1
+    if codigos.size and (codigos.min() < -1 or codigos.max() >= niveis):
+        raise ValueError(f"Código de {nome} fora do intervalo [-1, {niveis - 1}].")
+    return np.asarray(tabela, dtype=np.float64)[codigos]
+
+
+def _tabela_multiplicadores(tabela: dict[str, float]) -> tuple[float, ...]:
+    """Tabela de core.constants no formato compilado de Parametros (TABELA_COMPLEXIDADE/TABELA_URGENCIA)."""
+    return (*tabela.values(), 1.0)
+
+
+def calcular_taxas_horarias_lote(
+    data_oab: np.ndarray,
+    datas_pos_graduacao: np.ndarray,
+    total_acoes_defendidas: np.ndarray,
+    total_acoes_ganhas: np.ndarray,
+    gastos_educacao: np.ndarray,
+    horas_trabalhadas_fds_total: np.ndarray,
+    taxa_horaria_base_minima: np.ndarray,
+    hoje_ordinal: int | None = None,
+    parametros: Parametros | None = None,
+) -> dict[str, np.ndarray]:
+    """Calcula os cinco fatores e a taxa horária sugerida para todos os perfis do lote."""
+    if hoje_ordinal is None:
+        hoje_ordinal = date.today().toordinal()
+
+    fatores = {
+        'fator_tempo': fator_tempo_experiencia_lote(data_oab, datas_pos_graduacao, hoje_ordinal, parametros),
+        'fator_especializacao': fator_especializacao_pos_lote(datas_pos_graduacao, parametros),
+        'fator_pratica': fator_experiencia_pratica_lote(total_acoes_defendidas, total_acoes_ganhas, parametros),
+        'fator_educacao': fator_investimento_educacional_lote(gastos_educacao, taxa_horaria_base_minima, parametros),
+        'fator_dedicacao': fator_dedicacao_lote(horas_trabalhadas_fds_total, data_oab, hoje_ordinal, parametros),
+    }
+
+    # Multiplica na mesma ordem do caminho escalar para manter os resultados idênticos
+    taxa = np.array(taxa_horaria_base_minima, dtype=np.float64)
+    for fator in fatores.values():
+        taxa *= fator
+    fatores['taxa_horaria_sugerida'] = taxa
+    return fatores
+
+
+def calcular_precos_servico_lote(
+    taxa_horaria_sugerida: np.ndarray,
+    horas_estimadas_servico: np.ndarray,
+    codigo_complexidade: np.ndarray,
+    codigo_urgencia: np.ndarray,
+    parametros: Parametros | None = None,
+) -> dict[str, np.ndarray]:
+    """Equivalente vetorizado de calcular_preco_final_servico."""
+    if parametros is not None: # Tabelas já compiladas no perfil
+        tabela_complexidade, tabela_urgencia = parametros.TABELA_COMPLEXIDADE, parametros.TABELA_URGENCIA
+    else:
+        tabela_complexidade = _tabela_multiplicadores(constants.MULTIPLICADOR_COMPLEXIDADE)
+        tabela_urgencia = _tabela_multiplicadores(constants.MULTIPLICADOR_URGENCIA)
+    fator_complexidade = _multiplicadores(codigo_complexidade, tabela_complexidade, "complexidade")
+    fator_urgencia = _multiplicadores(codigo_urgencia, tabela_urgencia, "urgência")
+    preco_base = np.asarray(taxa_horaria_sugerida, dtype=np.float64) * np.asarray(horas_estimadas_servico, dtype=np.float64)
+    return {
+        'fator_complexidade': fator_complexidade,
+        'fator_urgencia': fator_urgencia,
+        'preco_base': preco_base,
+        'preco_final': preco_base * fator_complexidade * fator_urgencia,
+    }
+
+
+def calcular_lote(colunas: dict[str, np.ndarray], hoje_ordinal: int | None = None,
+                  parametros: Parametros | None = None) -> dict[str, np.ndarray]:
+    """
+    Calcula fatores, taxa horária e preço final para um lote inteiro.
+    `colunas` segue o formato de colunas_de_dados() (com os níveis do mesmo perfil);
+    data_graduacao é opcional (não entra em nenhum fator). `parametros` é o perfil
+    a usar (padrão: core.constants).
+    """
+    resultado = calcular_taxas_horarias_lote(
+        colunas['data_oab'],
+        colunas['datas_pos_graduacao'],
+        colunas['total_acoes_defendidas'],
+        colunas['total_acoes_ganhas'],
+        colunas['gastos_educacao'],
+        colunas['horas_trabalhadas_fds_total'],
+        colunas['taxa_horaria_base_minima'],
+        hoje_ordinal=hoje_ordinal,
+        parametros=parametros,
+    )
+    resultado.update(calcular_precos_servico_lote(
+        resultado['taxa_horaria_sugerida'],
+        colunas['horas_estimadas_servico'],
+        colunas['codigo_complexidade'],
+        colunas['codigo_urgencia'],
+        parametros,
+    ))
+    return resultado
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+"""
+Perfis de Parâmetros Externos (TOML/JSON) Compilados
+----------------------------------------------------
+Um perfil é a calibração de um escritório guardada fora do código: pesos,
+multiplicadores e tabelas de complexidade/urgência, com nome e versão.
+Os nomes são os mesmos de core/constants.py; o que o perfil não informar
+vem dos valores atuais de core.constants.
+
+    # escritorio_a.toml
+    nome = "Escritório A"
+    versao = "2025.2"
+    PESO_ANO_POS_OAB = 0.04
+    HORAS_NORMAIS_POR_ANO = 1760
+
+    [MULTIPLICADOR_URGENCIA]
+    Normal = 1.0
+    Moderada = 1.1
+    Alta = 1.3
+    Imediata = 1.5
+
+carregar_perfil() compila o arquivo num objeto Parametros imutável (com
+__slots__), com a impressão digital (SHA-256) do conteúdo e as tabelas de
+complexidade e urgência já prontas em duas formas: o dicionário nível ->
+multiplicador (caminho escalar) e a tupla indexada pelo código do nível,
+com 1.0 na última posição para o código -1 (motor em lote). Vários perfis
+convivem no mesmo processo: cada cálculo recebe o seu por parâmetro
+(`parametros=` em core.formulas, core.lote e core.sessao); sem ele, os
+cálculos continuam lendo core.constants.
+
+Exemplo:
+    perfil_a = carregar_perfil("perfis/escritorio_a.toml")
+    perfil_b = carregar_perfil("perfis/escritorio_b.json")
+    formulas.calcular_simulacao(dados, parametros=perfil_a)
+    lote.calcular_lote(colunas, parametros=perfil_b)
+"""
+
+import hashlib
+import json
+import math
+import os
+from types import MappingProxyType
+
+import core.constants as constants
+
+# Parâmetros escalares de um perfil (mesmos nomes de core/constants.py)
+PARAMETROS_NUMERICOS: tuple[str, ...] = (
+    'PESO_ANO_POS_OAB', 'PESO_ANO_POS_GRAD', 'VALOR_BASE_POS_GRAD',
+    'PESO_VOLUME_ACOES', 'PESO_TAXA_SUCESSO_GERAL', 'PESO_TAXA_SUCESSO_ESPECIFICA', 'MIN_ACOES_PARA_SUCESSO_GERAL',
+    'PESO_GASTO_EDUCACAO_SOBRE_TAXA_MIN_ANUAL', 'HORAS_NORMAIS_POR_ANO', 'PESO_DEDICACAO_HORAS_FDS',
+)
+TABELAS: tuple[str, ...] = ('MULTIPLICADOR_COMPLEXIDADE', 'MULTIPLICADOR_URGENCIA')
+
+
+def _numero(nome: str, valor) -> float:
+    """Valida um número do perfil (finito, não negativo; booleanos e textos não são aceitos)."""
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)) or not math.isfinite(valor) or valor < 0:
+        raise ValueError(f"Valor inválido para '{nome}' no perfil: {valor!r} (use um número >= 0).")
+    return valor
+
+
+def _tabela(nome: str, valores) -> dict[str, float]:
+    if not isinstance(valores, dict) or not valores:
+        raise ValueError(f"'{nome}' deve ser uma tabela nível -> multiplicador, com pelo menos um nível.")
+    return {str(nivel): float(_numero(f"{nome}.{nivel}", valor)) for nivel, valor in valores.items()}
+
+
+class Parametros:
+    """
+    Conjunto imutável de parâmetros compilado de um perfil.
+    Os atributos em maiúsculas têm os nomes de core.constants, então as fórmulas leem
+    `parametros.PESO_ANO_POS_OAB` ou `constants.PESO_ANO_POS_OAB` da mesma forma.
+    """
+
+    __slots__ = ('nome', 'versao', 'impressao', *PARAMETROS_NUMERICOS, *TABELAS,
+                 'NIVEIS_COMPLEXIDADE', 'NIVEIS_URGENCIA', 'TABELA_COMPLEXIDADE', 'TABELA_URGENCIA')
+
+    def __init__(self, nome: str, versao: str, valores: dict):
+        """`valores`: todos os PARAMETROS_NUMERICOS e TABELAS, já validados (use compilar_parametros)."""
+        definir = object.__setattr__
+        definir(self, 'nome', nome)
+        definir(self, 'versao', versao)
+        for chave in PARAMETROS_NUMERICOS:
+            definir(self, chave, valores[chave])
+        for chave, sufixo in zip(TABELAS, ('COMPLEXIDADE', 'URGENCIA')):
+            tabela = dict(valores[chave])
+            definir(self, chave, MappingProxyType(tabela))
+            definir(self, f'NIVEIS_{sufixo}', tuple(tabela))
+            # Código do nível -> multiplicador; a posição extra no fim atende o código -1 (nível desconhecido)
+            definir(self, f'TABELA_{sufixo}', (*tabela.values(), 1.0))
+        definir(self, 'impressao', self._impressao())
+
+    def _impressao(self) -> str:
+        """
+        SHA-256 (16 dígitos) do conteúdo em ordem fixa. As tabelas entram como pares [nível, multiplicador]
+        na ordem do perfil: a ordem define os códigos dos níveis no motor em lote, então faz parte do perfil.
+        """
+        conteudo = [[chave, float(getattr(self, chave))] for chave in PARAMETROS_NUMERICOS]
+        conteudo += [[chave, [[nivel, valor] for nivel, valor in getattr(self, chave).items()]] for chave in TABELAS]
+        texto = json.dumps(conteudo, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:16]
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError(f"Parametros é imutável (perfil '{self.nome}'); use com_alteracoes().")
+
+    def __delattr__(self, nome):
+        raise AttributeError(f"Parametros é imutável (perfil '{self.nome}').")
+
+    def __reduce__(self): # Enviado a processos do pool pelo conteúdo (os atributos são somente leitura)
+        return (Parametros, (self.nome, self.versao, self.valores()))
+
+    def __eq__(self, outro):
+        if not isinstance(outro, Parametros):
+            return NotImplemented
+        return (self.nome, self.versao, self.impressao) == (outro.nome, outro.versao, outro.impressao)
+
+    def __hash__(self):
+        return hash((self.nome, self.versao, self.impressao))
+
+    def __repr__(self):
+        return f"Parametros({self.nome!r}, versao={self.versao!r}, impressao={self.impressao!r})"
+
+    def valores(self) -> dict:
+        """Conteúdo do perfil como dicionário simples (o formato aceito por compilar_parametros)."""
+        valores = {chave: getattr(self, chave) for chave in PARAMETROS_NUMERICOS}
+        valores.update({chave: dict(getattr(self, chave)) for chave in TABELAS})
+        return valores
+
+    def com_alteracoes(self, alteracoes: dict, nome: str | None = None, versao: str | None = None) -> 'Parametros':
+        """
+        Novo perfil com alguns valores trocados. Aceita os nomes de core.calibracao:
+        'PESO_ANO_POS_OAB' ou 'TABELA.nível' (ex: 'MULTIPLICADOR_URGENCIA.Imediata').
+        """
+        valores = self.valores()
+        for chave, valor in alteracoes.items():
+            if '.' in chave:
+                tabela, nivel = chave.split('.', 1)
+                if tabela not in TABELAS or nivel not in valores[tabela]:
+                    raise ValueError(f"Parâmetro desconhecido no perfil: '{chave}'.")
+                valores[tabela][nivel] = valor
+            else:
+                valores[chave] = valor
+        return compilar_parametros(valores, nome or self.nome, versao or self.versao, base=self)
+
+
+def compilar_parametros(valores: dict, nome: str = "personalizado", versao: str = "1",
+                        base: 'Parametros | None' = None) -> Parametros:
+    """
+    Valida `valores` (nomes de core.constants) e compila um Parametros.
+    Parâmetros ausentes vêm de `base` ou, sem base, dos valores atuais de core.constants.
+    Uma tabela informada substitui a da base por inteiro (os níveis são os do perfil).
+    """
+    desconhecidos = set(valores) - set(PARAMETROS_NUMERICOS) - set(TABELAS)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos no perfil: {', '.join(sorted(desconhecidos))}.")
+    origem = base if base is not None else constants
+    compilados = {}
+    for chave in PARAMETROS_NUMERICOS:
+        compilados[chave] = _numero(chave, valores[chave]) if chave in valores else getattr(origem, chave)
+    for chave in TABELAS:
+        compilados[chave] = _tabela(chave, valores[chave]) if chave in valores else dict(getattr(origem, chave))
+    if compilados['HORAS_NORMAIS_POR_ANO'] <= 0:
+        raise ValueError("'HORAS_NORMAIS_POR_ANO' deve ser maior que zero.")
+    if compilados['MIN_ACOES_PARA_SUCESSO_GERAL'] != int(compilados['MIN_ACOES_PARA_SUCESSO_GERAL']):
+        raise ValueError("'MIN_ACOES_PARA_SUCESSO_GERAL' deve ser um número inteiro.")
+    return Parametros(str(nome), str(versao), compilados)
+
+
+def parametros_de_constantes(nome: str = "constants.py", versao: str = "atual") -> Parametros:
+    """Perfil com os valores atuais de core.constants (ponto de partida para com_alteracoes)."""
+    return compilar_parametros({}, nome, versao)
+
+
+def carregar_perfil(caminho: str, formato: str | None = None) -> Parametros:
+    """
+    Lê e compila um perfil TOML ou JSON (formato pela extensão, se não informado).
+    'nome' e 'versao' são opcionais (padrão: nome do arquivo e "1").
+    """
+    formato = (formato or os.path.splitext(caminho)[1].lstrip('.')).lower()
+    if formato == 'toml':
+        try:
+            import tomllib # Biblioteca padrão a partir do Python 3.11
+        except ImportError:
+            raise ValueError("Perfis TOML exigem Python 3.11 ou superior; use um perfil JSON.")
+        with open(caminho, "rb") as arquivo:
+            try:
+                conteudo = tomllib.load(arquivo)
+            except tomllib.TOMLDecodeError as e:
+                raise ValueError(f"Perfil TOML inválido em '{caminho}': {e}")
+    elif formato == 'json':
+        with open(caminho, encoding="utf-8") as arquivo:
+            try:
+                conteudo = json.load(arquivo)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Perfil JSON inválido em '{caminho}': {e}")
+    else:
+        raise ValueError(f"Formato de perfil não suportado: '{formato}'. Use toml ou json.")
+    if not isinstance(conteudo, dict):
+        raise ValueError(f"O perfil '{caminho}' deve ser um objeto/tabela de parâmetros.")
+
+    nome = conteudo.pop('nome', None) or os.path.splitext(os.path.basename(caminho))[0]
+    versao = conteudo.pop('versao', "1")
+    return compilar_parametros(conteudo, nome, versao)
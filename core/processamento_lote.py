@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+"""
+Processamento de Perfis em Fluxo (Sem Interação)
+------------------------------------------------
+Lê perfis em CSV ou JSONL, valida cada registro com as regras de
+core/validacao.py, precifica os válidos em blocos com o motor vetorizado
+de core/lote.py e escreve os resultados à medida que cada bloco termina.
+A memória usada depende apenas do tamanho do bloco, não do tamanho da
+entrada.
+
+Com um perfil de parâmetros (core/parametros.py, `parametros=`), os níveis
+de complexidade e urgência aceitos e os pesos usados no preço são os do
+perfil, em todas as etapas: conversão, validação e motor em lote.
+
+Cada registro usa as mesmas chaves do dicionário `dados` da GUI. No CSV,
+as datas de pós-graduação vão numa única coluna `datas_pos_graduacao`,
+separadas por ';'. No JSONL, podem ser uma lista ou a mesma string.
+"""
+
+import csv
+import json
+import math
+from datetime import date
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+from core import constants, lote
+from core.parametros import Parametros
+from core.registros import dados_simulacao, registros_de_dados
+from core.utils import parse_data
+from core.validacao import CAMPOS_FLOAT, CAMPOS_INTEIROS, validar_dados_simulacao, verificar_alertas
+
+TAMANHO_BLOCO_PADRAO: int = 10_000
+
+CAMPOS_SAIDA: list[str] = [
+    'linha', 'nome_advogado', 'status', 'erro', 'alertas',
+    'fator_tempo', 'fator_especializacao', 'fator_pratica', 'fator_educacao', 'fator_dedicacao',
+    'taxa_horaria_sugerida', 'preco_final',
+]
+
+
+# --- Leitura ---
+
+class RegistroInvalido:
+    """Linha da entrada que não pôde ser lida como registro; vira uma linha de erro na saída."""
+
+    __slots__ = ('mensagem',)
+
+    def __init__(self, mensagem: str):
+        self.mensagem = mensagem
+
+    def __repr__(self) -> str:
+        return f"RegistroInvalido({self.mensagem!r})"
+
+
+def ler_registros(arquivo: TextIO, formato: str) -> Iterator[dict | RegistroInvalido]:
+    """
+    Gera os registros brutos (dicionários de strings/valores JSON) de um arquivo CSV ou JSONL.
+    Uma linha JSONL ilegível ou que não seja um objeto gera um RegistroInvalido (com o número
+    da linha no arquivo), para que o restante da entrada continue sendo precificado.
+    """
+    if formato == 'csv':
+        yield from csv.DictReader(arquivo)
+    elif formato == 'jsonl':
+        for numero, linha in enumerate(arquivo, start=1):
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError as e:
+                yield RegistroInvalido(f"Linha {numero}: JSON inválido ({e.msg}, coluna {e.colno}).")
+                continue
+            if not isinstance(registro, dict):
+                yield RegistroInvalido(f"Linha {numero}: o registro deve ser um objeto JSON, não {type(registro).__name__}.")
+                continue
+            yield registro
+    else:
+        raise ValueError(f"Formato de entrada desconhecido: '{formato}'. Use 'csv' ou 'jsonl'.")
+
+
+def _converter_numero(valor, tipo, chave: str):
+    """Converte um campo numérico vindo de CSV/JSON (aceita vírgula decimal); rejeita booleanos, NaN e infinitos."""
+    if valor is None or valor == "":
+        return tipo(0)
+    if isinstance(valor, bool): # true/false do JSON não são números (True viraria 1)
+        raise ValueError(f"Valor inválido para '{chave}': '{valor}'.")
+    numero = valor
+    if not isinstance(valor, (int, float)):
+        texto = str(valor).strip()
+        if ',' in texto:  # Formato brasileiro: 1.234,56
+            texto = texto.replace('.', '').replace(',', '.')
+        try:
+            numero = float(texto) if tipo is float else int(texto)
+        except ValueError:
+            raise ValueError(f"Valor inválido para '{chave}': '{valor}'.")
+    if isinstance(numero, float) and not math.isfinite(numero): # NaN passaria por todas as comparações da validação
+        raise ValueError(f"Valor inválido para '{chave}': '{valor}'.")
+    if tipo is int and isinstance(numero, float) and not numero.is_integer(): # 3.7 não vira 3
+        raise ValueError(f"Valor inválido para '{chave}': '{valor}'. Insira um número inteiro.")
+    try:
+        return tipo(numero)
+    except OverflowError: # Inteiro grande demais para float
+        raise ValueError(f"Valor inválido para '{chave}': '{valor}'.")
+
+
+def _converter_data(valor, rotulo: str) -> date:
+    """Converte um campo de data; levanta ValueError se ausente ou inválido."""
+    data_obj = parse_data(valor) if isinstance(valor, str) else None
+    if data_obj is None:
+        raise ValueError(f"{rotulo} inválida ('{valor}'). Use DD/MM/AAAA.")
+    return data_obj
+
+
+def _validar_escalares(registro: dict) -> None:
+    """Rejeita valores compostos (listas, objetos) vindos de JSON, exceto a lista de datas de pós."""
+    for chave, valor in registro.items():
+        if chave == 'datas_pos_graduacao' and isinstance(valor, list):
+            composto = [item for item in valor if not isinstance(item, str)]
+        else:
+            composto = [valor] if isinstance(valor, (list, dict)) else []
+        if composto:
+            raise ValueError(f"Valor inválido para '{chave}': use um texto ou número, não {type(composto[0]).__name__}.")
+
+
+def converter_registro(registro: dict, hoje: date | None = None, parametros: Parametros | None = None) -> dict:
+    """
+    Converte um registro bruto no dicionário `dados` usado pelas fórmulas. Os campos passam
+    por PerfilAdvogado e Servico (core/registros.py), que validam cada um no construtor;
+    os níveis de complexidade e urgência são os do perfil `parametros` (padrão: core.constants).
+    """
+    p = parametros or constants
+    if not isinstance(registro, dict):
+        raise ValueError(f"O registro deve ser um objeto (chave -> valor), não {type(registro).__name__}.")
+    _validar_escalares(registro)
+    dados = {'nome_advogado': str(registro.get('nome_advogado') or "").strip()}
+    dados['data_graduacao'] = _converter_data(registro.get('data_graduacao'), "Data de Graduação")
+    dados['data_oab'] = _converter_data(registro.get('data_oab'), "Data da OAB")
+
+    datas_pos = registro.get('datas_pos_graduacao') or []
+    if isinstance(datas_pos, str):
+        datas_pos = [d for d in datas_pos.split(';') if d.strip()]
+    dados['datas_pos_graduacao'] = sorted({_converter_data(d, "Data de Pós") for d in datas_pos})
+
+    for chave in CAMPOS_INTEIROS:
+        dados[chave] = _converter_numero(registro.get(chave), int, chave)
+    for chave in CAMPOS_FLOAT + ['valor_estimado_causa_ganha', 'percentual_exito']:
+        dados[chave] = _converter_numero(registro.get(chave), float, chave)
+
+    dados['area_servico_atual'] = registro.get('area_servico_atual') or constants.AREAS_ATUACAO[0]
+    dados['nivel_complexidade_servico'] = registro.get('nivel_complexidade_servico') or p.NIVEIS_COMPLEXIDADE[0]
+    dados['nivel_urgencia_servico'] = registro.get('nivel_urgencia_servico') or p.NIVEIS_URGENCIA[0]
+    return dados_simulacao(*registros_de_dados(dados, hoje, parametros))
+
+
+# --- Processamento ---
+
+def _precificar_bloco(validos: list[tuple[dict, dict]], hoje: date, parametros: Parametros | None = None) -> None:
+    """Precifica os perfis válidos de um bloco e preenche as linhas de saída correspondentes."""
+    if not validos:
+        return
+    # Códigos de nível e tabelas do mesmo perfil nas duas chamadas
+    colunas_entrada = lote.colunas_de_dados([dados for dados, _ in validos], parametros)
+    resultado = lote.calcular_lote(colunas_entrada, hoje.toordinal(), parametros)
+    campos = ['fator_tempo', 'fator_especializacao', 'fator_pratica', 'fator_educacao',
+              'fator_dedicacao', 'taxa_horaria_sugerida', 'preco_final']
+    colunas = {campo: resultado[campo].tolist() for campo in campos}
+    for i, (_, linha_saida) in enumerate(validos):
+        for campo in campos:
+            linha_saida[campo] = colunas[campo][i]
+
+
+def processar_bloco(registros: list[tuple[int, dict]], rejeitar_alertas: bool = False,
+                    hoje: date | None = None, parametros: Parametros | None = None) -> list[dict]:
+    """Valida e precifica um bloco de registros numerados, devolvendo as linhas de saída na mesma ordem."""
+    hoje = hoje or date.today()
+    saida = []
+    validos = []
+    for numero, registro in registros:
+        linha_saida = {'linha': numero, 'status': 'ok', 'erro': '', 'alertas': '',
+                       'nome_advogado': registro.get('nome_advogado', '') if isinstance(registro, dict) else ''}
+        saida.append(linha_saida)
+        if isinstance(registro, RegistroInvalido):
+            linha_saida.update(status='erro', erro=registro.mensagem)
+            continue
+        try:
+            dados = converter_registro(registro, hoje, parametros)
+            validar_dados_simulacao(dados, hoje, parametros)
+        except ValueError as ve:
+            linha_saida.update(status='erro', erro=str(ve))
+            continue
+
+        alertas = verificar_alertas(dados)
+        linha_saida['alertas'] = " | ".join(alertas)
+        if alertas and rejeitar_alertas:
+            linha_saida.update(status='rejeitado', erro="Valores acima dos limites de alerta.")
+            continue
+        validos.append((dados, linha_saida))
+
+    _precificar_bloco(validos, hoje, parametros)
+    return saida
+
+
+def processar_fluxo(registros: Iterable[dict], tamanho_bloco: int = TAMANHO_BLOCO_PADRAO,
+                    rejeitar_alertas: bool = False, hoje: date | None = None,
+                    parametros: Parametros | None = None) -> Iterator[dict]:
+    """
+    Processa registros em blocos de tamanho fixo, gerando as linhas de saída bloco a bloco.
+    Todos os blocos usam a mesma data de referência (`hoje`), fixada no início do fluxo,
+    e o mesmo perfil de parâmetros (padrão: core.constants).
+    """
+    if tamanho_bloco < 1:
+        raise ValueError("O tamanho do bloco deve ser pelo menos 1.")
+    hoje = hoje or date.today()
+    numerados = enumerate(registros, start=1)
+    while True:
+        bloco = list(islice(numerados, tamanho_bloco))
+        if not bloco:
+            return
+        yield from processar_bloco(bloco, rejeitar_alertas, hoje, parametros)
+
+
+# --- Escrita ---
+
+def escrever_resultados(linhas: Iterable[dict], arquivo: TextIO, formato: str) -> dict[str, int]:
+    """Escreve as linhas de saída em CSV ou JSONL e devolve a contagem por status."""
+    contagem = {'ok': 0, 'erro': 0, 'rejeitado': 0}
+    if formato == 'csv':
+        escritor = csv.DictWriter(arquivo, fieldnames=CAMPOS_SAIDA, extrasaction='ignore')
+        escritor.writeheader()
+        escrever = escritor.writerow
+    elif formato == 'jsonl':
+        def escrever(linha):
+            arquivo.write(json.dumps(linha, ensure_ascii=False) + "\n")
+    else:
+        raise ValueError(f"Formato de saída desconhecido: '{formato}'. Use 'csv' ou 'jsonl'.")
+
+    for linha in linhas:
+        escrever(linha)
+        contagem[linha['status']] += 1
+    return contagem
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+"""
+Registros Tipados de Perfil e Serviço
+-------------------------------------
+PerfilAdvogado e Servico substituem os dicionários `dados` de chaves livres
+por registros com __slots__: cada campo é validado no construtor (com as
+regras de core/validacao.py), um nome de campo errado falha na hora com
+TypeError/AttributeError em vez de um KeyError no meio do cálculo, e cada
+registro ocupa uma fração da memória de um dicionário equivalente.
+
+Os nomes dos campos são os mesmos das chaves de `dados`, e de_dados() /
+para_dados() / dados_simulacao() convertem de e para o formato atual, de
+modo que core.formulas, core.lote e o relatório PDF continuam funcionando
+sem alterações. core.processamento_lote.converter_registro (lote, serviço
+HTTP, fila de tarefas e calibração) passa cada entrada por estes registros.
+"""
+
+import math
+import operator
+from datetime import date, datetime
+
+from core import constants
+from core.parametros import Parametros
+from core.utils import parse_data
+from core.validacao import (CHAVES_ACOES_GANHAS, HORAS_SERVICO_MINIMO, TAXA_BASE_MINIMO,
+                            validar_acoes, validar_data, validar_ordem_datas)
+
+
+def _inteiro_nao_negativo(valor, campo: str) -> int:
+    """Converte para int e rejeita negativos e valores não inteiros, sem truncar (mesma mensagem da validação de `dados`)."""
+    if type(valor) is int and valor >= 0: # Caso comum (valores já convertidos): sem custo extra
+        return valor
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    elif isinstance(valor, bool): # True não é 1 ação
+        valor = None
+    try:
+        valor = int(valor) if isinstance(valor, str) else operator.index(valor)
+    except (TypeError, ValueError): # 3.7, "3.0", "abc", None
+        valor = -1
+    if valor < 0:
+        raise ValueError(f"Valor inválido para '{campo}'. Insira um número inteiro >= 0.")
+    return valor
+
+
+def _numero_finito(valor, campo: str) -> float:
+    """Converte para float e rejeita booleanos, textos não numéricos, NaN e infinitos."""
+    if type(valor) is float and math.isfinite(valor):
+        return valor
+    try:
+        numero = math.nan if isinstance(valor, bool) else float(valor)
+    except (TypeError, ValueError, OverflowError):
+        numero = math.nan
+    if not math.isfinite(numero): # NaN passaria por todas as comparações com os mínimos
+        raise ValueError(f"Valor inválido para '{campo}'. Insira um número.")
+    return numero
+
+
+def _float_nao_negativo(valor, campo: str) -> float:
+    """Converte para float e rejeita negativos e valores não finitos."""
+    valor = _numero_finito(valor, campo)
+    if valor < 0:
+        raise ValueError(f"Valor inválido para '{campo}'. Valor não pode ser negativo.")
+    return valor
+
+
+def _data(valor, rotulo: str, hoje: date) -> date:
+    """Aceita date ou texto (formatos de utils.parse_data) e valida com validar_data; ValueError se inválida."""
+    if isinstance(valor, str):
+        valor = parse_data(valor)
+    elif isinstance(valor, datetime):
+        valor = valor.date()
+    elif not isinstance(valor, date):
+        valor = None
+    validar_data(valor, rotulo, hoje)
+    return valor
+
+
+class _Registro:
+    """
+    Base dos registros: conversão para dicionário, igualdade e repr a partir dos __slots__.
+    Os registros são mutáveis e comparados por valor, então são intencionalmente não hasheáveis
+    (não servem como chave de dicionário nem em set).
+    """
+
+    __slots__ = ()
+    __hash__ = None
+
+    def para_dados(self) -> dict:
+        """Retorna o registro no formato de dicionário `dados` usado pelas fórmulas e pelo PDF."""
+        dados = {campo: getattr(self, campo) for campo in self.__slots__}
+        if 'datas_pos_graduacao' in dados:
+            dados['datas_pos_graduacao'] = list(dados['datas_pos_graduacao'])
+        return dados
+
+    @classmethod
+    def de_dados(cls, dados: dict, hoje: date | None = None, **opcoes):
+        """Cria o registro a partir de um dicionário `dados`; chaves de outros registros são ignoradas."""
+        return cls(**{campo: dados[campo] for campo in cls.__slots__ if campo in dados}, hoje=hoje, **opcoes)
+
+    def __eq__(self, outro):
+        if type(outro) is not type(self):
+            return NotImplemented
+        return all(getattr(self, campo) == getattr(outro, campo) for campo in self.__slots__)
+
+    def __repr__(self):
+        campos = ", ".join(f"{campo}={getattr(self, campo)!r}" for campo in self.__slots__)
+        return f"{type(self).__name__}({campos})"
+
+
+class PerfilAdvogado(_Registro):
+    """Dados do advogado que definem a taxa horária (formação, experiência, investimento)."""
+
+    __slots__ = (
+        'nome_advogado', 'data_graduacao', 'data_oab', 'datas_pos_graduacao',
+        'total_acoes_defendidas', *CHAVES_ACOES_GANHAS,
+        'gastos_educacao', 'horas_trabalhadas_fds_total', 'taxa_horaria_base_minima',
+    )
+
+    def __init__(self, *, nome_advogado: str = "", data_graduacao: date, data_oab: date,
+                 datas_pos_graduacao=(), total_acoes_defendidas: int = 0,
+                 acoes_ganhas_previdenciaria: int = 0, acoes_ganhas_empresarial: int = 0,
+                 acoes_ganhas_civil: int = 0, acoes_ganhas_trabalhista: int = 0,
+                 acoes_ganhas_tributaria: int = 0, acoes_ganhas_outra: int = 0,
+                 gastos_educacao: float = 0.0, horas_trabalhadas_fds_total: int = 0,
+                 taxa_horaria_base_minima: float, hoje: date | None = None):
+        hoje = hoje or date.today()
+        data_graduacao = _data(data_graduacao, "Data de Graduação", hoje)
+        data_oab = _data(data_oab, "Data da OAB", hoje)
+        datas_pos = tuple(sorted({_data(data_pos, f"Data de Pós {i + 1}", hoje)
+                                  for i, data_pos in enumerate(datas_pos_graduacao or ())}))
+        validar_ordem_datas(data_graduacao, data_oab, datas_pos)
+
+        self.nome_advogado = str(nome_advogado or "").strip()
+        self.data_graduacao = data_graduacao
+        self.data_oab = data_oab
+        self.datas_pos_graduacao = datas_pos # Tupla ordenada e sem repetições
+
+        self.total_acoes_defendidas = _inteiro_nao_negativo(total_acoes_defendidas, 'total_acoes_defendidas')
+        self.acoes_ganhas_previdenciaria = _inteiro_nao_negativo(acoes_ganhas_previdenciaria, 'acoes_ganhas_previdenciaria')
+        self.acoes_ganhas_empresarial = _inteiro_nao_negativo(acoes_ganhas_empresarial, 'acoes_ganhas_empresarial')
+        self.acoes_ganhas_civil = _inteiro_nao_negativo(acoes_ganhas_civil, 'acoes_ganhas_civil')
+        self.acoes_ganhas_trabalhista = _inteiro_nao_negativo(acoes_ganhas_trabalhista, 'acoes_ganhas_trabalhista')
+        self.acoes_ganhas_tributaria = _inteiro_nao_negativo(acoes_ganhas_tributaria, 'acoes_ganhas_tributaria')
+        self.acoes_ganhas_outra = _inteiro_nao_negativo(acoes_ganhas_outra, 'acoes_ganhas_outra')
+        validar_acoes(self.total_acoes_defendidas, self.total_acoes_ganhas)
+
+        self.gastos_educacao = _float_nao_negativo(gastos_educacao, 'gastos_educacao')
+        self.horas_trabalhadas_fds_total = _inteiro_nao_negativo(horas_trabalhadas_fds_total, 'horas_trabalhadas_fds_total')
+        self.taxa_horaria_base_minima = _numero_finito(taxa_horaria_base_minima, 'taxa_horaria_base_minima')
+        if self.taxa_horaria_base_minima < TAXA_BASE_MINIMO:
+            raise ValueError(f"Valor inválido para 'taxa_horaria_base_minima'. Mínimo de R$ {TAXA_BASE_MINIMO:.2f}.")
+
+    @property
+    def total_acoes_ganhas(self) -> int:
+        """Soma das ações ganhas em todas as áreas."""
+        return sum(getattr(self, chave) for chave in CHAVES_ACOES_GANHAS)
+
+
+class Servico(_Registro):
+    """
+    Dados do serviço a precificar (área, esforço, complexidade, urgência e êxito).
+    Os níveis aceitos (e os padrões) são os do perfil `parametros` (padrão: core.constants).
+    """
+
+    __slots__ = (
+        'area_servico_atual', 'horas_estimadas_servico', 'nivel_complexidade_servico',
+        'nivel_urgencia_servico', 'valor_estimado_causa_ganha', 'percentual_exito',
+    )
+
+    def __init__(self, *, area_servico_atual: str, horas_estimadas_servico: float,
+                 nivel_complexidade_servico: str | None = None, nivel_urgencia_servico: str | None = None,
+                 valor_estimado_causa_ganha: float = 0.0, percentual_exito: float = 0.0,
+                 hoje: date | None = None, parametros: Parametros | None = None):
+        # `hoje` é aceito apenas para manter a mesma assinatura de de_dados() nos dois registros
+        p = parametros or constants
+        if nivel_complexidade_servico is None:
+            nivel_complexidade_servico = p.NIVEIS_COMPLEXIDADE[0]
+        if nivel_urgencia_servico is None:
+            nivel_urgencia_servico = p.NIVEIS_URGENCIA[0]
+        if area_servico_atual not in constants.AREAS_ATUACAO:
+            raise ValueError(f"Área de serviço inválida: '{area_servico_atual}'.")
+        if nivel_complexidade_servico not in p.NIVEIS_COMPLEXIDADE:
+            raise ValueError(f"Nível de complexidade inválido: '{nivel_complexidade_servico}'.")
+        if nivel_urgencia_servico not in p.NIVEIS_URGENCIA:
+            raise ValueError(f"Nível de urgência inválido: '{nivel_urgencia_servico}'.")
+
+        self.area_servico_atual = area_servico_atual
+        self.nivel_complexidade_servico = nivel_complexidade_servico
+        self.nivel_urgencia_servico = nivel_urgencia_servico
+        self.horas_estimadas_servico = _numero_finito(horas_estimadas_servico, 'horas_estimadas_servico')
+        if self.horas_estimadas_servico < HORAS_SERVICO_MINIMO:
+            raise ValueError(f"Valor inválido para 'horas_estimadas_servico'. Mínimo de {HORAS_SERVICO_MINIMO} hora.")
+        self.valor_estimado_causa_ganha = _float_nao_negativo(valor_estimado_causa_ganha, 'valor_estimado_causa_ganha')
+        self.percentual_exito = _numero_finito(percentual_exito, 'percentual_exito')
+        if not 0 <= self.percentual_exito <= 100:
+            raise ValueError("Valor inválido para 'percentual_exito'. Percentual deve ser entre 0 e 100.")
+
+
+def dados_simulacao(perfil: PerfilAdvogado, servico: Servico) -> dict:
+    """Junta perfil e serviço no dicionário `dados` completo esperado por core.formulas e pelo PDF."""
+    dados = perfil.para_dados()
+    dados.update(servico.para_dados())
+    return dados
+
+
+def registros_de_dados(dados: dict, hoje: date | None = None,
+                       parametros: Parametros | None = None) -> tuple[PerfilAdvogado, Servico]:
+    """Separa um dicionário `dados` completo em (PerfilAdvogado, Servico), validando ambos (níveis do perfil `parametros`)."""
+    return PerfilAdvogado.de_dados(dados, hoje), Servico.de_dados(dados, hoje, parametros=parametros)
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+"""
+Sessão de Cálculo Incremental
+-----------------------------
+Mantém uma simulação "viva" e recalcula só o que uma alteração de campo
+afeta. Os cálculos formam um grafo de dependências:
+
+    campos de entrada -> 5 fatores -> taxa horária -> preço do serviço -> preço de êxito
+
+Cada fator depende de um conjunto pequeno de campos (DEPENDENCIAS_FATORES):
+mudar as horas estimadas não reavalia nenhum fator, só o preço; mudar os
+gastos com educação reavalia apenas o fator de investimento educacional e,
+a partir dele, taxa e preço. Os valores são os mesmos de
+formulas.calcular_simulacao (mesmas funções, mesma ordem de multiplicação).
+
+A sessão pode usar um perfil de parâmetros (core/parametros.py), que é
+imutável. Sem perfil, lê core/constants.py, cujas alterações em tempo de
+execução não são observadas: após alterá-lo, chame invalidar().
+
+Exemplo:
+    sessao = SessaoCalculo(dados_input)
+    sessao.calcular()['preco_horario_sugerido']
+    for horas in (10, 20, 40):  # "E se...": só o preço é recalculado
+        sessao.atualizar(horas_estimadas_servico=horas)
+        print(horas, sessao.calcular()['preco_horario_sugerido'])
+"""
+
+from datetime import date
+
+from core import formulas
+from core.parametros import Parametros
+from core.validacao import CHAVES_ACOES_GANHAS
+
+# Fator -> campos de `dados` de que ele depende (a data de referência afeta os marcados em FATORES_POR_DATA)
+DEPENDENCIAS_FATORES: dict[str, tuple[str, ...]] = {
+    'Tempo Experiência': ('data_graduacao', 'data_oab', 'datas_pos_graduacao'),
+    'Especialização (Pós)': ('datas_pos_graduacao',),
+    'Experiência Prática (Casos)': ('total_acoes_defendidas', *CHAVES_ACOES_GANHAS, 'area_servico_atual'),
+    'Investimento Educacional': ('gastos_educacao', 'taxa_horaria_base_minima'),
+    'Dedicação (Horas Extras)': ('horas_trabalhadas_fds_total', 'data_oab'),
+}
+FATORES_POR_DATA: tuple[str, ...] = ('Tempo Experiência', 'Dedicação (Horas Extras)')
+
+# Campos lidos diretamente pelas etapas seguintes aos fatores
+CAMPOS_TAXA: frozenset[str] = frozenset({'taxa_horaria_base_minima'})
+CAMPOS_PRECO: frozenset[str] = frozenset({'horas_estimadas_servico', 'nivel_complexidade_servico', 'nivel_urgencia_servico'})
+CAMPOS_EXITO: frozenset[str] = frozenset({'percentual_exito', 'valor_estimado_causa_ganha'})
+
+
+def _avaliar_fator(nome: str, dados: dict, data_referencia: date, parametros: Parametros | None):
+    """Chama a função de core.formulas do fator `nome` com os campos de `dados`."""
+    if nome == 'Tempo Experiência':
+        return formulas.calcular_fator_tempo_experiencia(
+            dados['data_graduacao'], dados['data_oab'], dados['datas_pos_graduacao'], data_referencia, parametros)
+    if nome == 'Especialização (Pós)':
+        return formulas.calcular_fator_especializacao_pos(dados['datas_pos_graduacao'], parametros)
+    if nome == 'Experiência Prática (Casos)':
+        return formulas.calcular_fator_experiencia_pratica(
+            dados['total_acoes_defendidas'], *(dados[chave] for chave in CHAVES_ACOES_GANHAS),
+            dados['area_servico_atual'], parametros)
+    if nome == 'Investimento Educacional':
+        return formulas.calcular_fator_investimento_educacional(dados['gastos_educacao'], dados['taxa_horaria_base_minima'],
+                                                                parametros)
+    return formulas.calcular_fator_dedicacao(dados['horas_trabalhadas_fds_total'], dados['data_oab'], data_referencia,
+                                             parametros)
+
+
+# Campo -> fatores afetados (índice invertido de DEPENDENCIAS_FATORES)
+_FATORES_DO_CAMPO: dict[str, tuple[str, ...]] = {}
+for _fator, _campos in DEPENDENCIAS_FATORES.items():
+    for _campo in _campos:
+        _FATORES_DO_CAMPO[_campo] = _FATORES_DO_CAMPO.get(_campo, ()) + (_fator,)
+del _fator, _campos, _campo
+
+
+class SessaoCalculo:
+    """Simulação de um perfil com recálculo incremental dos fatores, da taxa e dos preços."""
+
+    __slots__ = ('dados', 'data_referencia', 'parametros', 'recalculados',
+                 '_fatores', '_detalhes', '_sujos', '_taxa', '_detalhes_taxa',
+                 '_preco', '_detalhes_preco', '_calculos')
+
+    def __init__(self, dados: dict, data_referencia: date | None = None, parametros: Parametros | None = None):
+        self.dados = {chave: list(valor) if isinstance(valor, list) else valor for chave, valor in dados.items()}
+        self.data_referencia = data_referencia or date.today()
+        self.parametros = parametros
+        self.recalculados: tuple[str, ...] = () # Etapas reavaliadas no último calcular() (diagnóstico)
+        self._fatores: dict[str, float] = {}
+        self._detalhes: dict = {}
+        self.invalidar()
+
+    def invalidar(self) -> None:
+        """Marca tudo para recálculo (ex: depois de alterar core/constants.py)."""
+        self._sujos = set(DEPENDENCIAS_FATORES) | {'taxa', 'preco', 'exito'}
+        self._calculos = None
+
+    def atualizar(self, campos: dict | None = None, **outros) -> set[str]:
+        """
+        Altera campos de `dados` e marca as etapas afetadas (só as de campos com valor diferente do atual).
+        Retorna os fatores e etapas ('taxa', 'preco', 'exito') que passaram a precisar de recálculo.
+        """
+        afetados = set()
+        for campo, valor in {**(campos or {}), **outros}.items():
+            if isinstance(valor, list): # Cópia: alterações posteriores na lista do chamador não passam despercebidas
+                valor = list(valor)
+            if campo in self.dados and self.dados[campo] == valor:
+                continue
+            self.dados[campo] = valor
+            afetados.update(_FATORES_DO_CAMPO.get(campo, ()))
+            if campo in CAMPOS_TAXA:
+                afetados.add('taxa')
+            if campo in CAMPOS_PRECO:
+                afetados.add('preco')
+            if campo in CAMPOS_EXITO:
+                afetados.add('exito')
+        self._marcar(afetados)
+        return afetados
+
+    def definir_data_referencia(self, data_referencia: date) -> None:
+        """Muda o "hoje" dos anos de experiência (afeta os fatores de tempo e de dedicação)."""
+        if data_referencia != self.data_referencia:
+            self.data_referencia = data_referencia
+            self._marcar(set(FATORES_POR_DATA))
+
+    def definir_parametros(self, parametros: Parametros | None) -> None:
+        """Troca o perfil de parâmetros (todas as etapas passam a precisar de recálculo)."""
+        if parametros != self.parametros:
+            self.parametros = parametros
+            self.invalidar()
+
+    def _marcar(self, afetados: set[str]) -> None:
+        """Marca as etapas afetadas e tudo o que vem depois delas no grafo."""
+        if not afetados:
+            return
+        if afetados - {'preco', 'exito'}: # Algum fator ou a taxa: todas as etapas seguintes mudam
+            afetados |= {'taxa', 'preco', 'exito'}
+        elif 'preco' in afetados:
+            afetados.add('exito')
+        self._sujos |= afetados
+        self._calculos = None
+
+    def calcular(self) -> dict:
+        """Dicionário `calculos` (o mesmo de formulas.calcular_simulacao), recalculando só as etapas marcadas."""
+        if self._calculos is None:
+            self.recalculados = tuple(etapa for etapa in (*DEPENDENCIAS_FATORES, 'taxa', 'preco', 'exito')
+                                      if etapa in self._sujos)
+            self._recalcular()
+        else:
+            self.recalculados = ()
+        return dict(self._calculos) # Cópia rasa: o chamador pode acrescentar chaves (ex: faixa de preço)
+
+    def _recalcular(self) -> None:
+        dados = self.dados
+        for nome in DEPENDENCIAS_FATORES:
+            if nome in self._sujos:
+                self._fatores[nome], self._detalhes[nome] = _avaliar_fator(nome, dados, self.data_referencia, self.parametros)
+
+        if 'taxa' in self._sujos:
+            # Mesma ordem de multiplicação de formulas.calcular_taxa_horaria_sugerida (resultado idêntico)
+            taxa_base = dados['taxa_horaria_base_minima']
+            taxa = taxa_base
+            for nome in DEPENDENCIAS_FATORES:
+                taxa *= self._fatores[nome]
+            self._taxa = taxa
+            self._detalhes_taxa = {
+                "Taxa Horária Base Informada": taxa_base,
+                "Fatores Multiplicadores": dict(self._fatores),
+                "Detalhes dos Fatores": dict(self._detalhes),
+                "Taxa Horária Calculada Bruta": taxa,
+                "Taxa Horária Sugerida Final": taxa,
+            }
+
+        if 'preco' in self._sujos:
+            self._preco, self._detalhes_preco = formulas.calcular_preco_final_servico(self._taxa, dados, parametros=self.parametros)
+
+        # O êxito é uma multiplicação: refeito sempre que o dicionário é remontado
+        preco_exito, detalhes_exito = None, {}
+        percentual = dados.get('percentual_exito', 0.0)
+        if percentual > 0:
+            preco_exito = self._preco * percentual / 100.0
+            detalhes_exito = {
+                "Valor Estimado Causa Cliente": dados.get('valor_estimado_causa_ganha', 0.0),
+                "Percentual Êxito Aplicado": percentual / 100.0,
+            }
+        self._sujos.clear()
+        self._calculos = {
+            "taxa_horaria_sugerida": self._taxa,
+            "preco_horario_sugerido": self._preco,
+            "detalhes_taxa_horaria": self._detalhes_taxa,
+            "detalhes_preco_horario": self._detalhes_preco,
+            "preco_exito_sugerido": preco_exito,
+            "detalhes_preco_exito": detalhes_exito,
+            "faixa_preco_horario": None,
+        }
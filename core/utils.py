@@ -1,94 +1,152 @@
 # -*- coding: utf-8 -*-
 
-import locale
-from datetime import datetime, date
+import hashlib
+import json
+from datetime import date
+from functools import lru_cache
+from typing import Iterable
 
-# Flag para garantir que o locale seja configurado apenas uma vez
-_locale_configurado = False
+from core import constants
 
-def configurar_locale_brasileiro():
-    """Tenta configurar o locale para pt_BR.UTF-8 ou similar."""
-    global _locale_configurado
-    if _locale_configurado:
-        return
-
-    locales_tentativa = ['pt_BR.UTF-8', 'pt_BR.utf8', 'Portuguese_Brazil.1252', 'pt_BR', '']
-    for loc in locales_tentativa:
-        try:
-            locale.setlocale(locale.LC_ALL, loc)
-            print(f"Locale configurado para '{locale.getlocale(locale.LC_ALL)[0]}'.")
-            _locale_configurado = True
-            return # Sucesso, sair da função
-        except locale.Error:
-            continue # Tentar próximo locale
-    print(f"Aviso: Não foi possível configurar um locale pt_BR. Usando locale padrão do sistema: '{locale.getlocale(locale.LC_ALL)[0]}'. A formatação de moeda pode variar.")
-    _locale_configurado = True # Marcar como configurado mesmo com fallback
+# Troca os separadores do formato americano (1,234.56) pelos brasileiros (1.234,56).
+# A formatação não depende do locale do sistema operacional: o mesmo texto em
+# qualquer máquina e sem estado global, podendo ser usada de várias threads.
+_SEPARADORES_PT_BR = str.maketrans({",": ".", ".": ","})
 
 def formatar_moeda(valor: float | int | None) -> str:
-    """Formata um valor numérico como moeda brasileira (R$)."""
+    """Formata um valor numérico como moeda brasileira (R$ 1.234,56; negativos como -R$ 1.234,56)."""
     if valor is None:
         return "N/A"
-    configurar_locale_brasileiro() # Garante que o locale está configurado
     try:
-        # Usa a formatação do locale se possível
-        return locale.currency(valor, grouping=True, symbol=True)
-    except (ValueError, locale.Error):
-        # Fallback manual simples se o locale falhar
-        try:
-            return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-        except (TypeError, ValueError):
-            return "Inválido" # Se o valor não for numérico
+        texto = f"{abs(valor):,.2f}".translate(_SEPARADORES_PT_BR)
+    except (TypeError, ValueError):
+        return "Inválido" # Se o valor não for numérico
+    return f"-R$ {texto}" if valor < 0 else f"R$ {texto}"
 
 def formatar_numero(valor: float | int | None, casas_decimais: int = 2) -> str:
     """Formata um número com separador de milhar brasileiro."""
     if valor is None:
         return "N/A"
-    configurar_locale_brasileiro() # Garante que o locale está configurado
     try:
-        # Usa a formatação do locale se possível
-        return locale.format_string(f"%.{casas_decimais}f", valor, grouping=True)
-    except (ValueError, locale.Error, OverflowError):
-         # Fallback manual simples
+        return f"{valor:,.{casas_decimais}f}".translate(_SEPARADORES_PT_BR)
+    except (TypeError, ValueError):
+        return "Inválido"
+
+def _valores_da_coluna(valores: Iterable) -> Iterable:
+    """Converte arrays NumPy em listas de floats Python (formatação bem mais rápida que escalares NumPy)."""
+    return valores.tolist() if hasattr(valores, "tolist") else valores
+
+def formatar_moeda_lote(valores: Iterable[float | int | None]) -> list[str]:
+    """Formata uma coluna inteira de valores (lista, array NumPy, ...) como moeda brasileira."""
+    separadores = _SEPARADORES_PT_BR
+    resultado = []
+    for valor in _valores_da_coluna(valores):
+        try:
+            texto = f"{abs(valor):,.2f}".translate(separadores)
+        except TypeError:
+            resultado.append("N/A" if valor is None else "Inválido")
+            continue
+        resultado.append(f"-R$ {texto}" if valor < 0 else f"R$ {texto}")
+    return resultado
+
+def formatar_numero_lote(valores: Iterable[float | int | None], casas_decimais: int = 2) -> list[str]:
+    """Formata uma coluna inteira de números com separador de milhar brasileiro."""
+    formato = f"{{:,.{casas_decimais}f}}".format
+    separadores = _SEPARADORES_PT_BR
+    resultado = []
+    for valor in _valores_da_coluna(valores):
         try:
-            return f"{valor:,.{casas_decimais}f}".replace(",", "X").replace(".", ",").replace("X", ".")
+            resultado.append(formato(valor).translate(separadores))
         except (TypeError, ValueError):
-            return "Inválido"
+            resultado.append("N/A" if valor is None else "Inválido")
+    return resultado
 
-def calcular_anos_desde(data_evento: date | None) -> float:
-    """Calcula a diferença em anos fracionados entre uma data e hoje."""
-    if not data_evento or not isinstance(data_evento, date):
-        return 0.0
-    hoje = date.today()
-    if data_evento > hoje: # Não calcula para datas futuras
+@lru_cache(maxsize=4096)
+def _anos_entre(data_evento: date, data_referencia: date) -> float:
+    """Anos fracionados entre duas datas (memorizado por par de datas)."""
+    if data_evento > data_referencia: # Não calcula para datas futuras
         return 0.0
-    delta = hoje - data_evento
+    delta = data_referencia - data_evento
     # Usar 365.2425 para média mais precisa (ano tropical médio)
     return delta.days / 365.2425
 
+def calcular_anos_desde(data_evento: date | None, data_referencia: date | None = None) -> float:
+    """
+    Calcula a diferença em anos fracionados entre uma data e a data de referência
+    (hoje, se não informada). O resultado de cada par (data, referência) fica em
+    cache, pois a mesma data (ex: OAB) é usada por mais de um fator.
+    """
+    if not data_evento or not isinstance(data_evento, date):
+        return 0.0
+    return _anos_entre(data_evento, data_referencia or date.today())
+
+# Dias de cada mês (fevereiro tratado à parte em _data_valida)
+_DIAS_NO_MES = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def _data_valida(ano: int, mes: int, dia: int) -> bool:
+    """Verifica dia/mês sem depender de exceções (considera anos bissextos)."""
+    if not 1 <= mes <= 12 or dia < 1:
+        return False
+    if mes == 2 and ano % 4 == 0 and (ano % 100 != 0 or ano % 400 == 0):
+        return dia <= 29
+    return dia <= _DIAS_NO_MES[mes - 1]
+
+def _digitos(texto: str, minimo: int, maximo: int) -> bool:
+    """True se o texto tem de `minimo` a `maximo` dígitos ASCII."""
+    return minimo <= len(texto) <= maximo and texto.isascii() and texto.isdigit()
+
+@lru_cache(maxsize=65536)
+def _parse_data_texto(texto: str, ano_maximo: int) -> date | None:
+    """
+    Reconhece o formato pelo próprio texto (separador e posição do ano)
+    em vez de tentar cada formato com strptime. Memorizado: planilhas
+    costumam repetir as mesmas datas muitas vezes.
+    """
+    if '/' in texto:
+        partes = texto.split('/')
+        if len(partes) != 3:
+            return None
+        dia, mes, ano = partes                      # DD/MM/AAAA
+    elif '-' in texto:
+        partes = texto.split('-')
+        if len(partes) != 3:
+            return None
+        if len(partes[0]) == 4:
+            ano, mes, dia = partes                  # AAAA-MM-DD (ISO)
+        else:
+            dia, mes, ano = partes                  # DD-MM-AAAA
+    elif len(texto) == 8:
+        dia, mes, ano = texto[:2], texto[2:4], texto[4:]  # DDMMAAAA
+    else:
+        return None
+
+    if not (_digitos(dia, 1, 2) and _digitos(mes, 1, 2) and _digitos(ano, 4, 4)):
+        return None
+    ano, mes, dia = int(ano), int(mes), int(dia)
+    # Validação extra: verifica se a data é razoável (ex: não ano 10000)
+    if ano > ano_maximo or ano < 1900 or not _data_valida(ano, mes, dia):
+        return None
+    return date(ano, mes, dia)
+
 def parse_data(data_str: str | None) -> date | None:
     """
-    Converte string (DD/MM/AAAA, DD-MM-AAAA, YYYY-MM-DD, etc.) para objeto date.
+    Converte string (DD/MM/AAAA, DD-MM-AAAA, YYYY-MM-DD, DDMMAAAA) para objeto date.
     Retorna None se a string for vazia, None ou o formato for inválido.
     """
-    if not data_str:
+    if not data_str or not isinstance(data_str, str):
         return None
+    # Ignora datas muito no futuro (mais de um ano à frente) ou muito antigas
+    return _parse_data_texto(data_str.strip(), date.today().year + 1)
 
-    # Formatos comuns a tentar
-    formatos_tentativa = ["%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d", "%d%m%Y"]
+# --- Impressão Digital dos Parâmetros ---
+
+def impressao_constantes() -> str:
+    """
+    Impressão digital (16 dígitos hexadecimais do SHA-256) dos valores atuais de core.constants.
+    Muda sempre que algum peso, multiplicador ou limite é alterado (inclusive em tempo de
+    execução), por isso é calculada a cada chamada.
+    """
+    valores = {nome: getattr(constants, nome) for nome in dir(constants) if nome.isupper()}
+    texto = json.dumps(valores, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:16]
 
-    for fmt in formatos_tentativa:
-        try:
-            # Tenta fazer o parse
-            dt_obj = datetime.strptime(data_str.strip(), fmt)
-            # Validação extra: verifica se a data é razoável (ex: não ano 10000)
-            if dt_obj.year > date.today().year + 1 or dt_obj.year < 1900:
-                 continue # Ignora datas muito no futuro ou muito antigas
-            return dt_obj.date()
-        except (ValueError, TypeError):
-            continue # Tenta o próximo formato
-
-    # Se nenhum formato funcionou
-    return None
-
-# Chama a configuração do locale na primeira importação deste módulo
-configurar_locale_brasileiro()
\ No newline at end of file
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""
+Regras de Validação Compartilhadas
+----------------------------------
+As mesmas regras aplicadas pelos prompts de core/inputs.py e pela GUI,
+reunidas aqui para que fluxos não interativos (lote, linha de comando)
+validem os perfis exatamente da mesma forma. Erros levantam ValueError;
+alertas (valores acima dos limites de core/constants.py) são devolvidos
+como mensagens, pois só o chamador sabe se deve confirmar, rejeitar ou
+apenas registrar.
+"""
+
+from datetime import date
+
+from core import constants
+from core.parametros import Parametros
+from core.utils import formatar_moeda
+
+# Chaves das ações ganhas por área, na ordem de constants.AREAS_ATUACAO
+CHAVES_ACOES_GANHAS: list[str] = [
+    'acoes_ganhas_previdenciaria', 'acoes_ganhas_empresarial', 'acoes_ganhas_civil',
+    'acoes_ganhas_trabalhista', 'acoes_ganhas_tributaria', 'acoes_ganhas_outra',
+]
+
+CAMPOS_INTEIROS: list[str] = ['total_acoes_defendidas', 'horas_trabalhadas_fds_total'] + CHAVES_ACOES_GANHAS
+CAMPOS_FLOAT: list[str] = ['gastos_educacao', 'horas_estimadas_servico', 'taxa_horaria_base_minima']
+
+HORAS_SERVICO_MINIMO: float = 0.1
+TAXA_BASE_MINIMO: float = 1.0
+
+
+def total_acoes_ganhas(dados: dict) -> int:
+    """Soma as ações ganhas de todas as áreas."""
+    return sum(dados.get(chave, 0) for chave in CHAVES_ACOES_GANHAS)
+
+
+def validar_data(data_obj: date | None, rotulo: str, hoje: date | None = None) -> None:
+    """Valida uma data já convertida: obrigatória e não futura."""
+    if not data_obj:
+        raise ValueError(f"{rotulo} inválida. Use DD/MM/AAAA.")
+    if data_obj > (hoje or date.today()):
+        raise ValueError(f"{rotulo} inválida. A data não pode ser no futuro.")
+
+
+def validar_ordem_datas(data_graduacao: date, data_oab: date, datas_pos_graduacao=()) -> None:
+    """Garante que a OAB e as pós-graduações não são anteriores à graduação."""
+    if data_oab < data_graduacao:
+        raise ValueError("Data da OAB não pode ser anterior à data de graduação.")
+    for i, data_pos in enumerate(datas_pos_graduacao or []):
+        if data_pos < data_graduacao:
+            raise ValueError(f"Data de Pós {i + 1} anterior à graduação.")
+
+
+def validar_acoes(total_acoes: int, total_ganhas: int) -> None:
+    """Garante que o total de ações ganhas não excede o total atuado."""
+    if total_ganhas > total_acoes:
+        raise ValueError(f"Total Ações Ganhas ({total_ganhas}) > Total Atuadas ({total_acoes}).")
+
+
+def validar_dados_simulacao(dados: dict, hoje: date | None = None, parametros: Parametros | None = None) -> None:
+    """
+    Valida um dicionário `dados` completo (formato de coletar_dados_simulacao).
+    Os níveis de complexidade e urgência são os do perfil `parametros` (padrão: core.constants).
+    """
+    hoje = hoje or date.today()
+    p = parametros or constants
+    validar_data(dados.get('data_graduacao'), "Data de Graduação", hoje)
+    validar_data(dados.get('data_oab'), "Data da OAB", hoje)
+    for i, data_pos in enumerate(dados.get('datas_pos_graduacao') or []):
+        validar_data(data_pos, f"Data de Pós {i + 1}", hoje)
+    validar_ordem_datas(dados['data_graduacao'], dados['data_oab'], dados.get('datas_pos_graduacao'))
+
+    for chave in CAMPOS_INTEIROS:
+        if dados.get(chave, 0) < 0:
+            raise ValueError(f"Valor inválido para '{chave}'. Insira um número inteiro >= 0.")
+    for chave in CAMPOS_FLOAT:
+        if dados.get(chave, 0.0) < 0:
+            raise ValueError(f"Valor inválido para '{chave}'. Valor não pode ser negativo.")
+    if dados.get('horas_estimadas_servico', 0.0) < HORAS_SERVICO_MINIMO:
+        raise ValueError(f"Valor inválido para 'horas_estimadas_servico'. Mínimo de {HORAS_SERVICO_MINIMO} hora.")
+    if dados.get('taxa_horaria_base_minima', 0.0) < TAXA_BASE_MINIMO:
+        raise ValueError(f"Valor inválido para 'taxa_horaria_base_minima'. Mínimo de R$ {TAXA_BASE_MINIMO:.2f}.")
+    if not 0 <= dados.get('percentual_exito', 0.0) <= 100:
+        raise ValueError("Valor inválido para 'percentual_exito'. Percentual deve ser entre 0 e 100.")
+
+    if dados.get('area_servico_atual') not in constants.AREAS_ATUACAO:
+        raise ValueError(f"Área de serviço inválida: '{dados.get('area_servico_atual')}'.")
+    if dados.get('nivel_complexidade_servico') not in p.NIVEIS_COMPLEXIDADE:
+        raise ValueError(f"Nível de complexidade inválido: '{dados.get('nivel_complexidade_servico')}'.")
+    if dados.get('nivel_urgencia_servico') not in p.NIVEIS_URGENCIA:
+        raise ValueError(f"Nível de urgência inválido: '{dados.get('nivel_urgencia_servico')}'.")
+
+    validar_acoes(dados.get('total_acoes_defendidas', 0), total_acoes_ganhas(dados))
+
+
+def verificar_alertas(dados: dict) -> list[str]:
+    """Retorna as mensagens de alerta para valores acima dos limites configurados."""
+    alertas = []
+    horas = dados.get('horas_estimadas_servico', 0)
+    if horas > constants.HORAS_SERVICO_ALERTA_LIMITE:
+        alertas.append(f"Estimativa de {horas:.1f} horas parece alta "
+                       f"(limite {constants.HORAS_SERVICO_ALERTA_LIMITE:.1f} h).")
+    valor_causa = dados.get('valor_estimado_causa_ganha', 0)
+    if valor_causa > constants.VALOR_CAUSA_ALERTA_LIMITE:
+        alertas.append(f"Valor da causa ({formatar_moeda(valor_causa)}) parece alto "
+                       f"(limite {formatar_moeda(constants.VALOR_CAUSA_ALERTA_LIMITE)}).")
+    taxa_base = dados.get('taxa_horaria_base_minima', 0)
+    if taxa_base > constants.TAXA_BASE_ALERTA_LIMITE:
+        alertas.append(f"Taxa base ({formatar_moeda(taxa_base)}) parece alta como MÍNIMO "
+                       f"(limite {formatar_moeda(constants.TAXA_BASE_ALERTA_LIMITE)}).")
+    return alertas
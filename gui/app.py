@@ -1,12 +1,22 @@
 import customtkinter as ctk
 from tkinter import messagebox
-from datetime import date, datetime
+from datetime import date
+import math
 import os
 import unicodedata # Para normalizar nomes de chave
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 # Importa a lógica de negócio, utilitários e constantes
-from core import formulas, utils, constants
-from reports import pdf_generator # Para gerar o PDF
+# (core.incerteza/NumPy e reports.pdf_generator/ReportLab são importados no primeiro uso,
+#  ou pelo aquecimento em segundo plano logo depois que a janela aparece)
+from core import formulas, utils, constants, validacao
+from core.historico import HistoricoSimulacoes # Histórico SQLite de todas as simulações executadas
+from reports import cache # Reaproveita relatórios idênticos já gerados
+from reports.armazenamento import ArmazemRelatorios # Pasta de saída particionada e indexada
+from gui.previa import PreviaPreco # Prévia ao vivo da taxa e do preço (sem PDF)
+
+ATRASO_PREVIA_MS = 150 # Espera após a última tecla antes de atualizar a prévia
 
 # --- Função Auxiliar para Normalização de Chaves ---
 def normalize_key(text):
@@ -18,6 +28,30 @@ def normalize_key(text):
     except TypeError: # Caso receba algo que não seja string
         return str(text).lower().replace("-", "_").replace(" ", "_")
 
+# --- Dependências Pesadas (carregadas sob demanda) ---
+def _aquecer_dependencias():
+    """Executado no worker de PDF: importa o ReportLab (montando os estilos) e o NumPy antes do primeiro uso."""
+    from reports import pdf_generator
+    pdf_generator.estilos_relatorio()
+    from core import incerteza # noqa: F401 (apenas carrega o módulo)
+
+def _gerar_pdf(caminho_pdf, dados_input, calculos):
+    """Executado no worker de PDF; o import é imediato se o aquecimento já tiver rodado."""
+    from reports import pdf_generator
+    pdf_generator.gerar_pdf_simulacao(caminho_pdf, dados_input, calculos)
+
+def _produzir_pdf(cache_pdf, armazem, caminho_pdf, chave_pdf, dados_input, calculos):
+    """
+    Executado no worker de PDF: obtém o relatório do cache (ou o gera), registra-o no índice
+    da pasta de saída e aplica a retenção (se houver limites configurados no armazém).
+    Retorna True se o PDF veio do cache.
+    """
+    gerar = partial(_gerar_pdf, dados_input=dados_input, calculos=calculos)
+    reaproveitado = cache_pdf.obter_ou_gerar(chave_pdf, caminho_pdf, gerar)
+    armazem.registrar(caminho_pdf, dados_input, calculos, chave=chave_pdf)
+    armazem.aplicar_retencao()
+    return reaproveitado
+
 # --- Classe Principal da Aplicação GUI ---
 class App(ctk.CTk):
     def __init__(self):
@@ -39,6 +73,28 @@ class App(ctk.CTk):
         # --- Lista para armazenar widgets de entrada das Pós-Graduações ---
         self.pos_grad_entries = []
 
+        # --- Geração de PDF em segundo plano ---
+        # Um único worker: os relatórios pedidos em sequência formam uma fila, e o
+        # mainloop do Tk continua respondendo enquanto o ReportLab monta as páginas.
+        self._pdf_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf")
+        self._pdf_jobs = [] # Lista de (future, caminho_pdf, resumo) na ordem de envio
+        self._pdf_ultimo_resumo = ""
+        self._pdf_verificando = False # True enquanto houver um _verificar_pdfs agendado
+        self._cache_pdf = cache.CacheRelatorios()
+        self._armazem = ArmazemRelatorios()
+        self._historico = HistoricoSimulacoes(self._armazem.diretorio)
+        self._historico_agendado = None # Id do after() que grava as simulações pendentes
+
+        # --- Prévia ao vivo ---
+        # Cada edição só agenda a atualização (after); campos editados em sequência rápida
+        # são validados e recalculados juntos, uma vez, quando a digitação pausa.
+        self._previa = PreviaPreco()
+        self._previa_pendentes = set() # Campos editados desde a última atualização
+        self._previa_agendada = None   # Id do after() pendente
+        self.protocol("WM_DELETE_WINDOW", self._ao_fechar)
+        # Aquecimento depois que o mainloop já desenhou a janela (o worker fica livre para o 1º PDF)
+        self.after(200, lambda: self._pdf_executor.submit(_aquecer_dependencias))
+
         # --- Configuração do Layout Principal da Janela ---
         # Faz a coluna 0 (onde o scroll frame estará) expandir com a janela
         self.grid_columnconfigure(0, weight=1)
@@ -132,6 +188,19 @@ class App(ctk.CTk):
         row_idx += 1
         self.entries['horas_estimadas_servico'] = self._create_entry_row("Horas Estimadas TOTAIS:", row_idx)
         row_idx += 1
+
+        # --- Linha Combinada: Faixa de Horas (opcional, para a faixa de preço P10-P90) ---
+        ctk.CTkLabel(self.scrollable_frame, text="Horas Mínimas (opcional):", font=self.label_font).grid(
+            row=row_idx, column=0, padx=(0, 5), pady=2, sticky="w")
+        entry_horas_min = ctk.CTkEntry(self.scrollable_frame, font=self.entry_font)
+        entry_horas_min.grid(row=row_idx, column=1, padx=0, pady=2, sticky="ew")
+        self.entries['horas_minimas_servico'] = entry_horas_min
+        ctk.CTkLabel(self.scrollable_frame, text="Horas Máximas:", font=self.label_font).grid(
+            row=row_idx, column=2, padx=(10, 5), pady=2, sticky="w")
+        entry_horas_max = ctk.CTkEntry(self.scrollable_frame, font=self.entry_font)
+        entry_horas_max.grid(row=row_idx, column=3, padx=0, pady=2, sticky="ew")
+        self.entries['horas_maximas_servico'] = entry_horas_max
+        row_idx += 1
         self.entries['nivel_complexidade_servico'] = self._create_combobox_row("Complexidade:", constants.NIVEIS_COMPLEXIDADE, row_idx)
         row_idx += 1
         self.entries['nivel_urgencia_servico'] = self._create_combobox_row("Urgência:", constants.NIVEIS_URGENCIA, row_idx)
@@ -163,13 +232,31 @@ class App(ctk.CTk):
 
         # --- Botão Calcular (Fora do Scroll Frame) ---
         # Posicionado na linha 1 da janela principal (self)
-        calculate_button = ctk.CTkButton(self, text="Calcular e Gerar PDF", command=self.calculate, font=self.default_font)
-        calculate_button.grid(row=1, column=0, padx=10, pady=5, sticky="ew")
+        buttons_frame = ctk.CTkFrame(self, fg_color="transparent")
+        buttons_frame.grid(row=1, column=0, padx=10, pady=5, sticky="ew")
+        buttons_frame.grid_columnconfigure(0, weight=1) # Botão Calcular ocupa o espaço restante
+        calculate_button = ctk.CTkButton(buttons_frame, text="Calcular e Gerar PDF", command=self.calculate, font=self.default_font)
+        calculate_button.grid(row=0, column=0, sticky="ew")
+        # Cancela os PDFs ainda na fila (o que já está sendo montado termina normalmente)
+        self.cancel_button = ctk.CTkButton(buttons_frame, text="Cancelar PDFs", command=self._cancelar_pdfs,
+                                           width=120, font=self.default_font, state="disabled")
+        self.cancel_button.grid(row=0, column=1, padx=(10, 0))
 
         # --- Área de Resultados (Fora do Scroll Frame) ---
         # Posicionado na linha 2 da janela principal (self)
+        self.preview_label = ctk.CTkLabel(self, text="Prévia: preencha os campos...", wraplength=700, anchor="w", justify="left", font=self.default_font)
+        self.preview_label.grid(row=2, column=0, padx=10, pady=(5, 0), sticky="ew")
         self.results_label = ctk.CTkLabel(self, text="Resultados aparecerão aqui...", wraplength=700, anchor="w", justify="left", font=self.default_font)
-        self.results_label.grid(row=2, column=0, padx=10, pady=(5, 10), sticky="ew")
+        self.results_label.grid(row=3, column=0, padx=10, pady=(5, 10), sticky="ew")
+
+        # --- Prévia: liga os campos e calcula uma vez com os valores iniciais (padrões dos ComboBoxes) ---
+        for key, widget in self.entries.items():
+            if isinstance(widget, ctk.CTkComboBox):
+                widget.configure(command=lambda _valor, k=key: self._campo_alterado(k))
+            else:
+                widget.bind("<KeyRelease>", lambda _evento, k=key: self._campo_alterado(k))
+            self._previa_pendentes.add(key)
+        self._campo_alterado('datas_pos_graduacao')
 
     # --- Métodos Auxiliares para Criação de Widgets ---
     def _create_entry_row(self, label_text, row_index):
@@ -200,6 +287,7 @@ class App(ctk.CTk):
         label.grid(row=row, column=0, padx=(0, 5), pady=1, sticky="w") # Coluna 0 do frame interno
         entry = ctk.CTkEntry(self.pos_grad_frame, font=self.entry_font)
         entry.grid(row=row, column=1, padx=0, pady=1, sticky="ew") # Coluna 1 do frame interno
+        entry.bind("<KeyRelease>", lambda _evento: self._campo_alterado('datas_pos_graduacao'))
         self.pos_grad_entries.append(entry) # Adiciona a entry à lista
         self.pos_grad_next_row += 1 # Incrementa o contador de linha interna
 
@@ -270,6 +358,8 @@ class App(ctk.CTk):
             float_fields = {
                  'gastos_educacao': "Gasto Educação (Total R$)",
                  'horas_estimadas_servico': "Horas Estimadas TOTAIS",
+                 'horas_minimas_servico': "Horas Mínimas",
+                 'horas_maximas_servico': "Horas Máximas",
                  'valor_estimado_causa_ganha': "Valor Causa Cliente",
                  'taxa_horaria_base_minima': "Taxa Horária Mínima",
                  'percentual_exito': "Percentual Êxito (%)", # Nome mantido para compatibilidade da chave
@@ -286,6 +376,8 @@ class App(ctk.CTk):
                           dados_input[key] = 0.0
                      else:
                           dados_input[key] = float(value_str) # Converte para float
+                          if not math.isfinite(dados_input[key]): # "nan"/"inf" passariam pelas comparações abaixo
+                              raise ValueError("Número não finito.")
                           # Validações específicas de intervalo/mínimo
                           if key == 'horas_estimadas_servico' and dados_input[key] < 0.1:
                               raise ValueError("Mínimo de 0.1 hora.")
@@ -311,8 +403,7 @@ class App(ctk.CTk):
 
             # Verifica se o total de ações ganhas não excede o total atuado
             total_ganhas = sum(dados_input.get(f'acoes_ganhas_{normalize_key(area)}', 0) for area in constants.AREAS_ATUACAO)
-            if total_ganhas > dados_input.get('total_acoes_defendidas', 0):
-                 raise ValueError(f"Total Ações Ganhas ({total_ganhas}) > Total Atuadas ({dados_input.get('total_acoes_defendidas', 0)}).")
+            validacao.validar_acoes(dados_input.get('total_acoes_defendidas', 0), total_ganhas) # Mesma regra do modo texto e do lote
 
             # Alertas opcionais para valores altos (permite ao usuário confirmar ou cancelar)
             # Utiliza limites definidos em core/constants.py
@@ -331,17 +422,40 @@ class App(ctk.CTk):
                      self.results_label.configure(text="Cálculo cancelado. Revise a taxa base mínima.")
                      return # Interrompe se o usuário clicar "Não"
 
+            # Chave do relatório no cache (mesmos dados, parâmetros e data => mesmo PDF)
+            chave_pdf = cache.chave_relatorio(dados_input)
+
             # --- 3. Execução dos Cálculos Principais ---
             # Chama as funções do módulo 'core.formulas' para obter os resultados
 
             # Calcula a taxa horária sugerida com base nos fatores de experiência, etc.
-            taxa_horaria_sugerida, detalhes_taxa = formulas.calcular_taxa_horaria_sugerida(dados_input)
+            # O rastreio no console (print) mantém o passo a passo exibido no terminal
+            taxa_horaria_sugerida, detalhes_taxa = formulas.calcular_taxa_horaria_sugerida(dados_input, rastreio=print)
 
             # Calcula o preço final do serviço com base na taxa horária e outros fatores do serviço atual
             preco_horario_sugerido, detalhes_preco_horario = formulas.calcular_preco_final_servico(
-                taxa_horaria_sugerida, dados_input
+                taxa_horaria_sugerida, dados_input, rastreio=print
             )
 
+            # Faixa de preço (Monte Carlo) quando o usuário informa horas mínimas e máximas
+            faixa_preco_horario = None
+            horas_min = dados_input.get('horas_minimas_servico', 0.0)
+            horas_max = dados_input.get('horas_maximas_servico', 0.0)
+            if horas_min > 0 or horas_max > 0:
+                from core import incerteza # NumPy só é necessário quando a faixa é pedida
+                horas_estimadas = dados_input['horas_estimadas_servico']
+                if not (0 < horas_min <= horas_estimadas <= horas_max and horas_min < horas_max):
+                    raise ValueError("Faixa de horas inválida. Use Horas Mínimas <= Horas Estimadas <= Horas Máximas "
+                                     "(mínimas menores que máximas), ou deixe ambas vazias.")
+                faixa_preco_horario = incerteza.simular_preco_servico(
+                    taxa_horaria_sugerida,
+                    incerteza.Triangular(horas_min, horas_estimadas, horas_max),
+                    dados_input['nivel_complexidade_servico'],
+                    dados_input['nivel_urgencia_servico'],
+                    dados_input.get('valor_estimado_causa_ganha', 0.0),
+                    semente=int(chave_pdf[:16], 16), # Mesmos dados, mesma faixa (e o PDF do cache continua fiel)
+                )
+
             # --- INÍCIO DA LÓGICA MODIFICADA ---
             # Calcula um valor de referência aplicando o percentual informado sobre o PREÇO HORÁRIO calculado
             valor_ref_percentual = None # Valor de referência calculado com o percentual
@@ -372,31 +486,29 @@ class App(ctk.CTk):
                 "detalhes_taxa_horaria": detalhes_taxa,
                 "detalhes_preco_horario": detalhes_preco_horario,
                 "preco_exito_sugerido": valor_ref_percentual, # Usa o novo valor calculado (ou None)
-                "detalhes_preco_exito": detalhes_valor_percentual  # Usa os novos detalhes (ou {})
+                "detalhes_preco_exito": detalhes_valor_percentual,  # Usa os novos detalhes (ou {})
+                "faixa_preco_horario": faixa_preco_horario # Percentis da simulação (ou None)
             }
+            # Registra a simulação no histórico (gravada em lote; o que sobrar é gravado pelo after())
+            self._historico.registrar(dados_input, resultados_calculo)
+            self._agendar_descarga_historico()
 
             # --- 4. Geração do Relatório PDF ---
-            # Cria um nome de arquivo único com timestamp e nome sanitizado
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            nome_adv_sanit = "".join(c if c.isalnum() else "_" for c in dados_input.get('nome_advogado', 'Advogado'))
-            nome_arquivo_pdf = f"Simulacao_Honorarios_{nome_adv_sanit}_{timestamp}.pdf"
-
-            # Define a pasta de saída e a cria se não existir
-            output_dir = "output"
-            if not os.path.exists(output_dir):
-                 os.makedirs(output_dir)
-
-            # Monta o caminho completo para o arquivo PDF
-            caminho_pdf = os.path.join(output_dir, nome_arquivo_pdf)
-
-            # Chama a função do módulo 'reports.pdf_generator' para criar o PDF
-            pdf_generator.gerar_pdf_simulacao(caminho_pdf, dados_input, resultados_calculo)
+            # Caminho único na subpasta do mês e do advogado, com timestamp e nome sanitizado
+            # (evita sobrescrever outro relatório do mesmo segundo ainda na fila)
+            output_dir = self._armazem.diretorio
+            caminhos_na_fila = {caminho for _, caminho, _ in self._pdf_jobs}
+            caminho_pdf = self._armazem.novo_caminho(dados_input.get('nome_advogado', 'Advogado'), reservados=caminhos_na_fila)
 
             # --- 5. Exibição dos Resultados na GUI ---
             # Formata o texto de resumo para mostrar na interface
             resultado_txt = f"Cálculo Concluído!\n\n"
             resultado_txt += f"Taxa Horária Sugerida: {utils.formatar_moeda(taxa_horaria_sugerida)}\n"
             resultado_txt += f"Preço Sugerido (Base Horária): {utils.formatar_moeda(preco_horario_sugerido)}\n"
+            if faixa_preco_horario is not None:
+                resultado_txt += (f"Faixa de Preço (P10 / P50 / P90): {utils.formatar_moeda(faixa_preco_horario['preco_p10'])} / "
+                                  f"{utils.formatar_moeda(faixa_preco_horario['preco_p50'])} / "
+                                  f"{utils.formatar_moeda(faixa_preco_horario['preco_p90'])}\n")
 
             # --- INÍCIO DA EXIBIÇÃO MODIFICADA ---
             # Adiciona a linha do valor de referência percentual, se calculado
@@ -405,12 +517,9 @@ class App(ctk.CTk):
                 resultado_txt += f"Valor Ref. ({percentual_informado:.1f}% de Base Horária): {utils.formatar_moeda(valor_ref_percentual)}\n"
             # --- FIM DA EXIBIÇÃO MODIFICADA ---
 
-            resultado_txt += f"\nRelatório PDF gerado em: {caminho_pdf}"
-
-            # Atualiza o label na interface
-            self.results_label.configure(text=resultado_txt)
-            # Mostra um pop-up de sucesso
-            messagebox.showinfo("Sucesso", f"Simulação concluída e PDF gerado:\n{caminho_pdf}")
+            # --- 6. Geração do PDF em Segundo Plano ---
+            # O resumo aparece já; o caminho do PDF é acrescentado quando o worker terminar
+            self._enviar_pdf(caminho_pdf, chave_pdf, dados_input, resultados_calculo, resultado_txt)
 
         # --- Tratamento de Erros Esperados e Inesperados ---
         except ValueError as ve: # Erros de validação específicos (formato, intervalo)
@@ -433,4 +542,110 @@ class App(ctk.CTk):
             messagebox.showerror("Erro Inesperado", f"Ocorreu um erro:\n{type(e).__name__}: {e}")
             self.results_label.configure(text="Ocorreu um erro inesperado.", font=self.default_font)
 
+    # --- Prévia ao Vivo (debounce via after) ---
+    def _campo_alterado(self, key):
+        """Marca o campo editado e (re)agenda a prévia para depois da pausa na digitação."""
+        self._previa_pendentes.add(key)
+        if self._previa_agendada is not None:
+            self.after_cancel(self._previa_agendada)
+        self._previa_agendada = self.after(ATRASO_PREVIA_MS, self._atualizar_previa)
+
+    def _atualizar_previa(self):
+        """Valida só os campos editados e recalcula só o que eles afetam (sem PDF nem histórico)."""
+        self._previa_agendada = None
+        for key in self._previa_pendentes:
+            if key == 'datas_pos_graduacao':
+                self._previa.alterar_pos([entry.get() for entry in self.pos_grad_entries])
+            else:
+                self._previa.alterar(key, self.entries[key].get())
+        self._previa_pendentes.clear()
+        try:
+            calculos = self._previa.calcular()
+        except ValueError as ve:
+            texto = f"Prévia indisponível: {ve}"
+        else:
+            texto = (f"Prévia — Taxa Horária: {utils.formatar_moeda(calculos['taxa_horaria_sugerida'])}  |  "
+                     f"Preço (Base Horária): {utils.formatar_moeda(calculos['preco_horario_sugerido'])}")
+            if calculos['preco_exito_sugerido'] is not None:
+                texto += f"  |  Ref. Êxito: {utils.formatar_moeda(calculos['preco_exito_sugerido'])}"
+        if texto != self.preview_label.cget("text"): # Evita redesenhar o rótulo sem mudança
+            self.preview_label.configure(text=texto)
+
+    # --- Geração de PDF em Segundo Plano ---
+    def _enviar_pdf(self, caminho_pdf, chave_pdf, dados_input, resultados_calculo, resumo):
+        """
+        Coloca a geração do PDF na fila do worker e inicia o acompanhamento via after().
+        Se um relatório idêntico estiver no cache, o worker só o vincula ao novo caminho.
+        """
+        future = self._pdf_executor.submit(_produzir_pdf, self._cache_pdf, self._armazem,
+                                           caminho_pdf, chave_pdf, dados_input, resultados_calculo)
+        self._pdf_jobs.append((future, caminho_pdf, resumo))
+        self._pdf_ultimo_resumo = resumo
+        self._atualizar_status_pdf()
+        if not self._pdf_verificando: # Inicia o acompanhamento, se ainda não estiver ativo
+            self._pdf_verificando = True
+            self.after(100, self._verificar_pdfs)
+
+    def _atualizar_status_pdf(self):
+        """Mostra no results_label o último resumo e o andamento da fila de PDFs."""
+        pendentes = len(self._pdf_jobs)
+        self.cancel_button.configure(state="normal" if pendentes > 1 else "disabled")
+        if pendentes:
+            fila = f" ({pendentes - 1} na fila)" if pendentes > 1 else ""
+            self.results_label.configure(text=f"{self._pdf_ultimo_resumo}\nGerando PDF...{fila}", font=self.default_font)
+
+    def _verificar_pdfs(self):
+        """Executado no thread da interface (via after): trata os PDFs concluídos e reagenda se ainda houver fila."""
+        while self._pdf_jobs and self._pdf_jobs[0][0].done():
+            future, caminho_pdf, resumo = self._pdf_jobs.pop(0)
+            if future.cancelled():
+                continue
+            erro = future.exception()
+            if erro is None:
+                origem = " (reaproveitado do cache)" if future.result() else ""
+                self._pdf_ultimo_resumo = f"{resumo}\nRelatório PDF gerado em: {caminho_pdf}{origem}"
+                self.results_label.configure(text=self._pdf_ultimo_resumo, font=self.default_font)
+                messagebox.showinfo("Sucesso", f"Simulação concluída e PDF gerado:\n{caminho_pdf}")
+            elif isinstance(erro, (FileNotFoundError, PermissionError)):
+                messagebox.showerror("Erro de Arquivo", f"Erro ao tentar salvar o PDF: {erro}\nVerifique as permissões na pasta '{os.path.dirname(caminho_pdf)}'.")
+                self._pdf_ultimo_resumo = f"{resumo}\nErro ao salvar PDF."
+                self.results_label.configure(text=self._pdf_ultimo_resumo)
+            else:
+                messagebox.showerror("Erro ao Gerar PDF", f"Ocorreu um erro:\n{type(erro).__name__}: {erro}")
+                self._pdf_ultimo_resumo = f"{resumo}\nErro ao gerar o PDF."
+                self.results_label.configure(text=self._pdf_ultimo_resumo)
+
+        self._atualizar_status_pdf()
+        self._pdf_verificando = bool(self._pdf_jobs)
+        if self._pdf_verificando:
+            self.after(100, self._verificar_pdfs)
+
+    def _cancelar_pdfs(self):
+        """Cancela os PDFs que ainda não começaram a ser gerados."""
+        cancelados = sum(1 for future, _, _ in self._pdf_jobs if future.cancel())
+        self._pdf_jobs = [job for job in self._pdf_jobs if not job[0].cancelled()]
+        self._atualizar_status_pdf()
+        if cancelados:
+            self.results_label.configure(text=f"{self.results_label.cget('text')}\n{cancelados} PDF(s) cancelado(s).")
+
+    # --- Histórico (gravação das pendentes via after) ---
+    def _agendar_descarga_historico(self):
+        """Garante que as simulações pendentes sejam gravadas em até `intervalo_descarga` segundos."""
+        if self._historico_agendado is None:
+            atraso_ms = int(self._historico.intervalo_descarga * 1000)
+            self._historico_agendado = self.after(atraso_ms, self._descarregar_historico)
+
+    def _descarregar_historico(self):
+        self._historico_agendado = None
+        self._historico.descarregar()
+
+    def _ao_fechar(self):
+        """Descarta a fila de PDFs pendentes, grava o histórico pendente e fecha a janela (o PDF em andamento é concluído)."""
+        for agendado in (self._previa_agendada, self._historico_agendado):
+            if agendado is not None:
+                self.after_cancel(agendado)
+        self._pdf_executor.shutdown(wait=False, cancel_futures=True)
+        self._historico.descarregar()
+        self.destroy()
+
 # --- Fim da classe App ---
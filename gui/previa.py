@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""
+Prévia de Preço ao Vivo (Lógica, sem Tk)
+----------------------------------------
+Converte e valida um campo da GUI de cada vez, com as mesmas regras do botão
+"Calcular", e mantém uma SessaoCalculo (core/sessao.py) com os últimos
+valores válidos: cada edição recalcula só os fatores e preços afetados por
+aquele campo. Nenhum PDF é gerado e nada é gravado no histórico.
+
+A GUI chama alterar() com o texto do campo editado (depois do atraso de
+digitação, via after()) e em seguida calcular(). Enquanto algum campo
+estiver inválido ou faltar um campo obrigatório, calcular() levanta
+ValueError com a mensagem a exibir.
+
+Exemplo:
+    previa = PreviaPreco()
+    previa.alterar('data_oab', "01/03/2011")
+    ...
+    calculos = previa.calcular()
+"""
+
+import math
+from datetime import date
+
+from core import constants, utils, validacao
+from core.sessao import SessaoCalculo
+
+ROTULOS_DATAS: dict[str, str] = {'data_graduacao': "Data de Graduação", 'data_oab': "Data da OAB"}
+CAMPOS_ESCOLHA: dict[str, list[str]] = {
+    'area_servico_atual': constants.AREAS_ATUACAO,
+    'nivel_complexidade_servico': constants.NIVEIS_COMPLEXIDADE,
+    'nivel_urgencia_servico': constants.NIVEIS_URGENCIA,
+}
+# Campos numéricos opcionais: vazio vale 0 (como no botão "Calcular")
+CAMPOS_FLOAT_OPCIONAIS: tuple[str, ...] = ('gastos_educacao', 'valor_estimado_causa_ganha', 'percentual_exito')
+# Campos da GUI que não entram nos fatores nem no preço (a faixa de horas só é usada no Monte Carlo)
+CAMPOS_IGNORADOS: frozenset[str] = frozenset({'nome_advogado', 'horas_minimas_servico', 'horas_maximas_servico'})
+
+
+def _float_br(texto: str) -> float:
+    """Número digitado no formato brasileiro (ponto de milhar, vírgula decimal); vazio vale 0."""
+    texto = texto.strip().replace('.', '').replace(',', '.')
+    valor = float(texto) if texto else 0.0
+    if not math.isfinite(valor): # float() aceita "nan" e "inf", que passariam por todas as comparações
+        raise ValueError(f"Número não finito: '{texto}'.")
+    return valor
+
+
+def converter_campo(chave: str, texto: str, hoje: date | None = None):
+    """Valor de um campo da GUI a partir do texto digitado; ValueError se o campo for inválido."""
+    texto = texto.strip()
+    if chave in ROTULOS_DATAS:
+        data_obj = utils.parse_data(texto)
+        validacao.validar_data(data_obj, ROTULOS_DATAS[chave], hoje)
+        return data_obj
+    if chave in CAMPOS_ESCOLHA:
+        if texto not in CAMPOS_ESCOLHA[chave]:
+            raise ValueError(f"Opção inválida: '{texto}'.")
+        return texto
+    if chave in validacao.CAMPOS_INTEIROS:
+        try:
+            valor = int(texto) if texto else 0
+        except ValueError:
+            valor = -1
+        if valor < 0:
+            raise ValueError(f"Valor inválido para '{chave}'. Insira um número inteiro >= 0.")
+        return valor
+    try:
+        valor = _float_br(texto)
+    except ValueError:
+        raise ValueError(f"Valor inválido para '{chave}'. Insira um número.")
+    if chave == 'horas_estimadas_servico' and valor < validacao.HORAS_SERVICO_MINIMO:
+        raise ValueError(f"Horas estimadas: mínimo de {validacao.HORAS_SERVICO_MINIMO} hora.")
+    if chave == 'taxa_horaria_base_minima' and valor < validacao.TAXA_BASE_MINIMO:
+        raise ValueError(f"Taxa horária mínima: mínimo de R$ {validacao.TAXA_BASE_MINIMO:.2f}.")
+    if chave == 'percentual_exito' and not 0 <= valor <= 100:
+        raise ValueError("Percentual deve ser entre 0 e 100.")
+    if valor < 0:
+        raise ValueError(f"Valor inválido para '{chave}'. Valor não pode ser negativo.")
+    return valor
+
+
+def converter_datas_pos(textos: list[str], hoje: date | None = None) -> list[date]:
+    """Datas de pós-graduação preenchidas (vazias ignoradas), sem repetição e em ordem."""
+    datas = set()
+    for i, texto in enumerate(textos):
+        if texto.strip():
+            data_obj = utils.parse_data(texto.strip())
+            validacao.validar_data(data_obj, f"Data de Pós {i + 1}", hoje)
+            datas.add(data_obj)
+    return sorted(datas)
+
+
+class PreviaPreco:
+    """Valores válidos dos campos da GUI e a sessão incremental que calcula a prévia."""
+
+    __slots__ = ('hoje', 'valores', 'erros', '_sessao')
+
+    def __init__(self, hoje: date | None = None):
+        self.hoje = hoje or date.today()
+        # Campos opcionais começam em 0; datas, horas e taxa base precisam ser preenchidas
+        self.valores: dict = {chave: 0 for chave in validacao.CAMPOS_INTEIROS}
+        self.valores.update({chave: 0.0 for chave in CAMPOS_FLOAT_OPCIONAIS})
+        self.valores.update({chave: opcoes[0] for chave, opcoes in CAMPOS_ESCOLHA.items()})
+        self.valores['datas_pos_graduacao'] = []
+        self.erros: dict[str, str] = {} # Campo -> mensagem do último texto inválido
+        self._sessao: SessaoCalculo | None = None
+
+    def _definir(self, chave: str, conversao) -> None:
+        """Guarda o valor convertido (ou o erro) e repassa a alteração à sessão."""
+        try:
+            valor = conversao()
+        except ValueError as ve:
+            self.erros[chave] = str(ve)
+            return
+        self.erros.pop(chave, None)
+        self.valores[chave] = valor
+        if self._sessao is not None:
+            self._sessao.atualizar({chave: valor}) # Só marca o que depende deste campo
+
+    def alterar(self, chave: str, texto: str) -> None:
+        """Valida apenas o campo editado e, se válido, atualiza a sessão."""
+        if chave not in CAMPOS_IGNORADOS:
+            self._definir(chave, lambda: converter_campo(chave, texto, self.hoje))
+
+    def alterar_pos(self, textos: list[str]) -> None:
+        """Atualiza a lista de datas de pós-graduação a partir dos textos de todos os campos de pós."""
+        self._definir('datas_pos_graduacao', lambda: converter_datas_pos(textos, self.hoje))
+
+    def calcular(self) -> dict:
+        """Dicionário `calculos` da prévia; ValueError (com a mensagem a exibir) se faltar algo ou houver erro."""
+        if self.erros:
+            raise ValueError(next(iter(self.erros.values())))
+        valores = self.valores
+        for chave, rotulo in (*ROTULOS_DATAS.items(), ('horas_estimadas_servico', "Horas Estimadas"),
+                              ('taxa_horaria_base_minima', "Taxa Horária Mínima")):
+            if chave not in valores:
+                raise ValueError(f"Preencha '{rotulo}'.")
+        # Regras entre campos (ordem das datas, ações ganhas): as mesmas do lote e do serviço, baratas a cada prévia
+        validacao.validar_dados_simulacao(valores, self.hoje)
+
+        if self._sessao is None: # Primeira prévia completa: calcula tudo uma vez
+            self._sessao = SessaoCalculo(valores, self.hoje)
+        return self._sessao.calcular()
@@ -1,5 +1,48 @@
+import builtins
+import sys
+import time
+
+# --- Medição do Tempo de Inicialização (opcional: python main_gui.py --tempo-inicializacao) ---
+# Mostra no console quanto tempo cada etapa leva até o primeiro quadro da janela,
+# e quais importações mais pesaram (tempo acumulado, como no `python -X importtime`).
+INICIO = time.perf_counter()
+MEDIR_INICIALIZACAO = "--tempo-inicializacao" in sys.argv
+
+def medir_importacoes() -> dict[str, float]:
+    """Passa a registrar o tempo acumulado (s) de cada módulo importado pela primeira vez."""
+    tempos = {}
+    importar_original = builtins.__import__
+
+    def importar(nome, globais=None, locais=None, fromlist=(), nivel=0):
+        novo = nivel == 0 and nome not in sys.modules
+        inicio = time.perf_counter()
+        try:
+            return importar_original(nome, globais, locais, fromlist, nivel)
+        finally:
+            if novo:
+                tempos[nome] = time.perf_counter() - inicio
+
+    builtins.__import__ = importar
+    return tempos
+
+def relatorio_inicializacao(marcos: list[tuple[str, float]], tempos_importacao: dict[str, float], limite: int = 15) -> str:
+    """Texto com a duração de cada etapa (marcos em ordem) e as importações mais lentas."""
+    linhas = ["Tempo de inicialização (ms):"]
+    anterior = INICIO
+    for etapa, instante in marcos:
+        linhas.append(f"  {etapa:<28}{(instante - anterior) * 1000:9.1f}")
+        anterior = instante
+    linhas.append(f"  {'Total até o primeiro quadro':<28}{(anterior - INICIO) * 1000:9.1f}")
+    linhas.append("Importações mais lentas (acumulado, ms):")
+    for nome, segundos in sorted(tempos_importacao.items(), key=lambda item: item[1], reverse=True)[:limite]:
+        linhas.append(f"  {nome:<28}{segundos * 1000:9.1f}")
+    return "\n".join(linhas)
+
+tempos_importacao = medir_importacoes() if MEDIR_INICIALIZACAO else {}
+
 import customtkinter
-from gui.app import App # Importa a classe principal da GUI
+from gui.app import App # Importa a classe principal da GUI (ReportLab e NumPy só são carregados depois)
+FIM_IMPORTACOES = time.perf_counter()
 # import locale # Mantido comentado, pois não era a causa e pode ser adicionado se necessário
 
 # --- DESATIVAR DPI AUTOMÁTICO (CORREÇÃO NECESSÁRIA) ---
@@ -14,4 +57,10 @@ if __name__ == "__main__":
 
     # Cria e executa a aplicação GUI
     app = App()
-    app.mainloop()
\ No newline at end of file
+    if MEDIR_INICIALIZACAO:
+        fim_janela = time.perf_counter()
+        app.update() # Processa o mapeamento e o desenho inicial: o primeiro quadro
+        primeiro_quadro = time.perf_counter()
+        print(relatorio_inicializacao([("Importações", FIM_IMPORTACOES), ("Criação da janela", fim_janela),
+                                       ("Primeiro quadro", primeiro_quadro)], tempos_importacao))
+    app.mainloop()
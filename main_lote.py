@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+"""
+Execução em Lote (Sem Interface)
+--------------------------------
+Precifica perfis lidos de um arquivo CSV/JSONL (ou da entrada padrão) e
+escreve os resultados em fluxo, sem prompts nem janelas.
+
+Exemplos:
+    python main_lote.py perfis.csv -o resultados.csv
+    cat perfis.jsonl | python main_lote.py - --formato jsonl --formato-saida jsonl
+    python main_lote.py perfis.csv --data-referencia 31/12/2025   # resultado reproduzível
+    python main_lote.py perfis.csv --parametros perfis/escritorio_a.toml
+"""
+
+import argparse
+import sys
+
+from core.parametros import carregar_perfil
+from core.processamento_lote import TAMANHO_BLOCO_PADRAO, escrever_resultados, ler_registros, processar_fluxo
+from core.utils import parse_data
+
+
+def _detectar_formato(caminho: str) -> str:
+    """Deduz o formato pela extensão do arquivo (padrão: csv)."""
+    return 'jsonl' if caminho.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulador de Honorários - precificação em lote sem interação.")
+    parser.add_argument("entrada", nargs="?", default="-", help="Arquivo CSV/JSONL de perfis ('-' para a entrada padrão).")
+    parser.add_argument("-o", "--saida", default="-", help="Arquivo de resultados ('-' para a saída padrão).")
+    parser.add_argument("--formato", choices=["csv", "jsonl"], help="Formato da entrada (padrão: pela extensão, ou csv).")
+    parser.add_argument("--formato-saida", choices=["csv", "jsonl"], help="Formato da saída (padrão: pela extensão, ou o mesmo da entrada).")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO_PADRAO, help="Perfis precificados por bloco.")
+    parser.add_argument("--rejeitar-alertas", action="store_true",
+                        help="Rejeita perfis acima dos limites de alerta (em vez de apenas registrar o alerta).")
+    parser.add_argument("--data-referencia", metavar="DD/MM/AAAA",
+                        help="Data usada como 'hoje' nos cálculos e validações (padrão: data atual), para execuções reproduzíveis.")
+    parser.add_argument("--parametros", metavar="PERFIL",
+                        help="Perfil de parâmetros TOML/JSON (core/parametros.py) usado na validação e nos cálculos "
+                             "(padrão: core/constants.py).")
+    args = parser.parse_args(argv)
+
+    data_referencia = None
+    if args.data_referencia:
+        data_referencia = parse_data(args.data_referencia)
+        if data_referencia is None:
+            parser.error(f"Data de referência inválida: '{args.data_referencia}'. Use DD/MM/AAAA.")
+
+    parametros = None
+    if args.parametros:
+        try:
+            parametros = carregar_perfil(args.parametros)
+        except (OSError, ValueError) as e:
+            parser.error(f"Perfil de parâmetros inválido: {e}")
+
+    formato = args.formato or _detectar_formato(args.entrada)
+    formato_saida = args.formato_saida or (formato if args.saida == "-" else _detectar_formato(args.saida))
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8", newline="")
+    saida = sys.stdout if args.saida == "-" else open(args.saida, "w", encoding="utf-8", newline="")
+    try:
+        linhas = processar_fluxo(ler_registros(entrada, formato), args.tamanho_bloco, args.rejeitar_alertas,
+                                 data_referencia, parametros)
+        contagem = escrever_resultados(linhas, saida, formato_saida)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if saida is not sys.stdout:
+            saida.close()
+
+    print(f"Processados: {sum(contagem.values())} | OK: {contagem['ok']} | "
+          f"Erros: {contagem['erro']} | Rejeitados: {contagem['rejeitado']}", file=sys.stderr)
+    return 0 if contagem['erro'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+Serviço HTTP de Precificação (Sem Interface)
+--------------------------------------------
+Inicia o serviço JSON de api/servidor.py para que outras ferramentas
+obtenham taxas, preços e relatórios sem abrir a GUI.
+
+Exemplos:
+    python main_servico.py                      # http://127.0.0.1:8765
+    python main_servico.py --porta 9000 --limite-pdf 4 --registrar-acessos
+"""
+
+import argparse
+import sys
+
+from api.servidor import ServicoPrecificacao
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulador de Honorários - serviço HTTP/JSON de precificação.")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: apenas a máquina local).")
+    parser.add_argument("--porta", type=int, default=8765, help="Porta TCP.")
+    parser.add_argument("--limite-pdf", type=int, default=2, help="PDFs gerados ao mesmo tempo (os demais esperam).")
+    parser.add_argument("--espera-pdf", type=float, default=5.0,
+                        help="Segundos que um pedido de PDF espera por uma vaga antes de receber 503.")
+    parser.add_argument("--registrar-acessos", action="store_true", help="Mostra cada pedido atendido na saída de erro.")
+    args = parser.parse_args(argv)
+
+    servidor = ServicoPrecificacao((args.host, args.porta), args.limite_pdf, args.espera_pdf, args.registrar_acessos)
+    print(f"Serviço de precificação em http://{args.host}:{servidor.server_address[1]} (Ctrl+C para encerrar)",
+          file=sys.stderr)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+"""
+Armazenamento Gerenciado dos Relatórios Gerados
+-----------------------------------------------
+Organiza a pasta de saída em subpastas por mês e por advogado
+(output/AAAA/MM/<advogado>/Simulacao_Honorarios_<advogado>_<data_hora>.pdf)
+e mantém um índice SQLite (output/indice.sqlite3) com os dados principais de
+cada relatório: advogado, área, complexidade, urgência, taxa, preço, chave
+do cache e tamanho. Buscas e limpezas consultam só o índice, sem listar
+diretórios.
+
+A retenção é opcional: por padrão nenhum limite está ativo e nenhum
+relatório é apagado. Com limites configurados, ela remove primeiro os
+relatórios mais antigos: os que passaram da idade máxima e, depois, os que
+excedem o tamanho total ou a quantidade máxima (0 desativa o respectivo
+limite).
+
+Exemplo:
+    armazem = ArmazemRelatorios(idade_maxima_dias=180, tamanho_maximo_mb=500)
+    caminho = armazem.novo_caminho("Maria Souza")
+    gerar_pdf_simulacao(caminho, dados_input, calculos)
+    armazem.registrar(caminho, dados_input, calculos)
+    armazem.aplicar_retencao()
+    armazem.buscar(advogado="Maria Souza", desde=date(2025, 1, 1))
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+DIRETORIO_SAIDA = "output"
+NOME_INDICE = "indice.sqlite3"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS relatorios (
+    caminho TEXT PRIMARY KEY,      -- Relativo à pasta de saída
+    criado_em TEXT NOT NULL,       -- ISO 8601 (ordenável como texto)
+    advogado TEXT NOT NULL,
+    area TEXT,
+    complexidade TEXT,
+    urgencia TEXT,
+    taxa_horaria REAL,
+    preco REAL,
+    chave TEXT,                    -- Chave do cache de relatórios (reports/cache.py), se houver
+    tamanho INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_relatorios_advogado ON relatorios (advogado, criado_em);
+CREATE INDEX IF NOT EXISTS idx_relatorios_criado_em ON relatorios (criado_em);
+"""
+
+
+def nome_seguro(texto: str) -> str:
+    """Texto utilizável em nomes de arquivo/pasta (não alfanuméricos viram '_')."""
+    return "".join(c if c.isalnum() else "_" for c in texto.strip()) or "Advogado"
+
+
+class ArmazemRelatorios:
+    """Pasta de saída particionada, com índice SQLite, retenção por idade e cotas de tamanho e quantidade."""
+
+    __slots__ = ('diretorio', 'indice', 'idade_maxima_dias', 'tamanho_maximo', 'max_relatorios', '_trava')
+
+    def __init__(self, diretorio: str = DIRETORIO_SAIDA, idade_maxima_dias: float = 0,
+                 tamanho_maximo_mb: float = 0, max_relatorios: int = 0):
+        if idade_maxima_dias < 0 or tamanho_maximo_mb < 0 or max_relatorios < 0:
+            raise ValueError("Limites de retenção não podem ser negativos (use 0 para desativar).")
+        self.diretorio = diretorio
+        self.indice = os.path.join(diretorio, NOME_INDICE)
+        self.idade_maxima_dias = idade_maxima_dias
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        self.max_relatorios = max_relatorios
+        self._trava = threading.Lock() # Reserva de nomes e retenção entre threads do mesmo processo
+        os.makedirs(diretorio, exist_ok=True)
+        with self._conexao() as conexao:
+            conexao.executescript(_ESQUEMA)
+
+    @contextmanager
+    def _conexao(self):
+        """Conexão curta por operação (segura entre threads); confirma a transação ao sair sem erro."""
+        conexao = sqlite3.connect(self.indice, timeout=10)
+        conexao.row_factory = sqlite3.Row
+        try:
+            with conexao:
+                yield conexao
+        finally:
+            conexao.close()
+
+    # --- Gravação ---
+
+    def novo_caminho(self, advogado: str, instante: datetime | None = None, reservados: set[str] = frozenset(),
+                     extensao: str = "pdf") -> str:
+        """
+        Caminho (ainda não usado) para um novo relatório, na subpasta do mês e do advogado.
+        `reservados` são caminhos já prometidos a relatórios ainda não gerados (ex: fila da GUI).
+        """
+        instante = instante or datetime.now()
+        advogado = nome_seguro(advogado)
+        pasta = os.path.join(self.diretorio, instante.strftime("%Y"), instante.strftime("%m"), advogado)
+        os.makedirs(pasta, exist_ok=True)
+        base = f"Simulacao_Honorarios_{advogado}_{instante.strftime('%Y%m%d_%H%M%S')}"
+        caminho = os.path.join(pasta, f"{base}.{extensao}")
+        sufixo = 2
+        with self._trava:
+            while caminho in reservados or os.path.exists(caminho): # Só colide no mesmo segundo
+                caminho = os.path.join(pasta, f"{base}_{sufixo}.{extensao}")
+                sufixo += 1
+        return caminho
+
+    def registrar(self, caminho: str, dados_input: dict, calculos: dict, chave: str | None = None,
+                  instante: datetime | None = None) -> None:
+        """Inclui (ou atualiza) no índice um relatório já gravado em `caminho`."""
+        registro = (
+            os.path.relpath(caminho, self.diretorio),
+            (instante or datetime.now()).isoformat(timespec='seconds'),
+            dados_input.get('nome_advogado') or "Advogado",
+            dados_input.get('area_servico_atual'),
+            dados_input.get('nivel_complexidade_servico'),
+            dados_input.get('nivel_urgencia_servico'),
+            calculos.get('taxa_horaria_sugerida'),
+            calculos.get('preco_horario_sugerido'),
+            chave,
+            os.path.getsize(caminho),
+        )
+        with self._conexao() as conexao:
+            conexao.execute("INSERT OR REPLACE INTO relatorios VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", registro)
+
+    # --- Consulta ---
+
+    def buscar(self, advogado: str | None = None, area: str | None = None, desde: date | None = None,
+               ate: date | None = None, limite: int = 100) -> list[dict]:
+        """Relatórios do índice que atendem aos filtros, do mais recente ao mais antigo (caminhos completos)."""
+        condicoes, parametros = [], []
+        if advogado is not None:
+            condicoes.append("advogado = ?")
+            parametros.append(advogado)
+        if area is not None:
+            condicoes.append("area = ?")
+            parametros.append(area)
+        if desde is not None:
+            condicoes.append("criado_em >= ?")
+            parametros.append(desde.isoformat())
+        if ate is not None:
+            condicoes.append("criado_em < ?") # Inclui o dia inteiro de `ate`
+            parametros.append((ate + timedelta(days=1)).isoformat())
+        filtro = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        with self._conexao() as conexao:
+            linhas = conexao.execute(f"SELECT * FROM relatorios {filtro} ORDER BY criado_em DESC LIMIT ?",
+                                     (*parametros, limite)).fetchall()
+        return [{**dict(linha), 'caminho': os.path.join(self.diretorio, linha['caminho'])} for linha in linhas]
+
+    def estatisticas(self) -> dict:
+        """Quantidade de relatórios e bytes ocupados segundo o índice."""
+        with self._conexao() as conexao:
+            quantidade, total = conexao.execute("SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM relatorios").fetchone()
+        return {'relatorios': quantidade, 'bytes': total}
+
+    # --- Retenção ---
+
+    def _excede(self, quantidade: int, total: int) -> bool:
+        return bool((self.tamanho_maximo and total > self.tamanho_maximo)
+                    or (self.max_relatorios and quantidade > self.max_relatorios))
+
+    def aplicar_retencao(self) -> int:
+        """
+        Remove os relatórios que violam os limites, do mais antigo ao mais novo. Retorna quantos foram removidos.
+        Sem nenhum limite configurado (o padrão), não faz nada.
+        """
+        if not (self.idade_maxima_dias or self.tamanho_maximo or self.max_relatorios):
+            return 0
+        with self._trava, self._conexao() as conexao:
+            remover = []
+            if self.idade_maxima_dias:
+                limite = (datetime.now() - timedelta(days=self.idade_maxima_dias)).isoformat(timespec='seconds')
+                remover = [linha['caminho'] for linha in
+                           conexao.execute("SELECT caminho FROM relatorios WHERE criado_em < ?", (limite,))]
+                conexao.executemany("DELETE FROM relatorios WHERE caminho = ?", ((c,) for c in remover))
+
+            quantidade, total = conexao.execute("SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM relatorios").fetchone()
+            if self._excede(quantidade, total):
+                excedentes = []
+                for linha in conexao.execute("SELECT caminho, tamanho FROM relatorios ORDER BY criado_em"):
+                    if not self._excede(quantidade, total):
+                        break
+                    excedentes.append(linha['caminho'])
+                    total -= linha['tamanho']
+                    quantidade -= 1
+                conexao.executemany("DELETE FROM relatorios WHERE caminho = ?", ((c,) for c in excedentes))
+                remover += excedentes
+
+        for relativo in remover:
+            caminho = os.path.join(self.diretorio, relativo)
+            try:
+                os.remove(caminho)
+                os.removedirs(os.path.dirname(caminho)) # Apaga as subpastas que ficaram vazias
+            except OSError: # Arquivo já removido ou pasta ainda com outros relatórios
+                pass
+        return len(remover)
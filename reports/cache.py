@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cache de Relatórios Endereçado por Conteúdo
+-------------------------------------------
+Relatórios idênticos não são gerados de novo. A chave de um relatório é o
+SHA-256 dos dados de entrada normalizados, da data de referência dos
+cálculos (os anos de experiência mudam com ela), da impressão digital de
+core/constants.py e do formato. O arquivo gerado fica guardado em
+output/.cache/<2 primeiros dígitos>/<chave>.<formato>; um pedido repetido
+apenas cria um link físico (hard link) desse arquivo no destino pedido, ou
+uma cópia se o sistema de arquivos não suportar links.
+
+Um índice SQLite (output/.cache/indice.sqlite3) guarda o tamanho e o
+último uso de cada entrada; o uso não é marcado na data de modificação do
+arquivo, que é o mesmo (hard link) dos relatórios já entregues. A cada
+`limpar_a_cada` relatórios guardados, entradas sem uso há mais de
+`idade_maxima_dias` e, depois, as menos usadas recentemente além de
+`tamanho_maximo_mb` são removidas, consultando só o índice (entre duas
+limpezas o cache pode passar um pouco do limite). Apagar uma entrada do
+cache não afeta os arquivos já entregues (o link no destino continua
+válido); uma entrada removida entre a consulta e o link conta como ausente.
+
+Exemplo:
+    cache = CacheRelatorios()
+    chave = chave_relatorio(dados_input)
+    reaproveitado = cache.obter_ou_gerar(chave, "output/relatorio.pdf",
+                                         lambda caminho: gerar_pdf_simulacao(caminho, dados_input, calculos))
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from typing import Callable
+
+from core.utils import impressao_constantes
+
+DIRETORIO_CACHE = os.path.join("output", ".cache")
+NOME_INDICE = "indice.sqlite3"
+VERSAO_CACHE = 2 # Incrementar quando a diagramação dos relatórios mudar (invalida as entradas antigas)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS entradas (
+    chave TEXT NOT NULL,
+    formato TEXT NOT NULL,
+    tamanho INTEGER NOT NULL,
+    ultimo_uso REAL NOT NULL,      -- time.time() da gravação ou do último acerto
+    PRIMARY KEY (chave, formato)
+);
+CREATE INDEX IF NOT EXISTS idx_entradas_ultimo_uso ON entradas (ultimo_uso);
+"""
+
+
+def _normalizar(valor):
+    """Forma canônica de um valor de entrada: datas em ISO, números como float, textos sem espaços nas pontas."""
+    if isinstance(valor, bool) or valor is None:
+        return valor
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if isinstance(valor, str):
+        return valor.strip()
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(item) for item in valor]
+    if isinstance(valor, dict):
+        return {str(chave): _normalizar(item) for chave, item in valor.items()}
+    return str(valor)
+
+
+def chave_relatorio(dados_input: dict, formato: str = 'pdf', data_referencia: date | None = None) -> str:
+    """Chave (SHA-256 em hexadecimal) do relatório de uma simulação, com os parâmetros atuais de core.constants."""
+    conteudo = {
+        'versao': VERSAO_CACHE,
+        'formato': formato.lower(),
+        'data_referencia': (data_referencia or date.today()).isoformat(),
+        'constantes': impressao_constantes(),
+        'dados': _normalizar(dados_input),
+    }
+    texto = json.dumps(conteudo, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def _vincular(origem: str, destino: str) -> None:
+    """
+    Cria `destino` como link físico de `origem` (cópia, se não for possível criar o link).
+    Levanta FileNotFoundError se `origem` não existir (ex: removida por uma limpeza concorrente).
+    """
+    try:
+        os.link(origem, destino)
+    except OSError: # Sistemas de arquivos sem hard link, volumes diferentes, destino existente...
+        shutil.copyfile(origem, destino)
+
+
+class CacheRelatorios:
+    """Cache de relatórios gerados, com índice de uso, expiração por idade e limite de tamanho total."""
+
+    __slots__ = ('diretorio', 'indice', 'tamanho_maximo', 'idade_maxima', 'limpar_a_cada', '_gravacoes', '_trava')
+
+    def __init__(self, diretorio: str = DIRETORIO_CACHE, tamanho_maximo_mb: float = 200.0,
+                 idade_maxima_dias: float = 30.0, limpar_a_cada: int = 20):
+        if tamanho_maximo_mb <= 0 or idade_maxima_dias <= 0 or limpar_a_cada < 1:
+            raise ValueError("Tamanho máximo, idade máxima e intervalo de limpeza do cache devem ser positivos.")
+        self.diretorio = diretorio
+        self.indice = os.path.join(diretorio, NOME_INDICE)
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        self.idade_maxima = idade_maxima_dias * 86400
+        self.limpar_a_cada = limpar_a_cada
+        self._gravacoes = 0 # Relatórios guardados desde a última limpeza
+        self._trava = threading.Lock() # Serializa gravações e limpeza entre threads do mesmo processo
+        os.makedirs(diretorio, exist_ok=True)
+        novo = not os.path.exists(self.indice)
+        with self._conexao() as conexao:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.executescript(_ESQUEMA)
+        if novo:
+            self._indexar_existentes()
+
+    @contextmanager
+    def _conexao(self):
+        """Conexão curta por operação (segura entre threads); confirma a transação ao sair sem erro."""
+        conexao = sqlite3.connect(self.indice, timeout=10)
+        conexao.row_factory = sqlite3.Row
+        conexao.execute("PRAGMA synchronous=NORMAL") # Uma atualização por acerto: sem fsync a cada transação
+        try:
+            with conexao:
+                yield conexao
+        finally:
+            conexao.close()
+
+    def _indexar_existentes(self) -> None:
+        """Inclui no índice recém-criado as entradas já presentes na pasta (uso = data de modificação)."""
+        entradas = []
+        for subpasta in os.scandir(self.diretorio):
+            if not subpasta.is_dir():
+                continue
+            for arquivo in os.scandir(subpasta.path):
+                chave, _, formato = arquivo.name.partition('.')
+                if formato and '.' not in formato and arquivo.is_file():
+                    info = arquivo.stat()
+                    entradas.append((chave, formato, info.st_size, info.st_mtime))
+        with self._conexao() as conexao:
+            conexao.executemany("INSERT OR IGNORE INTO entradas VALUES (?, ?, ?, ?)", entradas)
+
+    def caminho(self, chave: str, formato: str = 'pdf') -> str:
+        """Local da entrada no cache (subpastas pelos 2 primeiros dígitos evitam diretórios enormes)."""
+        return os.path.join(self.diretorio, chave[:2], f"{chave}.{formato.lower()}")
+
+    def obter(self, chave: str, destino: str, formato: str = 'pdf') -> bool:
+        """Se a chave estiver no cache, disponibiliza o arquivo em `destino` e retorna True."""
+        formato = formato.lower()
+        try:
+            _vincular(self.caminho(chave, formato), destino)
+        except FileNotFoundError: # Nunca guardada, ou removida por uma limpeza entre a consulta e o link
+            return False
+        with self._conexao() as conexao: # Uso recente fica no índice: o arquivo entregue não é alterado
+            conexao.execute("UPDATE entradas SET ultimo_uso = ? WHERE chave = ? AND formato = ?",
+                            (time.time(), chave, formato))
+        return True
+
+    def guardar(self, chave: str, arquivo: str, formato: str = 'pdf') -> None:
+        """Guarda no cache um relatório já gerado em `arquivo`; a cada `limpar_a_cada` gravações, aplica os limites."""
+        formato = formato.lower()
+        caminho = self.caminho(chave, formato)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        _vincular(arquivo, temporario)
+        with self._trava:
+            os.replace(temporario, caminho) # Atômico: leitores nunca veem um arquivo pela metade
+            with self._conexao() as conexao:
+                conexao.execute("INSERT OR REPLACE INTO entradas VALUES (?, ?, ?, ?)",
+                                (chave, formato, os.path.getsize(caminho), time.time()))
+            self._gravacoes += 1
+            limpar = self._gravacoes >= self.limpar_a_cada
+        if limpar:
+            self.limpar()
+
+    def obter_ou_gerar(self, chave: str, destino: str, gerar: Callable[[str], None], formato: str = 'pdf') -> bool:
+        """
+        Disponibiliza o relatório em `destino`, chamando `gerar(destino)` só se a chave não estiver no cache.
+        Retorna True se o relatório foi reaproveitado do cache.
+        """
+        if self.obter(chave, destino, formato):
+            return True
+        gerar(destino)
+        self.guardar(chave, destino, formato)
+        return False
+
+    def limpar(self) -> dict:
+        """Remove entradas expiradas e, se preciso, as menos usadas até caber no tamanho máximo (consulta só o índice)."""
+        with self._trava, self._conexao() as conexao:
+            self._gravacoes = 0
+            limite_idade = time.time() - self.idade_maxima
+            remover = [(linha['chave'], linha['formato']) for linha in
+                       conexao.execute("SELECT chave, formato FROM entradas WHERE ultimo_uso < ?", (limite_idade,))]
+            conexao.execute("DELETE FROM entradas WHERE ultimo_uso < ?", (limite_idade,))
+
+            quantidade, total = conexao.execute("SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM entradas").fetchone()
+            if total > self.tamanho_maximo:
+                excedentes = []
+                for linha in conexao.execute("SELECT chave, formato, tamanho FROM entradas ORDER BY ultimo_uso"):
+                    if total <= self.tamanho_maximo:
+                        break
+                    excedentes.append((linha['chave'], linha['formato']))
+                    total -= linha['tamanho']
+                    quantidade -= 1
+                conexao.executemany("DELETE FROM entradas WHERE chave = ? AND formato = ?", excedentes)
+                remover += excedentes
+
+            for chave, formato in remover:
+                try:
+                    os.remove(self.caminho(chave, formato))
+                except FileNotFoundError:
+                    pass
+        return {'removidos': len(remover), 'entradas': quantidade, 'bytes': total}
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+"""
+Relatório Consolidado (Várias Simulações num Único PDF)
+-------------------------------------------------------
+Recebe um iterador de (dados_input, calculos) e escreve cada simulação
+diretamente no Canvas à medida que chega, usando o modelo pré-montado de
+reports/pdf_rapido.py. Não há `story` acumulada, e o documento é gerado em
+blocos: cada bloco de cerca de `paginas_por_bloco` páginas é um Canvas
+próprio que, quando cheio, é salvo em memória e anexado ao arquivo final
+por reports/pdf_fluxo.py. Assim a memória usada fica limitada a um bloco,
+não importa quantas simulações venham. As linhas da tabela-resumo vão para
+um arquivo temporário e são relidas no fim. Cada simulação ganha um
+marcador no sumário (outline) do PDF, e o documento termina com a
+tabela-resumo, com links para as páginas de cada simulação.
+"""
+
+import gc
+import io
+import pickle
+import tempfile
+from array import array
+from typing import Iterable
+
+from reportlab.lib.colors import black, darkblue, navy
+from reportlab.pdfbase.pdfdoc import LinkAnnotation, PDFName
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+
+from core.formulas import Rastreio
+from core.utils import formatar_moeda, formatar_numero
+from reports.pdf_fluxo import EscritorPDFFluxo
+from reports.pdf_rapido import (ENTRELINHA, FONTE, FONTE_NEGRITO, MARGEM, TAMANHO_FONTE,
+                                TAMANHO_PAGINA, TOPO, RenderizadorRapido)
+
+PAGINAS_POR_BLOCO: int = 60 # Páginas por Canvas antes de anexar ao PDF final (cerca de 20 simulações)
+
+# Colunas da tabela-resumo: (título, x inicial, alinhada à direita)
+COLUNAS_RESUMO = [
+    ("Nº", MARGEM, False),
+    ("Advogado(a)", MARGEM + 30, False),
+    ("Área", MARGEM + 200, False),
+    ("Taxa Horária", MARGEM + 360, True),
+    ("Preço Final", MARGEM + 450, True),
+    ("Pág.", MARGEM + 482, True),
+]
+LARGURA_NOME = 165 # Espaço da coluna Advogado(a) antes da coluna Área
+
+
+def _truncar(texto: str, largura: float) -> str:
+    """Encurta o texto com reticências até caber na largura (fonte normal da tabela)."""
+    if stringWidth(texto, FONTE, TAMANHO_FONTE) <= largura:
+        return texto
+    while texto and stringWidth(texto + "…", FONTE, TAMANHO_FONTE) > largura:
+        texto = texto[:-1]
+    return texto + "…"
+
+
+def _cabecalho_resumo(c: Canvas, y: float) -> float:
+    """Desenha o cabeçalho da tabela-resumo e devolve o y da primeira linha."""
+    c.setFont(FONTE_NEGRITO, TAMANHO_FONTE)
+    c.setFillColor(black)
+    for titulo, x, direita in COLUNAS_RESUMO:
+        (c.drawRightString if direita else c.drawString)(x, y, titulo)
+    c.line(MARGEM, y - 4, TAMANHO_PAGINA[0] - MARGEM, y - 4)
+    return y - ENTRELINHA - 4
+
+
+class _Blocos:
+    """
+    Canvas do bloco atual e os marcadores ainda não anexados. Ao fechar um bloco, o PDF dele
+    é anexado ao escritor, os marcadores viram itens do sumário e um Canvas novo é aberto.
+    """
+
+    __slots__ = ('escritor', 'paginas_por_bloco', 'canvas', 'renderizador', '_buffer', '_marcadores', '_simulacoes')
+
+    def __init__(self, destino, paginas_por_bloco: int):
+        self.escritor = EscritorPDFFluxo(destino, resolver_destino=self._resolver)
+        self.paginas_por_bloco = paginas_por_bloco
+        self._simulacoes = array('q') # Objeto da primeira página de cada simulação (destino dos links do resumo)
+        self._abrir()
+
+    def _abrir(self) -> None:
+        self._buffer = io.BytesIO()
+        self.canvas = Canvas(self._buffer, pagesize=TAMANHO_PAGINA, pageCompression=1)
+        self.renderizador = RenderizadorRapido(None, canvas=self.canvas) # Forms são definidos de novo em cada bloco
+        self._marcadores = []
+
+    def _resolver(self, nome: str) -> int | None:
+        """Página da simulação de um link do resumo ('sim<número>')."""
+        return self._simulacoes[int(nome[3:]) - 1] if nome.startswith("sim") else None
+
+    @property
+    def pagina_atual(self) -> int:
+        """Número (no documento inteiro) da página sendo desenhada."""
+        return self.escritor.total_paginas + self.canvas.getPageNumber()
+
+    def marcar(self, titulo: str, simulacao: bool = False) -> None:
+        """Marcador no sumário para a página atual; `simulacao` a registra como destino dos links do resumo."""
+        self._marcadores.append((titulo, self.canvas.getPageNumber() - 1, simulacao))
+
+    def fechar_bloco(self) -> None:
+        """Anexa as páginas prontas do bloco ao PDF final e libera o Canvas."""
+        if self.canvas.getPageNumber() == 1: # Nenhuma página fechada neste bloco
+            return
+        self.canvas.save()
+        paginas = self.escritor.anexar(self._buffer.getvalue())
+        for titulo, indice, simulacao in self._marcadores:
+            self.escritor.marcar(titulo, paginas[indice])
+            if simulacao:
+                self._simulacoes.append(paginas[indice])
+        self._abrir()
+        # O documento do ReportLab tem referências circulares: sem a coleta, os blocos já
+        # anexados só seriam liberados quando o coletor rodasse, e o pico variaria com isso
+        gc.collect()
+
+    def quebrar_se_cheio(self) -> None:
+        """Fecha o bloco se já tem `paginas_por_bloco` páginas (só entre páginas completas)."""
+        if self.canvas.getPageNumber() - 1 >= self.paginas_por_bloco:
+            self.fechar_bloco()
+
+    def nova_pagina(self, fechar_bloco: bool = False) -> Canvas:
+        """Fecha a página atual (e o bloco, se cheio ou se `fechar_bloco`) e devolve o Canvas da página seguinte."""
+        self.canvas.showPage()
+        if fechar_bloco:
+            self.fechar_bloco()
+        else:
+            self.quebrar_se_cheio()
+        return self.canvas
+
+
+def _link_simulacao(c: Canvas, numero: int, y: float) -> None:
+    """Link da linha do resumo para a simulação, pelo destino nomeado 'sim<número>' (resolvido pelo escritor)."""
+    retangulo = (MARGEM, y - 3, TAMANHO_PAGINA[0] - MARGEM, y + TAMANHO_FONTE)
+    c._addAnnotation(LinkAnnotation(retangulo, "", PDFName(f"sim{numero}"), Border="[0 0 0]"))
+
+
+def _desenhar_resumo(blocos: _Blocos, linhas: Iterable[tuple], quantidade: int, soma_precos: float) -> None:
+    """Tabela-resumo com uma linha por simulação (link para a página) e os totais, paginada."""
+    blocos.marcar("Resumo")
+    c = blocos.canvas
+    y = TOPO - 14
+    c.setFont(FONTE_NEGRITO, 14)
+    c.setFillColor(navy)
+    c.drawString(MARGEM, y, "Resumo das Simulações")
+    y = _cabecalho_resumo(c, y - 0.8 * ENTRELINHA * 2)
+
+    for numero, nome, area, taxa, preco, pagina in linhas:
+        if y < MARGEM: # Cada página do resumo (cerca de 50 links) fecha o bloco
+            c = blocos.nova_pagina(fechar_bloco=True)
+            y = _cabecalho_resumo(c, TOPO - ENTRELINHA)
+        c.setFont(FONTE, TAMANHO_FONTE)
+        c.drawString(COLUNAS_RESUMO[0][1], y, str(numero))
+        c.drawString(COLUNAS_RESUMO[1][1], y, _truncar(nome, LARGURA_NOME))
+        c.drawString(COLUNAS_RESUMO[2][1], y, area)
+        c.drawRightString(COLUNAS_RESUMO[3][1], y, formatar_moeda(taxa))
+        c.drawRightString(COLUNAS_RESUMO[4][1], y, formatar_moeda(preco))
+        c.drawRightString(COLUNAS_RESUMO[5][1], y, str(pagina))
+        _link_simulacao(c, numero, y)
+        y -= ENTRELINHA
+
+    if quantidade:
+        y -= ENTRELINHA
+        if y < MARGEM + 2 * ENTRELINHA:
+            c = blocos.nova_pagina()
+            y = TOPO - ENTRELINHA
+        c.setFont(FONTE_NEGRITO, TAMANHO_FONTE)
+        c.setFillColor(darkblue)
+        c.drawString(MARGEM, y, f"Simulações: {formatar_numero(quantidade, 0)}")
+        c.drawString(MARGEM, y - ENTRELINHA, f"Preço médio: {formatar_moeda(soma_precos / quantidade)}  |  "
+                                             f"Soma dos preços: {formatar_moeda(soma_precos)}")
+    c.showPage()
+
+
+def _ler_linhas(arquivo) -> Iterable[tuple]:
+    """Relê, em ordem, as linhas do resumo gravadas com pickle no arquivo temporário."""
+    arquivo.seek(0)
+    while True:
+        try:
+            yield pickle.load(arquivo)
+        except EOFError:
+            return
+
+
+def gerar_relatorio_consolidado(destino, simulacoes: Iterable[tuple[dict, dict]],
+                                titulo: str = "Relatório Consolidado de Simulações",
+                                rastreio: Rastreio | None = None,
+                                paginas_por_bloco: int = PAGINAS_POR_BLOCO) -> dict:
+    """
+    Gera um único PDF com todas as simulações do iterador, na ordem recebida,
+    seguidas da tabela-resumo. `destino` é um caminho ou arquivo binário aberto.
+    Retorna a quantidade de simulações e de páginas.
+    """
+    if paginas_por_bloco < 1:
+        raise ValueError("O número de páginas por bloco deve ser pelo menos 1.")
+    blocos = _Blocos(destino, paginas_por_bloco)
+    quantidade, soma_precos = 0, 0.0
+    with tempfile.TemporaryFile() as linhas_resumo:
+        for numero, (dados_input, calculos) in enumerate(simulacoes, start=1):
+            nome = dados_input.get('nome_advogado') or "Advogado"
+            preco = calculos.get('preco_horario_sugerido') or 0.0
+            blocos.marcar(f"{numero}. {nome}", simulacao=True)
+            pickle.dump((numero, nome, dados_input.get('area_servico_atual', ""),
+                         calculos.get('taxa_horaria_sugerida') or 0.0, preco, blocos.pagina_atual), linhas_resumo)
+            blocos.renderizador.desenhar_simulacao(dados_input, calculos)
+            blocos.quebrar_se_cheio()
+            quantidade += 1
+            soma_precos += preco
+            if rastreio is not None:
+                rastreio(f"Simulação {numero} ({nome}) adicionada ao relatório consolidado.")
+
+        # O resumo começa num bloco próprio: quando ele for anexado, todas as simulações
+        # já estão no PDF final e os links do resumo têm destino
+        blocos.fechar_bloco()
+        _desenhar_resumo(blocos, _ler_linhas(linhas_resumo), quantidade, soma_precos)
+    blocos.fechar_bloco()
+    paginas = blocos.escritor.total_paginas
+    blocos.escritor.fechar(titulo, "Simulador de Honorários")
+    if rastreio is not None:
+        rastreio(f"\nRelatório consolidado gerado: {destino} ({quantidade} simulações, {paginas} páginas)")
+    return {'simulacoes': quantidade, 'paginas': paginas}
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+"""
+Exportação do Relatório em Formatos Leves (JSON, CSV, HTML)
+-----------------------------------------------------------
+Escritores que percorrem o modelo de reports/modelo.py sem passar pelo
+ReportLab: não há diagramação nem importação da biblioteca de PDF, então
+a exportação custa microssegundos em vez de dezenas de milissegundos.
+O PDF continua disponível pelo mesmo ponto de entrada (formato 'pdf'),
+com o ReportLab importado apenas quando esse formato é pedido.
+
+Novos formatos podem ser acrescentados com registrar_escritor().
+
+Exemplo:
+    exportar_relatorio("saida/simulacao.json", dados_input, calculos)
+    texto_html = exportar_texto(dados_input, calculos, 'html')
+"""
+
+import csv
+import io
+import json
+import os
+import re
+from datetime import date
+from html import escape
+from typing import Callable
+
+from core.formulas import Rastreio
+from reports.modelo import Relatorio, montar_relatorio
+
+# Escritor: recebe o arquivo aberto (texto ou binário) e o modelo do relatório
+Escritor = Callable[[object, Relatorio], None]
+
+CAMPOS_CSV = ['secao', 'tipo', 'rotulo', 'texto', 'valor']
+
+
+def _texto_puro(marcacao: str) -> str:
+    """Remove a marcação <b>/<i> das observações."""
+    return re.sub(r"<[^>]+>", "", marcacao)
+
+
+def _valor_serializavel(valor):
+    """Datas viram texto ISO (AAAA-MM-DD); números, textos e None são mantidos."""
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, (list, tuple)):
+        return [_valor_serializavel(item) for item in valor]
+    return valor
+
+
+# --- Escritores ---
+
+def escrever_json(arquivo, relatorio: Relatorio) -> None:
+    """Relatório completo como um objeto JSON (textos formatados e valores brutos lado a lado)."""
+    conteudo = {
+        'titulo': relatorio.titulo,
+        'gerado_em': relatorio.gerado_em.isoformat(timespec='seconds'),
+        'advogado': relatorio.advogado,
+        'resumo': relatorio.resumo,
+        'secoes': [
+            {
+                'titulo': secao.titulo,
+                'itens': [{'tipo': tipo, 'rotulo': rotulo, 'texto': texto, 'valor': _valor_serializavel(valor)}
+                          for tipo, rotulo, texto, valor in secao.itens if tipo != 'espaco'],
+            }
+            for secao in relatorio.secoes
+        ],
+        'observacoes': [_texto_puro(obs) for obs in relatorio.observacoes],
+    }
+    json.dump(conteudo, arquivo, ensure_ascii=False, indent=2)
+    arquivo.write("\n")
+
+
+def escrever_csv(arquivo, relatorio: Relatorio) -> None:
+    """Uma linha por item do relatório (secao, tipo, rotulo, texto, valor); listas de datas separadas por ';'."""
+    escritor = csv.writer(arquivo)
+    escritor.writerow(CAMPOS_CSV)
+    for secao, tipo, rotulo, texto, valor in relatorio.itens():
+        if tipo == 'espaco': # Só diagramação
+            continue
+        valor = _valor_serializavel(valor)
+        if isinstance(valor, list):
+            valor = ";".join(valor)
+        escritor.writerow([secao, tipo, rotulo, texto, "" if valor is None else valor])
+
+
+_CSS_HTML = (
+    "body{font-family:Helvetica,Arial,sans-serif;max-width:48em;margin:2em auto;color:#000;line-height:1.4}"
+    "h1{color:darkblue;text-align:center}h2{color:navy;margin-top:1.6em}h3{text-decoration:underline;font-size:1.05em}"
+    "p{margin:.1em 0}.fator{margin-left:2em}.destaque{font-weight:bold;margin-top:.8em}"
+    ".preco{color:darkblue;font-weight:bold;font-size:1.3em;text-align:center;margin:1em 0}"
+    ".obs{color:gray;font-style:italic;font-size:.9em;margin-top:2em}"
+)
+
+
+def escrever_html(arquivo, relatorio: Relatorio) -> None:
+    """Página HTML única (estilo embutido, sem arquivos externos) com o mesmo conteúdo do PDF."""
+    partes = [
+        "<!DOCTYPE html>\n<html lang=\"pt-BR\">\n<head>\n<meta charset=\"utf-8\">\n",
+        f"<title>Simulação Honorários - {escape(relatorio.advogado or 'Advogado')}</title>\n",
+        f"<style>{_CSS_HTML}</style>\n</head>\n<body>\n",
+        f"<h1>{escape(relatorio.titulo)}</h1>\n",
+        f"<p>Relatório Gerado em: {relatorio.gerado_em.strftime('%d/%m/%Y %H:%M:%S')}</p>\n",
+    ]
+    if relatorio.advogado:
+        partes.append(f"<p>Advogado(a): {escape(relatorio.advogado)}</p>\n")
+
+    for secao in relatorio.secoes:
+        partes.append(f"<section>\n<h2>{escape(secao.titulo)}</h2>\n")
+        for tipo, rotulo, texto, _ in secao.itens:
+            rotulo, texto = escape(rotulo), escape(texto)
+            if tipo == 'subtitulo':
+                partes.append(f"<h3>{rotulo}:</h3>\n")
+            elif tipo == 'linha':
+                partes.append(f"<p><b>{rotulo}:</b> {texto}</p>\n")
+            elif tipo == 'texto':
+                partes.append(f"<p>{rotulo}:</p>\n")
+            elif tipo == 'fator':
+                partes.append(f"<p class=\"fator\">- {rotulo}: {texto}</p>\n")
+            elif tipo == 'destaque':
+                partes.append(f"<p class=\"destaque\">{rotulo}: {texto}</p>\n")
+            elif tipo == 'preco':
+                partes.append(f"<p class=\"preco\">{rotulo}: {texto}</p>\n")
+        partes.append("</section>\n")
+
+    # As observações são texto fixo do próprio relatório (a marcação <b>/<i> é mantida)
+    partes.append("<div class=\"obs\">\n<p>Observações Importantes:</p>\n<ul>\n")
+    partes.extend(f"<li>{obs}</li>\n" for obs in relatorio.observacoes)
+    partes.append("</ul>\n</div>\n</body>\n</html>\n")
+    arquivo.write("".join(partes))
+
+
+def _escrever_pdf(arquivo, relatorio: Relatorio) -> None:
+    """PDF completo; o ReportLab só é importado aqui, quando o formato é de fato pedido."""
+    from reports.pdf_generator import escrever_pdf
+    escrever_pdf(arquivo, relatorio)
+
+
+# Formato -> (escritor, arquivo binário?)
+ESCRITORES: dict[str, tuple[Escritor, bool]] = {
+    'json': (escrever_json, False),
+    'csv': (escrever_csv, False),
+    'html': (escrever_html, False),
+    'pdf': (_escrever_pdf, True),
+}
+
+
+def registrar_escritor(formato: str, escritor: Escritor, binario: bool = False) -> None:
+    """Acrescenta (ou substitui) o escritor de um formato, passando a valer para exportar_relatorio."""
+    ESCRITORES[formato.lower()] = (escritor, binario)
+
+
+def _escritor(formato: str) -> tuple[Escritor, bool]:
+    try:
+        return ESCRITORES[formato.lower()]
+    except KeyError:
+        raise ValueError(f"Formato de relatório não suportado: '{formato}'. "
+                         f"Use um de: {', '.join(sorted(ESCRITORES))}.") from None
+
+
+# --- Pontos de Entrada ---
+
+def exportar_relatorio(caminho: str, dados_input: dict, calculos: dict, formato: str | None = None,
+                       rastreio: Rastreio | None = None) -> str:
+    """
+    Escreve o relatório da simulação em `caminho`. Sem `formato`, usa a extensão do arquivo
+    (.json, .csv, .html, .pdf). Retorna o formato utilizado.
+    """
+    formato = (formato or os.path.splitext(caminho)[1].lstrip('.') or 'json').lower()
+    if formato == 'htm':
+        formato = 'html'
+    escritor, binario = _escritor(formato)
+    relatorio = montar_relatorio(dados_input, calculos)
+    if binario:
+        with open(caminho, "wb") as arquivo:
+            escritor(arquivo, relatorio)
+    else:
+        with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+            escritor(arquivo, relatorio)
+    if rastreio is not None:
+        rastreio(f"\nRelatório ({formato.upper()}) gerado com sucesso: {caminho}")
+    return formato
+
+
+def exportar_texto(dados_input: dict, calculos: dict, formato: str = 'json') -> str:
+    """Relatório num formato textual (json, csv, html) devolvido como string, sem tocar no disco."""
+    escritor, binario = _escritor(formato)
+    if binario:
+        raise ValueError(f"O formato '{formato}' é binário; use exportar_relatorio.")
+    buffer = io.StringIO(newline="")
+    escritor(buffer, montar_relatorio(dados_input, calculos))
+    return buffer.getvalue()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+"""
+Geração de Relatórios PDF em Lote
+---------------------------------
+Distribui muitos relatórios entre processos "aquecidos": cada processo
+importa o ReportLab e monta a folha de estilos uma única vez, na
+inicialização, e depois só renderiza. Cada relatório é gerado pela mesma
+função do caminho individual (gerar_pdf_simulacao), portanto o arquivo é
+idêntico ao gerado pela GUI, exceto pelos carimbos de data/hora.
+No modo rápido (rapido=True), usa o modelo pré-montado de
+reports/pdf_rapido.py, com diagramação simplificada.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable
+
+from reports import pdf_rapido
+from reports.pdf_generator import estilos_relatorio, gerar_pdf_simulacao
+
+# Um trabalho: (caminho do PDF, dados_input, calculos) — os mesmos argumentos de gerar_pdf_simulacao
+Trabalho = tuple[str, dict, dict]
+
+
+def _aquecer_processo() -> None:
+    """Inicializador dos processos do pool: monta os estilos e o modelo rápido antes do primeiro relatório."""
+    estilos_relatorio()
+    pdf_rapido.aquecer_modelo()
+
+
+def _gerar_um(trabalho: Trabalho, rapido: bool = False) -> str | None:
+    """Gera um relatório sem mensagens no console; devolve a mensagem de erro, ou None em caso de sucesso."""
+    nome_arquivo, dados_input, calculos = trabalho
+    try:
+        if rapido:
+            pdf_rapido.gerar_pdf_rapido(nome_arquivo, dados_input, calculos)
+        else:
+            gerar_pdf_simulacao(nome_arquivo, dados_input, calculos, rastreio=None)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def gerar_pdfs_lote(trabalhos: Iterable[Trabalho], processos: int | None = None,
+                    tamanho_bloco: int = 8, rapido: bool = False) -> dict:
+    """
+    Gera os relatórios num pool de processos aquecidos (processos=1 gera no próprio processo).
+    Com rapido=True usa o modelo pré-montado de reports/pdf_rapido.py.
+    Retorna o resumo da execução: quantidade, erros [(arquivo, mensagem)], tempo total
+    e vazão em relatórios por segundo.
+    """
+    trabalhos = list(trabalhos)
+    processos = processos or os.cpu_count() or 1
+    inicio = time.perf_counter()
+
+    if processos == 1:
+        _aquecer_processo()
+        resultados = [_gerar_um(trabalho, rapido) for trabalho in trabalhos]
+    else:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_aquecer_processo) as executor:
+            resultados = list(executor.map(partial(_gerar_um, rapido=rapido), trabalhos, chunksize=tamanho_bloco))
+
+    segundos = time.perf_counter() - inicio
+    erros = [(trabalho[0], erro) for trabalho, erro in zip(trabalhos, resultados) if erro is not None]
+    return {
+        'relatorios': len(trabalhos) - len(erros),
+        'erros': erros,
+        'segundos': segundos,
+        'relatorios_por_segundo': (len(trabalhos) - len(erros)) / segundos if segundos > 0 else 0.0,
+    }
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+"""
+Modelo do Relatório de Simulação
+--------------------------------
+Conteúdo do relatório (seções, linhas "Rótulo: Valor", fatores e preços)
+montado uma única vez a partir de (dados_input, calculos), sem nenhuma
+dependência de diagramação. Os escritores PDF (reports/pdf_generator.py
+e reports/pdf_rapido.py) e os leves (reports/exportadores.py: JSON, CSV
+e HTML) percorrem o mesmo modelo, de modo que todos os formatos mostram
+exatamente os mesmos textos. Este módulo não importa o ReportLab.
+
+Cada item de uma seção é uma tupla (tipo, rótulo, texto, valor):
+    'subtitulo' - título de um bloco dentro da seção (texto e valor vazios)
+    'texto'     - frase solta (ex: "Fatores Multiplicadores Aplicados")
+    'linha'     - par "Rótulo: Valor"
+    'fator'     - fator multiplicador da taxa horária
+    'destaque'  - resultado intermediário em destaque (taxa horária)
+    'preco'     - preço final de um modelo de cobrança
+    'espaco'    - separação entre grupos de linhas; `valor` é a altura em cm
+                  (só os escritores PDF a usam; os demais a ignoram)
+`texto` é o valor já formatado (pt-BR); `valor` é o dado bruto (número,
+data, lista de datas ou texto), usado pelos formatos legíveis por máquina.
+"""
+
+from datetime import date, datetime
+
+from core import constants
+from core.utils import formatar_moeda, formatar_numero
+
+# Texto fixo do bloco "Observações Importantes" (marcação <b>/<i> aceita pelo Paragraph e pelo HTML)
+OBSERVACOES_TEXTO = """
+        - Os valores apresentados são <b>SUGESTÕES</b> calculadas com base nos dados fornecidos e nos parâmetros definidos em <i>core/constants.py</i>.
+        - O modelo de 'Base Horária' reflete o esforço estimado (horas) multiplicado por uma taxa horária valorizada pela experiência, especialização e outros fatores.
+        - O modelo de 'Base Êxito' (se aplicável) reflete um percentual padrão sobre o ganho estimado do cliente, comum em certas áreas (ex: previdenciária, trabalhista, cível).
+        - A escolha final do modelo de cobrança (horário, êxito, misto, fixo) e o valor dependem da análise de mercado, do tipo de serviço, do valor percebido pelo cliente, do acordo contratual e da estratégia do escritório.
+        - A valoração de fatores intangíveis (experiência, sucesso) é inerentemente subjetiva. Ajuste os pesos e parâmetros no código para refletir sua realidade.
+        - Este simulador é uma ferramenta de apoio à decisão e não substitui o julgamento profissional, a análise de risco e a negociação com o cliente.
+        """
+# As mesmas observações, um item por entrada (sem o "- " inicial)
+OBSERVACOES: list[str] = [linha.strip()[2:] for linha in OBSERVACOES_TEXTO.strip().splitlines()]
+
+TITULO_RELATORIO = "Simulador de Honorários Advocatícios"
+
+
+def formatar_valor_relatorio(valor, format_func=None) -> str:
+    """Texto de um valor nas linhas 'Label: Valor' do relatório (datas, listas de datas, números formatados)."""
+    if isinstance(valor, date):
+        return valor.strftime('%d/%m/%Y')
+    if isinstance(valor, list) and all(isinstance(item, date) for item in valor):
+        return ", ".join([d.strftime('%d/%m/%Y') for d in valor]) if valor else "Nenhuma"
+    if format_func:
+        return format_func(valor)
+    if valor is not None:
+        return str(valor)
+    return "N/A"
+
+
+def _formatar_inteiro(valor) -> str:
+    return formatar_numero(valor, 0)
+
+
+def _formatar_horas(valor) -> str:
+    return formatar_numero(valor, 1)
+
+
+def _total_ganhas(dados_input: dict) -> int:
+    return sum(dados_input.get(key, 0) for key in dados_input if key.startswith('acoes_ganhas_'))
+
+
+# Seção de dados informados: (rótulo, função que extrai o valor de dados_input, formatador, unidade).
+# None marca um subtítulo de bloco (texto no segundo elemento) ou um espaço (altura em cm no segundo elemento).
+LINHAS_DADOS = [
+    (None, "Formação e Experiência"),
+    ("Data Graduação Direito", lambda d: d.get('data_graduacao'), None, ""),
+    ("Data Inscrição OAB", lambda d: d.get('data_oab'), None, ""),
+    ("Datas Pós-Graduações", lambda d: d.get('datas_pos_graduacao', []), None, ""),
+    (None, 0.2),
+    ("Total Ações Atuadas", lambda d: d.get('total_acoes_defendidas'), _formatar_inteiro, ""),
+    ("Total Ações Ganhas (Informado)", _total_ganhas, _formatar_inteiro, ""),
+    (None, 0.2),
+    ("Gasto Estimado Educação", lambda d: d.get('gastos_educacao'), formatar_moeda, ""),
+    ("Horas Estimadas FDS/Feriados (Carreira)", lambda d: d.get('horas_trabalhadas_fds_total'), _formatar_inteiro, ""),
+    (None, 0.4),
+    (None, "Dados do Serviço Específico"),
+    ("Área Serviço Atual", lambda d: d.get('area_servico_atual'), None, ""),
+    ("Horas Estimadas Totais (Esforço)", lambda d: d.get('horas_estimadas_servico'), _formatar_horas, " h"),
+    ("Complexidade Serviço", lambda d: d.get('nivel_complexidade_servico'), None, ""),
+    ("Urgência Serviço", lambda d: d.get('nivel_urgencia_servico'), None, ""),
+    (None, 0.2),
+    ("Valor Estimado da Causa (Recebimento Cliente)", lambda d: d.get('valor_estimado_causa_ganha', 0.0), formatar_moeda, ""),
+    ("Taxa Horária Base Mínima (p/ Cálculo Horário)", lambda d: d.get('taxa_horaria_base_minima'), formatar_moeda, ""),
+]
+
+
+class SecaoRelatorio:
+    """Seção do relatório: título, itens (tipo, rótulo, texto, valor) e se começa numa nova página no PDF."""
+
+    __slots__ = ('titulo', 'itens', 'nova_pagina')
+
+    def __init__(self, titulo: str, nova_pagina: bool = False):
+        self.titulo = titulo
+        self.itens: list[tuple[str, str, str, object]] = []
+        self.nova_pagina = nova_pagina
+
+    def adicionar(self, tipo: str, rotulo: str, texto: str = "", valor=None) -> None:
+        self.itens.append((tipo, rotulo, texto, valor))
+
+    def __repr__(self) -> str:
+        return f"SecaoRelatorio({self.titulo!r}, {len(self.itens)} itens)"
+
+
+class Relatorio:
+    """Relatório completo de uma simulação, pronto para qualquer escritor."""
+
+    __slots__ = ('titulo', 'gerado_em', 'advogado', 'secoes', 'resumo', 'observacoes')
+
+    def __init__(self, gerado_em: datetime, advogado: str | None, secoes: list[SecaoRelatorio], resumo: dict):
+        self.titulo = TITULO_RELATORIO
+        self.gerado_em = gerado_em
+        self.advogado = advogado
+        self.secoes = secoes
+        self.resumo = resumo # Valores principais (taxa e preços) para consumo automatizado
+        self.observacoes = OBSERVACOES
+
+    def itens(self):
+        """Percorre todos os itens como (título da seção, tipo, rótulo, texto, valor)."""
+        for secao in self.secoes:
+            for item in secao.itens:
+                yield (secao.titulo, *item)
+
+    def __repr__(self) -> str:
+        return f"Relatorio(advogado={self.advogado!r}, {len(self.secoes)} seções)"
+
+
+def montar_relatorio(dados_input: dict, calculos: dict, gerado_em: datetime | None = None) -> Relatorio:
+    """Monta o modelo do relatório a partir dos dados informados e dos resultados de cálculo."""
+    dados = SecaoRelatorio("Dados Informados na Simulação")
+    for linha in LINHAS_DADOS:
+        if linha[0] is None and isinstance(linha[1], float):
+            dados.adicionar('espaco', "", valor=linha[1])
+        elif linha[0] is None:
+            dados.adicionar('subtitulo', linha[1])
+        else:
+            rotulo, extrair, formatador, unidade = linha
+            valor = extrair(dados_input)
+            dados.adicionar('linha', rotulo, f"{formatar_valor_relatorio(valor, formatador)}{unidade}", valor)
+
+    taxa = SecaoRelatorio("Cálculo da Taxa Horária Sugerida (Base Horária)", nova_pagina=True)
+    detalhes_taxa = calculos.get('detalhes_taxa_horaria', {})
+    taxa.adicionar('subtitulo', "Componentes do Cálculo")
+    valor = detalhes_taxa.get('Taxa Horária Base Informada')
+    taxa.adicionar('linha', "Taxa Horária Base Informada", formatar_moeda(valor), valor)
+    taxa.adicionar('texto', "Fatores Multiplicadores Aplicados")
+    for nome, valor in detalhes_taxa.get('Fatores Multiplicadores', {}).items():
+        taxa.adicionar('fator', nome, f"{formatar_numero(valor, 3)}x", valor)
+    valor = calculos.get('taxa_horaria_sugerida')
+    taxa.adicionar('destaque', "Taxa Horária Sugerida Calculada", formatar_moeda(valor), valor)
+
+    preco = SecaoRelatorio("Cálculo do Preço Final (Base Horária)")
+    detalhes_preco = calculos.get('detalhes_preco_horario', {})
+    preco.adicionar('subtitulo', "Componentes do Cálculo")
+    valor = detalhes_preco.get('Taxa Horária Utilizada')
+    preco.adicionar('linha', "Taxa Horária Utilizada", formatar_moeda(valor), valor)
+    valor = detalhes_preco.get('Horas Estimadas')
+    preco.adicionar('linha', "Horas Estimadas (Esforço)", f"{formatar_numero(valor, 1)} h", valor)
+    for rotulo, chave_nivel, chave_fator in (("Fator Complexidade", 'Nível de Complexidade', 'Fator Complexidade'),
+                                             ("Fator Urgência", 'Nível de Urgência', 'Fator Urgência')):
+        valor = detalhes_preco.get(chave_fator)
+        preco.adicionar('linha', rotulo, f"{detalhes_preco.get(chave_nivel)} ({formatar_numero(valor, 2)}x)", valor)
+    preco.adicionar('espaco', "", valor=0.3)
+    valor = detalhes_preco.get('Preço Base (Taxa * Horas)')
+    preco.adicionar('linha', "Preço Base (Taxa * Horas)", formatar_moeda(valor), valor)
+    valor = calculos.get('preco_horario_sugerido')
+    preco.adicionar('preco', "Preço Final Sugerido (Base Horária)", formatar_moeda(valor), valor)
+
+    # Faixa de preço (simulação Monte Carlo, se informada a faixa de horas)
+    faixa = calculos.get('faixa_preco_horario')
+    if faixa:
+        preco.adicionar('subtitulo', "Faixa de Preço (Simulação de Incerteza)")
+        preco.adicionar('linha', "Simulações Realizadas", _formatar_inteiro(faixa.get('n_simulacoes')), faixa.get('n_simulacoes'))
+        for rotulo, chave in (("Preço Otimista (P10)", 'preco_p10'), ("Preço Mediano (P50)", 'preco_p50'),
+                              ("Preço Conservador (P90)", 'preco_p90')):
+            preco.adicionar('linha', rotulo, formatar_moeda(faixa.get(chave)), faixa.get(chave))
+        if 'preco_sobre_causa_p50' in faixa:
+            preco.adicionar('linha', "Honorários / Valor da Causa (P50)",
+                            f"{faixa['preco_sobre_causa_p50']:.1%}", faixa['preco_sobre_causa_p50'])
+            preco.adicionar('linha', "Probabilidade do Preço Superar a Causa",
+                            f"{faixa['prob_preco_acima_causa']:.1%}", faixa['prob_preco_acima_causa'])
+
+    secoes = [dados, taxa, preco]
+
+    # Cálculo por êxito (se aplicável)
+    preco_exito = calculos.get('preco_exito_sugerido')
+    if preco_exito is not None and preco_exito > 0:
+        exito = SecaoRelatorio("Cálculo do Preço (Base Êxito - Estimativa)", nova_pagina=True)
+        detalhes_exito = calculos.get('detalhes_preco_exito', {})
+        percentual = detalhes_exito.get('Percentual Êxito Aplicado', constants.PERCENTUAL_EXITO_PADRAO)
+        exito.adicionar('subtitulo', "Componentes do Cálculo")
+        valor = detalhes_exito.get('Valor Estimado Causa Cliente')
+        exito.adicionar('linha', "Valor Estimado da Causa (Recebimento Cliente)", formatar_moeda(valor), valor)
+        exito.adicionar('linha', f"Percentual de Êxito Aplicado ({constants.PERCENTUAL_EXITO_PADRAO:.0%} padrão)",
+                        f"{percentual:.1%}", percentual)
+        exito.adicionar('preco', "Preço Sugerido (Base Êxito)", formatar_moeda(preco_exito), preco_exito)
+        secoes.append(exito)
+
+    resumo = {
+        'taxa_horaria_sugerida': calculos.get('taxa_horaria_sugerida'),
+        'preco_horario_sugerido': calculos.get('preco_horario_sugerido'),
+        'preco_exito_sugerido': preco_exito,
+    }
+    return Relatorio(gerado_em or datetime.now(), dados_input.get('nome_advogado'), secoes, resumo)
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+"""
+Escritor de PDF em Fluxo (Concatenação de Blocos)
+-------------------------------------------------
+O Canvas do ReportLab guarda todas as páginas até o save() e só então monta
+o arquivo inteiro em memória. Para documentos com milhares de páginas, cada
+bloco de páginas é gerado num Canvas próprio e anexado aqui: os objetos do
+bloco são renumerados e escritos imediatamente no destino. Em memória ficam
+apenas a posição de cada objeto (para a tabela xref) e o número do objeto de
+cada página, alguns bytes por página. Ao final, escreve a árvore de páginas,
+o sumário (outline), o catálogo e a tabela xref.
+
+Lê apenas PDFs gerados pelo próprio ReportLab (xref clássica, sem object
+streams nem atualizações incrementais). Links para destinos nomeados
+(`/Dest /nome`) são trocados pela página devolvida por `resolver_destino`,
+que pode estar em qualquer bloco já anexado.
+"""
+
+import os
+import re
+from array import array
+from datetime import datetime
+from typing import Callable
+
+_REFERENCIA = re.compile(rb"(\d+) 0 R\b")
+_DESTINO_NOMEADO = re.compile(rb"/Dest /([^\s/\[\]<>()]+)")
+_INICIO_STREAM = re.compile(rb"\bstream\r?\n")
+_KIDS = re.compile(rb"/Kids \[([^\]]*)\]")
+
+
+def _texto_pdf(texto: str) -> bytes:
+    """String de texto PDF em UTF-16BE (hexadecimal), válida para qualquer caractere."""
+    return b"<FEFF" + texto.encode("utf-16-be").hex().upper().encode("ascii") + b">"
+
+
+def _referencia(dicionario: bytes, chave: bytes) -> int:
+    """Número do objeto referenciado por `chave` (ex: b'/Root') num dicionário; ValueError se ausente."""
+    m = re.search(re.escape(chave) + rb"\s+(\d+) 0 R", dicionario)
+    if m is None:
+        raise ValueError(f"PDF do bloco sem {chave.decode()}.")
+    return int(m.group(1))
+
+
+class _BlocoLido:
+    """Objetos de um PDF do ReportLab: dicionário e stream (intacto) de cada objeto, pela tabela xref."""
+
+    __slots__ = ('dados', 'trailer', 'limites')
+
+    def __init__(self, dados: bytes):
+        self.dados = dados
+        inicio_xref = int(dados[dados.rindex(b"startxref") + 9:].split()[0])
+        linhas = dados[inicio_xref:].split(b"\n")
+        if linhas[0].strip() != b"xref":
+            raise ValueError("PDF do bloco sem tabela xref clássica.")
+        posicoes = {}
+        i = 1
+        while not linhas[i].startswith(b"trailer"):
+            primeiro, quantidade = map(int, linhas[i].split())
+            for numero in range(primeiro, primeiro + quantidade):
+                i += 1
+                campos = linhas[i].split()
+                if campos[2] == b"n":
+                    posicoes[numero] = int(campos[0])
+            i += 1
+        self.trailer = b"\n".join(linhas[i:])
+        # Cada objeto vai da sua posição até a do objeto seguinte (ou até a xref)
+        ordem = sorted(posicoes, key=posicoes.get)
+        fins = [posicoes[n] for n in ordem[1:]] + [inicio_xref]
+        self.limites = {numero: (posicoes[numero], fim) for numero, fim in zip(ordem, fins)}
+
+    def objeto(self, numero: int) -> tuple[bytes, bytes]:
+        """(dicionário, resto) do objeto: o resto é o stream com 'stream ... endstream', ou vazio."""
+        inicio, fim = self.limites[numero]
+        trecho = self.dados[inicio:fim]
+        conteudo = trecho[trecho.index(b"obj") + 3:trecho.rindex(b"endobj")]
+        m = _INICIO_STREAM.search(conteudo)
+        if m is None:
+            return conteudo.strip(), b""
+        return conteudo[:m.start()].strip(), conteudo[m.start():].rstrip()
+
+    def paginas(self) -> tuple[list[int], set[int]]:
+        """Objetos de página em ordem de leitura e os nós da árvore de páginas (que não são copiados)."""
+        raiz = _referencia(self.objeto(_referencia(self.trailer, b"/Root"))[0], b"/Pages")
+        paginas, nos, pendentes = [], set(), [raiz]
+        while pendentes:
+            numero = pendentes.pop()
+            dicionario = self.objeto(numero)[0]
+            m = _KIDS.search(dicionario)
+            if m is None:
+                paginas.append(numero)
+                continue
+            nos.add(numero)
+            pendentes.extend(reversed([int(n) for n in _REFERENCIA.findall(m.group(1))]))
+        return paginas, nos
+
+
+class EscritorPDFFluxo:
+    """Escreve um único PDF a partir de PDFs de blocos de páginas, anexados em ordem."""
+
+    __slots__ = ('resolver_destino', '_arquivo', '_fechar_arquivo', '_posicao', '_posicoes', '_paginas',
+                 '_marcadores', '_primeiro_marcador', '_marcador_pendente')
+
+    # Objetos escritos no fim, com números reservados
+    CATALOGO, PAGINAS, SUMARIO, INFO = 1, 2, 3, 4
+
+    def __init__(self, destino, resolver_destino: Callable[[str], int | None] | None = None):
+        """`destino` é um caminho ou arquivo binário aberto (que continua aberto ao final)."""
+        self.resolver_destino = resolver_destino
+        self._fechar_arquivo = isinstance(destino, (str, os.PathLike))
+        self._arquivo = open(destino, "wb") if self._fechar_arquivo else destino
+        self._posicao = 0
+        self._posicoes = array('q', [0] * 5) # Índice = número do objeto; 0 = ainda não escrito
+        self._paginas = array('q')           # Número do objeto de cada página, em ordem
+        self._marcadores = 0
+        self._primeiro_marcador = 0
+        self._marcador_pendente = None       # (número, título, página, anterior), escrito ao conhecer o próximo
+        self._escrever(b"%PDF-1.4\n%\x93\x8c\x8b\x9e\n")
+
+    @property
+    def total_paginas(self) -> int:
+        return len(self._paginas)
+
+    def _escrever(self, dados: bytes) -> None:
+        self._arquivo.write(dados)
+        self._posicao += len(dados)
+
+    def _novo_objeto(self) -> int:
+        self._posicoes.append(0)
+        return len(self._posicoes) - 1
+
+    def _escrever_objeto(self, numero: int, dicionario: bytes, resto: bytes = b"") -> None:
+        self._posicoes[numero] = self._posicao
+        self._escrever(b"%d 0 obj\n%s\n" % (numero, dicionario) + (resto + b"\n" if resto else b"") + b"endobj\n")
+
+    # --- Blocos ---
+
+    def anexar(self, pdf: bytes) -> list[int]:
+        """
+        Copia as páginas de um PDF do ReportLab (e tudo o que elas usam: conteúdo, fontes,
+        forms, links) para o destino. Retorna os números, no PDF final, dos objetos das páginas.
+        """
+        bloco = _BlocoLido(pdf)
+        paginas, nos = bloco.paginas()
+        novos = dict.fromkeys(nos, self.PAGINAS) # /Parent das páginas passa a ser a árvore do PDF final
+        dicionarios = {}
+        pendentes = paginas[::-1] # A primeira página sai primeiro (números em ordem de leitura)
+        while pendentes: # Só os objetos alcançáveis a partir das páginas (sem catálogo, info, sumário do bloco)
+            numero = pendentes.pop()
+            if numero in novos:
+                continue
+            novos[numero] = self._novo_objeto()
+            dicionarios[numero] = bloco.objeto(numero)
+            pendentes.extend(int(n) for n in _REFERENCIA.findall(dicionarios[numero][0]))
+
+        def _renumerar(m):
+            return b"%d 0 R" % novos[int(m.group(1))]
+
+        def _destino(m):
+            pagina = self.resolver_destino(m.group(1).decode("ascii")) if self.resolver_destino else None
+            return m.group(0) if pagina is None else b"/Dest [ %d 0 R /Fit ]" % pagina
+
+        for numero in sorted(dicionarios):
+            dicionario, resto = dicionarios[numero]
+            dicionario = _DESTINO_NOMEADO.sub(_destino, _REFERENCIA.sub(_renumerar, dicionario))
+            self._escrever_objeto(novos[numero], dicionario, resto)
+        finais = [novos[numero] for numero in paginas]
+        self._paginas.extend(finais)
+        return finais
+
+    # --- Sumário ---
+
+    def marcar(self, titulo: str, pagina: int) -> None:
+        """Acrescenta um item ao sumário (outline) apontando para o objeto de página `pagina`."""
+        numero = self._novo_objeto()
+        anterior = 0
+        if self._marcador_pendente is not None:
+            anterior = self._marcador_pendente[0]
+            self._escrever_marcador(*self._marcador_pendente, proximo=numero)
+        else:
+            self._primeiro_marcador = numero
+        self._marcador_pendente = (numero, titulo, pagina, anterior)
+        self._marcadores += 1
+
+    def _escrever_marcador(self, numero: int, titulo: str, pagina: int, anterior: int, proximo: int = 0) -> None:
+        partes = [b"<< /Title %s /Parent %d 0 R /Dest [ %d 0 R /Fit ]" % (_texto_pdf(titulo), self.SUMARIO, pagina)]
+        if anterior:
+            partes.append(b"/Prev %d 0 R" % anterior)
+        if proximo:
+            partes.append(b"/Next %d 0 R" % proximo)
+        self._escrever_objeto(numero, b" ".join(partes) + b" >>")
+
+    # --- Fechamento ---
+
+    def fechar(self, titulo: str = "", autor: str = "") -> None:
+        """Escreve árvore de páginas, sumário, catálogo, info e xref; fecha o arquivo se foi aberto aqui."""
+        if self._marcador_pendente is not None:
+            self._escrever_marcador(*self._marcador_pendente)
+            ultimo = self._marcador_pendente[0]
+            self._escrever_objeto(self.SUMARIO, b"<< /Type /Outlines /Count %d /First %d 0 R /Last %d 0 R >>"
+                                  % (self._marcadores, self._primeiro_marcador, ultimo))
+        else:
+            self._escrever_objeto(self.SUMARIO, b"<< /Type /Outlines /Count 0 >>")
+
+        # Árvore de páginas plana, escrita em partes (a lista /Kids pode ser longa)
+        self._posicoes[self.PAGINAS] = self._posicao
+        self._escrever(b"%d 0 obj\n<< /Type /Pages /Count %d /Kids [" % (self.PAGINAS, len(self._paginas)))
+        for inicio in range(0, len(self._paginas), 1000):
+            self._escrever(b"".join(b" %d 0 R" % n for n in self._paginas[inicio:inicio + 1000]))
+        self._escrever(b" ] >>\nendobj\n")
+
+        self._escrever_objeto(self.CATALOGO, b"<< /Type /Catalog /Pages %d 0 R /Outlines %d 0 R /PageMode /UseOutlines >>"
+                              % (self.PAGINAS, self.SUMARIO))
+        data = datetime.now().strftime("D:%Y%m%d%H%M%S").encode("ascii")
+        self._escrever_objeto(self.INFO, b"<< /Title %s /Author %s /Producer %s /CreationDate (%s) >>"
+                              % (_texto_pdf(titulo), _texto_pdf(autor), _texto_pdf("ReportLab / Simulador de Honorários"),
+                                 data))
+
+        inicio_xref = self._posicao
+        self._escrever(b"xref\n0 %d\n0000000000 65535 f \n" % len(self._posicoes))
+        for inicio in range(1, len(self._posicoes), 1000):
+            self._escrever(b"".join(b"%010d 00000 n \n" % p for p in self._posicoes[inicio:inicio + 1000]))
+        self._escrever(b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                       % (len(self._posicoes), self.CATALOGO, self.INFO, inicio_xref))
+        if self._fechar_arquivo:
+            self._arquivo.close()
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+
+"""
+Relatório PDF Rápido (Modelo Pré-Montado)
+-----------------------------------------
+Versão do relatório de reports/pdf_generator.py para geração em massa.
+Em vez de passar cada Paragraph pelo platypus a cada relatório, o layout
+é fixo: título, títulos de seção, rótulos e o bloco "Observações
+Importantes" são medidos e quebrados em linhas uma única vez por processo
+e gravados como form XObjects (desenhados uma vez por arquivo e apenas
+referenciados nas páginas seguintes). Por simulação, só os valores
+variáveis são escritos nas posições já calculadas.
+
+O conteúdo vem do mesmo modelo do relatório completo (reports/modelo.py);
+a diagramação é simplificada (posições fixas em vez do fluxo do platypus).
+"""
+
+import io
+from functools import lru_cache
+from typing import BinaryIO
+
+from reportlab.lib.colors import black, darkblue, navy
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Paragraph
+
+from core.formulas import Rastreio
+from reports.modelo import LINHAS_DADOS, OBSERVACOES_TEXTO, TITULO_RELATORIO, Relatorio, montar_relatorio
+from reports.pdf_generator import estilos_relatorio
+
+TAMANHO_PAGINA = (21*cm, 29.7*cm) # A4
+MARGEM = 2*cm
+LARGURA_UTIL = TAMANHO_PAGINA[0] - 2*MARGEM
+TOPO = TAMANHO_PAGINA[1] - MARGEM
+ENTRELINHA = 14 # Mesmo leading do estilo LabelValor
+FONTE, FONTE_NEGRITO, TAMANHO_FONTE = 'Helvetica', 'Helvetica-Bold', 10
+
+
+# --- Layout (calculado uma vez por processo) ---
+
+@lru_cache(maxsize=None)
+def _largura_rotulo(rotulo: str) -> float:
+    """Largura de 'Rótulo: ' em negrito, onde começa o valor da linha."""
+    return stringWidth(f"{rotulo}: ", FONTE_NEGRITO, TAMANHO_FONTE)
+
+
+@lru_cache(maxsize=1)
+def _layout_pagina_dados() -> tuple[list, float]:
+    """
+    Posições fixas da página de dados: lista de (tipo, texto, y) e o y logo abaixo da última linha.
+    As linhas variáveis do topo (data do relatório e advogado) ficam entre o título e a seção.
+    """
+    posicoes = []
+    y = TOPO - 18 # Linha de base do título (18 pt)
+    posicoes.append(('titulo', TITULO_RELATORIO, y))
+    y -= 0.6*cm + ENTRELINHA
+    posicoes.append(('gerado_em', None, y))
+    y -= ENTRELINHA
+    posicoes.append(('advogado', None, y))
+    y -= 0.5*cm + 0.8*cm + 14
+    posicoes.append(('secao', "Dados Informados na Simulação", y))
+    y -= 0.4*cm
+    for linha in LINHAS_DADOS:
+        if linha[0] is None and isinstance(linha[1], float):
+            y -= linha[1]*cm
+        elif linha[0] is None:
+            y -= 0.4*cm + 11
+            posicoes.append(('subtitulo', linha[1], y))
+            y -= 0.2*cm
+        else:
+            y -= ENTRELINHA
+            posicoes.append(('rotulo', linha[0], y))
+    return posicoes, y
+
+
+@lru_cache(maxsize=1)
+def _observacoes() -> tuple[Paragraph, Paragraph, float, float]:
+    """Título e texto das observações, já quebrados em linhas na largura útil (medidos uma vez)."""
+    estilo = estilos_relatorio()['obs']
+    titulo = Paragraph("Observações Importantes:", estilo)
+    texto = Paragraph(OBSERVACOES_TEXTO, estilo)
+    _, altura_titulo = titulo.wrap(LARGURA_UTIL, TAMANHO_PAGINA[1])
+    _, altura_texto = texto.wrap(LARGURA_UTIL, TAMANHO_PAGINA[1])
+    return titulo, texto, altura_titulo, altura_texto
+
+
+def _altura_observacoes() -> float:
+    _, _, altura_titulo, altura_texto = _observacoes()
+    return altura_titulo + altura_texto
+
+
+def aquecer_modelo() -> None:
+    """Calcula o layout e quebra as observações antecipadamente (ex: na inicialização de um processo do pool)."""
+    _layout_pagina_dados()
+    _observacoes()
+
+
+# --- Renderizador ---
+
+class RenderizadorRapido:
+    """
+    Desenha simulações num Canvas usando o modelo pré-montado. Os blocos estáticos
+    viram form XObjects na primeira página que os usa e são apenas referenciados
+    nas demais, o que também barateia relatórios com várias simulações no mesmo arquivo.
+    """
+
+    def __init__(self, destino, titulo: str = "Simulação Honorários", canvas: Canvas | None = None):
+        self.canvas = canvas or Canvas(destino, pagesize=TAMANHO_PAGINA)
+        if canvas is None:
+            self.canvas.setTitle(titulo)
+            self.canvas.setAuthor("Simulador de Honorários")
+        self._forms_definidos = set()
+
+    # --- Blocos estáticos ---
+
+    def _usar_form(self, nome: str, desenhar) -> None:
+        """Define o form na primeira utilização (neste arquivo) e o desenha na página atual."""
+        if nome not in self._forms_definidos:
+            self.canvas.beginForm(nome)
+            desenhar(self.canvas)
+            self.canvas.endForm()
+            self._forms_definidos.add(nome)
+        self.canvas.doForm(nome)
+
+    @staticmethod
+    def _desenhar_estatico_dados(c: Canvas) -> None:
+        """Título, seções e rótulos da página de dados."""
+        posicoes, _ = _layout_pagina_dados()
+        rotulos = c.beginText() # Um único objeto de texto para todos os rótulos
+        rotulos.setFont(FONTE_NEGRITO, TAMANHO_FONTE)
+        for tipo, texto, y in posicoes:
+            if tipo == 'rotulo':
+                rotulos.setTextOrigin(MARGEM, y)
+                rotulos.textOut(f"{texto}:")
+            elif tipo == 'titulo':
+                c.setFont(FONTE_NEGRITO, 18)
+                c.setFillColor(darkblue)
+                c.drawCentredString(TAMANHO_PAGINA[0] / 2, y, texto)
+            elif tipo == 'secao':
+                c.setFont(FONTE_NEGRITO, 14)
+                c.setFillColor(navy)
+                c.drawString(MARGEM, y, texto)
+            elif tipo == 'subtitulo':
+                c.setFont(FONTE_NEGRITO, 11)
+                c.setFillColor(black)
+                c.drawString(MARGEM, y, f"{texto}:")
+                c.line(MARGEM, y - 1.5, MARGEM + stringWidth(f"{texto}:", FONTE_NEGRITO, 11), y - 1.5)
+        c.setFillColor(black)
+        c.drawText(rotulos)
+
+    @staticmethod
+    def _desenhar_observacoes(c: Canvas) -> None:
+        """Bloco 'Observações Importantes' com a base na origem do form (a caixa do form começa em y=0)."""
+        titulo, texto, _, altura_texto = _observacoes()
+        texto.drawOn(c, MARGEM, 0)
+        titulo.drawOn(c, MARGEM, altura_texto)
+
+    # --- Linhas variáveis ---
+
+    def _valor(self, rotulo: str, texto: str, y: float, objeto_texto=None) -> None:
+        """
+        Escreve o valor após um rótulo já desenhado (reduz a fonte se não couber na linha).
+        Com `objeto_texto`, acrescenta ao objeto de texto em vez de criar um por linha.
+        """
+        x = MARGEM + _largura_rotulo(rotulo)
+        tamanho = TAMANHO_FONTE
+        while tamanho > 6 and stringWidth(texto, FONTE, tamanho) > LARGURA_UTIL - (x - MARGEM):
+            tamanho -= 1
+        if objeto_texto is None:
+            self.canvas.setFont(FONTE, tamanho)
+            self.canvas.drawString(x, y, texto)
+        else:
+            objeto_texto.setFont(FONTE, tamanho)
+            objeto_texto.setTextOrigin(x, y)
+            objeto_texto.textOut(texto)
+
+    def _linha(self, rotulo: str, texto: str, y: float) -> float:
+        """Linha 'Rótulo: Valor' completa (rótulo variável); devolve o y da próxima linha."""
+        c = self.canvas
+        c.setFont(FONTE_NEGRITO, TAMANHO_FONTE)
+        c.setFillColor(black)
+        c.drawString(MARGEM, y, f"{rotulo}:")
+        self._valor(rotulo, texto, y)
+        return y - ENTRELINHA
+
+    def _secao(self, texto: str, y: float) -> float:
+        c = self.canvas
+        y -= 0.8*cm + 14
+        c.setFont(FONTE_NEGRITO, 14)
+        c.setFillColor(navy)
+        c.drawString(MARGEM, y, texto)
+        return y - 0.4*cm - ENTRELINHA
+
+    def _subtitulo(self, texto: str, y: float) -> float:
+        """Subtítulo sublinhado (estilo Destaque do relatório completo)."""
+        c = self.canvas
+        y -= 0.4*cm
+        c.setFont(FONTE_NEGRITO, 11)
+        c.drawString(MARGEM, y, texto)
+        c.line(MARGEM, y - 1.5, MARGEM + stringWidth(texto, FONTE_NEGRITO, 11), y - 1.5)
+        return y - 0.2*cm - ENTRELINHA
+
+    def _destaque(self, texto: str, y: float, tamanho: int = 15, centralizado: bool = True) -> float:
+        c = self.canvas
+        c.setFont(FONTE_NEGRITO, tamanho)
+        c.setFillColor(darkblue)
+        if centralizado:
+            c.drawCentredString(TAMANHO_PAGINA[0] / 2, y, texto)
+        else:
+            c.drawString(MARGEM, y, texto)
+        c.setFillColor(black)
+        return y - tamanho - 0.5*cm
+
+    def _nova_pagina_se_preciso(self, y: float, altura: float) -> float:
+        if y - altura < MARGEM:
+            self.canvas.showPage()
+            return TOPO - ENTRELINHA
+        return y
+
+    # --- Simulação ---
+
+    def desenhar_simulacao(self, dados_input: dict, calculos: dict) -> None:
+        """Acrescenta as páginas de uma simulação (dados, cálculos e observações) ao Canvas."""
+        self.desenhar_relatorio(montar_relatorio(dados_input, calculos))
+
+    def desenhar_relatorio(self, relatorio: Relatorio) -> None:
+        """Acrescenta as páginas de um relatório já montado (ver reports/modelo.py) ao Canvas."""
+        c = self.canvas
+        dados, *calculos = relatorio.secoes
+
+        # Página 1: dados informados (rótulos vêm do form; só os valores são escritos)
+        self._usar_form('modelo_dados', self._desenhar_estatico_dados)
+        c.setFillColor(black)
+        posicoes, _ = _layout_pagina_dados()
+        linhas_valor = iter(item for item in dados.itens if item[0] == 'linha') # Mesma ordem de LINHAS_DADOS
+        valores = c.beginText()
+        valores.setFont(FONTE, TAMANHO_FONTE)
+        for tipo, texto, y in posicoes:
+            if tipo == 'gerado_em':
+                valores.setTextOrigin(MARGEM, y)
+                valores.textOut(f"Relatório Gerado em: {relatorio.gerado_em.strftime('%d/%m/%Y %H:%M:%S')}")
+            elif tipo == 'advogado' and relatorio.advogado:
+                valores.setTextOrigin(MARGEM, y)
+                valores.textOut(f"Advogado(a): {relatorio.advogado}")
+            elif tipo == 'rotulo':
+                _, rotulo, texto_valor, _ = next(linhas_valor)
+                self._valor(rotulo, texto_valor, y, valores)
+        c.drawText(valores)
+        c.showPage()
+
+        # Páginas seguintes: seções de cálculo em sequência, quebrando a página quando necessário
+        y = TOPO + 0.8*cm # _secao desconta o espaço antes do título
+        for secao in calculos:
+            y = self._nova_pagina_se_preciso(y, 8 * ENTRELINHA)
+            y = self._secao(secao.titulo, y)
+            for tipo, rotulo, texto, valor in secao.itens:
+                y = self._nova_pagina_se_preciso(y, 2 * ENTRELINHA)
+                if tipo == 'espaco':
+                    y -= valor*cm
+                elif tipo == 'subtitulo':
+                    y = self._subtitulo(f"{rotulo}:", y)
+                elif tipo == 'linha':
+                    y = self._linha(rotulo, texto, y)
+                elif tipo == 'texto':
+                    y -= 0.3*cm
+                    c.setFont(FONTE, TAMANHO_FONTE)
+                    c.drawString(MARGEM, y, f"{rotulo}:")
+                    y -= ENTRELINHA
+                elif tipo == 'fator':
+                    c.setFont(FONTE, TAMANHO_FONTE)
+                    c.drawString(MARGEM + 0.5*cm, y, f"- {rotulo}: {texto}")
+                    y -= ENTRELINHA
+                elif tipo == 'destaque':
+                    y = self._destaque(f"{rotulo}: {texto}", y - 0.4*cm, tamanho=11, centralizado=False)
+                elif tipo == 'preco':
+                    y = self._destaque(f"{rotulo}: {texto}", y - 0.8*cm)
+
+        # Observações: o form é posicionado com uma translação até o y atual
+        altura_obs = _altura_observacoes()
+        y = self._nova_pagina_se_preciso(y - 1*cm, altura_obs)
+        c.saveState()
+        c.translate(0, y - altura_obs)
+        self._usar_form('modelo_observacoes', self._desenhar_observacoes)
+        c.restoreState()
+        c.showPage()
+
+    def salvar(self) -> None:
+        self.canvas.save()
+
+
+def gerar_pdf_rapido(destino, dados_input: dict, calculos: dict, rastreio: Rastreio | None = None) -> None:
+    """
+    Gera o relatório de uma simulação pelo caminho rápido.
+    `destino` é o caminho do arquivo (ou um arquivo binário aberto), como no Canvas do ReportLab.
+    """
+    renderizador = RenderizadorRapido(destino, titulo=f"Simulação Honorários - {dados_input.get('nome_advogado', 'Advogado')}")
+    renderizador.desenhar_simulacao(dados_input, calculos)
+    renderizador.salvar()
+    if rastreio is not None:
+        rastreio(f"\nPDF (modo rápido) gerado com sucesso: {destino}")
+
+
+def gerar_pdf_rapido_memoria(dados_input: dict, calculos: dict, buffer: BinaryIO | None = None) -> memoryview | None:
+    """Como gerar_pdf_memoria (reports/pdf_generator.py), pelo caminho rápido: escreve em `buffer` ou retorna uma memoryview."""
+    if buffer is not None:
+        gerar_pdf_rapido(buffer, dados_input, calculos)
+        return None
+    saida = io.BytesIO()
+    gerar_pdf_rapido(saida, dados_input, calculos)
+    return saida.getbuffer()
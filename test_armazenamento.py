@@ -0,0 +1,65 @@
+# test_armazenamento.py
+# Pasta de saída particionada e indexada (reports/armazenamento.py)
+import os
+from datetime import date, datetime, timedelta
+
+from reports.armazenamento import ArmazemRelatorios, nome_seguro
+
+DADOS = {'nome_advogado': "Maria Souza", 'area_servico_atual': "Civil",
+         'nivel_complexidade_servico': "Alta", 'nivel_urgencia_servico': "Normal"}
+CALCULOS = {'taxa_horaria_sugerida': 300.0, 'preco_horario_sugerido': 4500.0}
+
+
+def _gravar(armazem: ArmazemRelatorios, instante: datetime, tamanho: int = 100, advogado: str = "Maria Souza") -> str:
+    caminho = armazem.novo_caminho(advogado, instante)
+    with open(caminho, "wb") as arquivo:
+        arquivo.write(b"x" * tamanho)
+    armazem.registrar(caminho, {**DADOS, 'nome_advogado': advogado}, CALCULOS, instante=instante)
+    return caminho
+
+
+def test_caminhos_particionados_por_mes_e_advogado(tmp_path):
+    armazem = ArmazemRelatorios(str(tmp_path))
+    instante = datetime(2025, 3, 9, 14, 5, 0)
+    caminho = armazem.novo_caminho("Maria Souza/SP", instante)
+    assert os.path.relpath(caminho, tmp_path) == os.path.join(
+        "2025", "03", "Maria_Souza_SP", "Simulacao_Honorarios_Maria_Souza_SP_20250309_140500.pdf")
+    assert armazem.novo_caminho("Maria Souza/SP", instante, reservados={caminho}).endswith("_140500_2.pdf")
+    assert nome_seguro("  ") == "Advogado"
+
+
+def test_retencao_desativada_por_padrao(tmp_path):
+    armazem = ArmazemRelatorios(str(tmp_path))
+    caminhos = [_gravar(armazem, datetime.now() - timedelta(days=dias), 10**6) for dias in (3000, 400, 1)]
+    assert armazem.aplicar_retencao() == 0
+    assert all(os.path.exists(caminho) for caminho in caminhos)
+    assert armazem.estatisticas() == {'relatorios': 3, 'bytes': 3 * 10**6}
+
+
+def test_retencao_por_idade_e_quantidade(tmp_path):
+    armazem = ArmazemRelatorios(str(tmp_path), idade_maxima_dias=30, max_relatorios=2)
+    agora = datetime.now().replace(microsecond=0)
+    velho = _gravar(armazem, agora - timedelta(days=60))
+    recentes = [_gravar(armazem, agora - timedelta(days=dias)) for dias in (3, 2, 1)]
+    assert armazem.aplicar_retencao() == 2
+    assert not os.path.exists(velho) and not os.path.exists(recentes[0])
+    assert all(os.path.exists(caminho) for caminho in recentes[1:])
+    assert not os.path.exists(os.path.dirname(velho)) or os.listdir(os.path.dirname(velho))
+
+
+def test_retencao_por_tamanho(tmp_path):
+    armazem = ArmazemRelatorios(str(tmp_path), tamanho_maximo_mb=250 / 2**20)
+    agora = datetime.now().replace(microsecond=0)
+    caminhos = [_gravar(armazem, agora - timedelta(minutes=m)) for m in (3, 2, 1)]
+    assert armazem.aplicar_retencao() == 1
+    assert [os.path.exists(c) for c in caminhos] == [False, True, True]
+
+
+def test_buscar_pelo_indice(tmp_path):
+    armazem = ArmazemRelatorios(str(tmp_path))
+    _gravar(armazem, datetime(2025, 1, 10, 9), advogado="Ana")
+    _gravar(armazem, datetime(2025, 2, 10, 9), advogado="Ana")
+    _gravar(armazem, datetime(2025, 2, 11, 9), advogado="Bia")
+    assert [r['advogado'] for r in armazem.buscar(desde=date(2025, 2, 1))] == ["Bia", "Ana"]
+    (relatorio,) = armazem.buscar(advogado="Ana", ate=date(2025, 1, 10))
+    assert os.path.exists(relatorio['caminho']) and relatorio['preco'] == 4500.0
@@ -0,0 +1,89 @@
+# test_cache.py
+# Cache de relatórios endereçado por conteúdo (reports/cache.py)
+import os
+import time
+from datetime import date
+
+from reports import cache
+from reports.cache import CacheRelatorios, chave_relatorio
+
+
+def _gerador(conteudo: bytes, chamadas: list):
+    def gerar(caminho):
+        chamadas.append(caminho)
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(conteudo)
+    return gerar
+
+
+def test_chave_normaliza_entradas():
+    dados = {'nome_advogado': " Ana ", 'total_acoes_defendidas': 10, 'data_oab': date(2009, 3, 1)}
+    mesma = {'nome_advogado': "Ana", 'total_acoes_defendidas': 10.0, 'data_oab': date(2009, 3, 1)}
+    hoje = date(2025, 6, 30)
+    assert chave_relatorio(dados, data_referencia=hoje) == chave_relatorio(mesma, data_referencia=hoje)
+    assert chave_relatorio(dados, 'pdf', hoje) != chave_relatorio(dados, 'html', hoje)
+    assert chave_relatorio(dados, data_referencia=hoje) != chave_relatorio(dados, data_referencia=date(2025, 7, 1))
+
+
+def test_acerto_nao_altera_o_arquivo_entregue(tmp_path):
+    relatorios = CacheRelatorios(str(tmp_path / ".cache"))
+    chamadas = []
+    primeiro = str(tmp_path / "a.pdf")
+    assert relatorios.obter_ou_gerar("ab" * 32, primeiro, _gerador(b"%PDF-1", chamadas)) is False
+    antigo = time.time() - 86400
+    os.utime(primeiro, (antigo, antigo))
+
+    segundo = str(tmp_path / "b.pdf")
+    assert relatorios.obter_ou_gerar("ab" * 32, segundo, _gerador(b"outro", chamadas)) is True
+    assert chamadas == [primeiro]
+    assert open(segundo, "rb").read() == b"%PDF-1"
+    assert os.stat(primeiro).st_mtime == antigo # Mesmo inode do cache: o uso fica só no índice
+
+
+def test_entrada_removida_conta_como_ausente(tmp_path):
+    relatorios = CacheRelatorios(str(tmp_path / ".cache"))
+    chamadas = []
+    relatorios.obter_ou_gerar("cd" * 32, str(tmp_path / "a.pdf"), _gerador(b"x", chamadas))
+    os.remove(relatorios.caminho("cd" * 32)) # Como uma limpeza concorrente entre a consulta e o link
+    assert relatorios.obter("cd" * 32, str(tmp_path / "b.pdf")) is False
+    assert relatorios.obter_ou_gerar("cd" * 32, str(tmp_path / "c.pdf"), _gerador(b"x", chamadas)) is False
+    assert len(chamadas) == 2
+
+
+def test_limpeza_periodica_remove_os_menos_usados(tmp_path):
+    relatorios = CacheRelatorios(str(tmp_path / ".cache"), tamanho_maximo_mb=3 * 1000 / 2**20, limpar_a_cada=4)
+    chaves = [f"{i:02d}" * 32 for i in range(4)]
+    for i, chave in enumerate(chaves[:3]):
+        relatorios.obter_ou_gerar(chave, str(tmp_path / f"{i}.pdf"), _gerador(b"x" * 1000, []))
+    relatorios.obter(chaves[0], str(tmp_path / "reuso.pdf")) # A primeira volta a ser a mais recente
+    assert all(os.path.exists(relatorios.caminho(chave)) for chave in chaves[:3]) # Ainda sem limpeza
+
+    relatorios.obter_ou_gerar(chaves[3], str(tmp_path / "3.pdf"), _gerador(b"x" * 1000, [])) # 4ª gravação: limpa
+    restantes = [os.path.exists(relatorios.caminho(chave)) for chave in chaves]
+    assert restantes == [True, False, True, True]
+    assert os.path.exists(tmp_path / "1.pdf") # O arquivo entregue continua válido
+
+
+def test_limpeza_por_idade_e_indice_de_entradas_antigas(tmp_path):
+    diretorio = tmp_path / ".cache"
+    antiga = diretorio / "ef" / f"{'ef' * 32}.pdf" # Entrada de antes do índice existir
+    antiga.parent.mkdir(parents=True)
+    antiga.write_bytes(b"x")
+    instante = time.time() - 40 * 86400
+    os.utime(antiga, (instante, instante))
+
+    relatorios = CacheRelatorios(str(diretorio), idade_maxima_dias=30)
+    assert relatorios.obter("ef" * 32, str(tmp_path / "a.pdf")) is True # Indexada pela data de modificação
+    os.utime(antiga, (instante, instante))
+    assert relatorios.limpar()['removidos'] == 0 # O acerto renovou o uso no índice
+    with relatorios._conexao() as conexao:
+        conexao.execute("UPDATE entradas SET ultimo_uso = ?", (instante,))
+    assert relatorios.limpar() == {'removidos': 1, 'entradas': 0, 'bytes': 0}
+    assert not antiga.exists()
+
+
+def test_versao_do_cache_entra_na_chave(monkeypatch):
+    hoje = date(2025, 6, 30)
+    chave = chave_relatorio({}, data_referencia=hoje)
+    monkeypatch.setattr(cache, 'VERSAO_CACHE', cache.VERSAO_CACHE + 1)
+    assert chave_relatorio({}, data_referencia=hoje) != chave
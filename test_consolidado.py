@@ -0,0 +1,49 @@
+# test_consolidado.py
+# Relatório consolidado em blocos (reports/consolidado.py) e escritor de PDF em fluxo (reports/pdf_fluxo.py)
+import re
+import tracemalloc
+
+from core import formulas
+from reports.consolidado import gerar_relatorio_consolidado
+from reports.pdf_fluxo import _BlocoLido
+from test_relatorios import DADOS, HOJE
+
+CALCULOS = formulas.calcular_simulacao(DADOS, data_referencia=HOJE)
+
+
+def _simulacoes(n: int):
+    return (({**DADOS, 'nome_advogado': f"Advogada {i} (Ção)"}, CALCULOS) for i in range(1, n + 1))
+
+
+def _pico(caminho, n: int) -> int:
+    tracemalloc.start()
+    try:
+        gerar_relatorio_consolidado(str(caminho), _simulacoes(n), paginas_por_bloco=12)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_estrutura_do_pdf(tmp_path):
+    caminho = tmp_path / "consolidado.pdf"
+    assert gerar_relatorio_consolidado(str(caminho), _simulacoes(25), paginas_por_bloco=7) == \
+        {'simulacoes': 25, 'paginas': 76}
+    pdf = _BlocoLido(caminho.read_bytes())
+    for numero, (inicio, _) in pdf.limites.items(): # A xref aponta para o início de cada objeto
+        assert pdf.dados[inicio:].startswith(b"%d 0 obj" % numero)
+    paginas, _ = pdf.paginas()
+    assert len(paginas) == 76
+
+    dicionarios = [pdf.objeto(numero)[0] for numero in pdf.limites]
+    itens = [d for d in dicionarios if b"/Title" in d and b"/Parent 3 0 R" in d]
+    assert len(itens) == 26 # Uma entrada por simulação e o resumo
+    links = [int(m) for d in dicionarios for m in re.findall(rb"/Dest \[ (\d+) 0 R /Fit \].*/Subtype /Link", d, re.S)]
+    assert sorted(links) == [paginas[3 * i] for i in range(25)] # Cada linha do resumo leva à 1ª página da simulação
+    assert not any(b"/Dest /" in d for d in dicionarios) # Nenhum destino nomeado sem resolver
+
+
+def test_memoria_nao_cresce_com_o_numero_de_simulacoes(tmp_path):
+    _pico(tmp_path / "aquecimento.pdf", 2) # Estilos e modelo do pdf_rapido montados fora da medição
+    pequeno = _pico(tmp_path / "pequeno.pdf", 15)
+    grande = _pico(tmp_path / "grande.pdf", 120)
+    assert grande < pequeno + 256 * 1024 # Antes: ~25 KB a mais por simulação
@@ -0,0 +1,63 @@
+# test_historico.py
+# Histórico SQLite das simulações (core/historico.py)
+from datetime import date, datetime
+
+from core import historico
+from core.historico import HistoricoSimulacoes
+
+CALCULOS = {
+    'taxa_horaria_sugerida': 300.0, 'preco_horario_sugerido': 4500.0, 'preco_exito_sugerido': None,
+    'detalhes_taxa_horaria': {'Fatores Multiplicadores': {'Tempo Experiência': 1.5, 'Especialização (Pós)': 1.1}},
+    'detalhes_preco_horario': {'Fator Complexidade': 1.3, 'Fator Urgência': 1.0},
+}
+
+
+def _dados(advogado: str = "Ana", area: str = "Civil") -> dict:
+    return {'nome_advogado': advogado, 'area_servico_atual': area, 'data_oab': date(2009, 3, 1),
+            'horas_estimadas_servico': 15.0, 'nivel_complexidade_servico': "Alta", 'nivel_urgencia_servico': "Normal"}
+
+
+def _gravadas(banco: HistoricoSimulacoes) -> int:
+    with banco._conexao() as conexao:
+        return conexao.execute("SELECT COUNT(*) FROM simulacoes").fetchone()[0]
+
+
+def test_lote_cheio_e_gravado(tmp_path):
+    banco = HistoricoSimulacoes(str(tmp_path), tamanho_lote=3, intervalo_descarga=3600)
+    banco.registrar(_dados(), CALCULOS)
+    banco.registrar(_dados(), CALCULOS)
+    assert _gravadas(banco) == 0 and banco.estatisticas()['pendentes'] == 2
+    banco.registrar(_dados(), CALCULOS)
+    assert _gravadas(banco) == 3 and banco.estatisticas()['pendentes'] == 0
+
+
+def test_intervalo_de_descarga(tmp_path, monkeypatch):
+    relogio = [1000.0]
+    monkeypatch.setattr(historico.time, 'monotonic', lambda: relogio[0])
+    banco = HistoricoSimulacoes(str(tmp_path), tamanho_lote=50, intervalo_descarga=5)
+    banco.registrar(_dados(), CALCULOS)
+    assert _gravadas(banco) == 0
+    relogio[0] += 6
+    banco.registrar(_dados(), CALCULOS) # Primeira chamada depois do intervalo grava tudo
+    assert _gravadas(banco) == 2
+    banco.registrar(_dados(), CALCULOS)
+    assert banco.descarregar() == 1 and _gravadas(banco) == 3
+
+
+def test_buscar_inclui_pendentes_e_filtra(tmp_path):
+    banco = HistoricoSimulacoes(str(tmp_path), tamanho_lote=100, intervalo_descarga=3600)
+    banco.registrar(_dados("Ana", "Civil"), CALCULOS, instante=datetime(2025, 1, 10, 9))
+    banco.registrar(_dados("Bia", "Tributária"), {**CALCULOS, 'preco_horario_sugerido': 60000.0},
+                    instante=datetime(2025, 3, 5, 9))
+    (linha,) = banco.buscar(area="Tributária", preco_minimo=50000)
+    assert linha['advogado'] == "Bia" and linha['fator_complexidade'] == 1.3
+    assert linha['entradas']['data_oab'] == "2009-03-01"
+    assert [l['advogado'] for l in banco.buscar(desde=date(2025, 1, 1), ate=date(2025, 1, 10))] == ["Ana"]
+    assert banco.estatisticas() == {'simulacoes': 2, 'pendentes': 0}
+
+
+def test_registrar_lote_numa_transacao(tmp_path):
+    banco = HistoricoSimulacoes(str(tmp_path))
+    assert banco.registrar_lote((_dados(f"Adv {i}"), CALCULOS) for i in range(25)) == 25
+    assert _gravadas(banco) == 25
+    assert len(banco.buscar(limite=10)) == 10
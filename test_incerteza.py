@@ -0,0 +1,61 @@
+# test_incerteza.py
+# Simulação Monte Carlo do preço do serviço (core/incerteza.py)
+import numpy as np
+import pytest
+
+from core import constants, formulas
+from core.incerteza import Discreta, LogNormal, Triangular, simular_preco_servico
+
+TAXA = 320.0
+
+
+def test_entradas_fixas_reproduzem_o_preco_escalar():
+    dados = {'horas_estimadas_servico': 12.5, 'nivel_complexidade_servico': "Alta", 'nivel_urgencia_servico': "Imediata"}
+    preco, _ = formulas.calcular_preco_final_servico(TAXA, dados)
+    resultado = simular_preco_servico(TAXA, 12.5, "Alta", "Imediata", n_simulacoes=50, semente=1)
+    for chave in ('preco_p10', 'preco_p50', 'preco_p90', 'preco_medio', 'preco_minimo', 'preco_maximo'):
+        assert resultado[chave] == preco
+    assert resultado['preco_desvio_padrao'] == 0.0 and 'prob_preco_acima_causa' not in resultado
+
+
+def test_mesma_semente_mesmos_percentis():
+    argumentos = (TAXA, Triangular(8, 12, 30), Discreta({"Média": 3, "Alta": 1}), "Normal", LogNormal(50000, 0.5))
+    um = simular_preco_servico(*argumentos, n_simulacoes=5000, semente=42)
+    outro = simular_preco_servico(*argumentos, n_simulacoes=5000, semente=42)
+    assert um == outro
+    assert um['preco_p10'] < um['preco_p50'] < um['preco_p90']
+    assert 0.0 <= um['prob_preco_acima_causa'] <= 1.0
+    assert simular_preco_servico(*argumentos, n_simulacoes=5000, semente=43) != um
+
+
+def test_discreta_normaliza_os_pesos():
+    assert Discreta({"Média": 3, "Alta": 1}).probabilidades == {"Média": 0.75, "Alta": 0.25}
+    assert Discreta({"Baixa": 20, "Alta": 80}).probabilidades == {"Baixa": 0.2, "Alta": 0.8}
+    valores, probabilidades = Discreta({"Média": 1, "Alta": 1}).multiplicadores(constants.MULTIPLICADOR_COMPLEXIDADE,
+                                                                                "complexidade")
+    assert valores.tolist() == [constants.MULTIPLICADOR_COMPLEXIDADE["Média"], constants.MULTIPLICADOR_COMPLEXIDADE["Alta"]]
+    assert np.isclose(probabilidades.sum(), 1.0)
+
+
+@pytest.mark.parametrize('probabilidades', [{}, {"Alta": 0}, {"Alta": 1, "Média": -1}])
+def test_discreta_invalida(probabilidades):
+    with pytest.raises(ValueError):
+        Discreta(probabilidades)
+
+
+def test_nivel_desconhecido_e_rejeitado():
+    with pytest.raises(ValueError, match="complexidade desconhecido: Extrema"):
+        simular_preco_servico(TAXA, 10, Discreta({"Alta": 1, "Extrema": 1}), "Normal", n_simulacoes=10)
+    with pytest.raises(ValueError, match="urgência desconhecido: Ontem"):
+        simular_preco_servico(TAXA, 10, "Alta", "Ontem", n_simulacoes=10)
+
+
+@pytest.mark.parametrize('valores', [(-5, 10, 20), (0, 10, 20), (10, 5, 20), (10, 10, 10)])
+def test_triangular_invalida(valores):
+    with pytest.raises(ValueError, match="Triangular inválida"):
+        Triangular(*valores)
+
+
+def test_precos_simulados_sao_positivos():
+    resultado = simular_preco_servico(TAXA, Triangular(0.5, 2, 40), "Baixa", "Normal", n_simulacoes=20000, semente=7)
+    assert resultado['preco_minimo'] > 0
@@ -0,0 +1,77 @@
+# test_lote.py
+# Motor vetorizado (core/lote.py) x caminho escalar (core/formulas.py)
+import random
+from datetime import date, timedelta
+
+import numpy as np
+
+from core import constants, formulas, lote
+from core.validacao import CHAVES_ACOES_GANHAS
+
+HOJE = date(2025, 6, 30)
+
+
+def _perfil(sorteio: random.Random) -> dict:
+    graduacao = date(1990, 1, 1) + timedelta(days=sorteio.randint(0, 12000))
+    oab = graduacao + timedelta(days=sorteio.randint(0, 900))
+    pos = sorted({graduacao + timedelta(days=sorteio.randint(300, 9000)) for _ in range(sorteio.randint(0, 3))})
+    total = sorteio.randint(0, 400)
+    dados = {
+        'nome_advogado': "Teste", 'data_graduacao': graduacao, 'data_oab': oab,
+        'datas_pos_graduacao': [d for d in pos if d <= HOJE],
+        'total_acoes_defendidas': total,
+        'area_servico_atual': sorteio.choice(constants.AREAS_ATUACAO),
+        'gastos_educacao': sorteio.uniform(0, 80000),
+        'horas_trabalhadas_fds_total': sorteio.randint(0, 3000),
+        'taxa_horaria_base_minima': sorteio.uniform(50, 600),
+        'horas_estimadas_servico': sorteio.uniform(1, 200),
+        'nivel_complexidade_servico': sorteio.choice(constants.NIVEIS_COMPLEXIDADE),
+        'nivel_urgencia_servico': sorteio.choice(constants.NIVEIS_URGENCIA),
+    }
+    restantes = total
+    for chave in CHAVES_ACOES_GANHAS:
+        dados[chave] = sorteio.randint(0, restantes)
+        restantes -= dados[chave]
+    return dados
+
+
+def test_lote_reproduz_caminho_escalar():
+    sorteio = random.Random(2025)
+    perfis = [_perfil(sorteio) for _ in range(300)]
+    resultado = lote.calcular_lote(lote.colunas_de_dados(perfis), HOJE.toordinal())
+
+    for i, dados in enumerate(perfis):
+        taxa, detalhes = formulas.calcular_taxa_horaria_sugerida(dados, data_referencia=HOJE)
+        preco, _ = formulas.calcular_preco_final_servico(taxa, dados)
+        fatores = detalhes['Fatores Multiplicadores']
+        assert np.isclose(resultado['fator_tempo'][i], fatores['Tempo Experiência'], rtol=1e-12)
+        assert np.isclose(resultado['fator_especializacao'][i], fatores['Especialização (Pós)'], rtol=1e-12)
+        assert np.isclose(resultado['fator_pratica'][i], fatores['Experiência Prática (Casos)'], rtol=1e-12)
+        assert np.isclose(resultado['fator_educacao'][i], fatores['Investimento Educacional'], rtol=1e-12)
+        assert np.isclose(resultado['fator_dedicacao'][i], fatores['Dedicação (Horas Extras)'], rtol=1e-12)
+        assert np.isclose(resultado['taxa_horaria_sugerida'][i], taxa, rtol=1e-12)
+        assert np.isclose(resultado['preco_final'][i], preco, rtol=1e-12)
+
+
+def test_nivel_desconhecido_usa_multiplicador_neutro():
+    dados = _perfil(random.Random(1))
+    dados['nivel_complexidade_servico'] = "Inexistente"
+    resultado = lote.calcular_lote(lote.colunas_de_dados([dados]), HOJE.toordinal())
+    assert resultado['fator_complexidade'][0] == 1.0
+    assert np.isclose(resultado['preco_final'][0],
+                      resultado['preco_base'][0] * resultado['fator_urgencia'][0], rtol=1e-12)
+
+
+def test_lote_vazio():
+    resultado = lote.calcular_lote(lote.colunas_de_dados([]), HOJE.toordinal())
+    assert resultado['preco_final'].shape == (0,)
+
+
+def test_chaves_extras_de_acoes_ganhas_sao_ignoradas():
+    dados = _perfil(random.Random(7))
+    dados['acoes_ganhas_inexistente'] = 50 # Fora de CHAVES_ACOES_GANHAS: o caminho escalar não soma
+    taxa, detalhes = formulas.calcular_taxa_horaria_sugerida(dados, data_referencia=HOJE)
+    resultado = lote.calcular_lote(lote.colunas_de_dados([dados]), HOJE.toordinal())
+    assert np.isclose(resultado['fator_pratica'][0], detalhes['Fatores Multiplicadores']['Experiência Prática (Casos)'],
+                      rtol=1e-12)
+    assert np.isclose(resultado['taxa_horaria_sugerida'][0], taxa, rtol=1e-12)
@@ -0,0 +1,197 @@
+# test_parametros.py
+# Perfis de parâmetros compilados (core/parametros.py) e seu uso nas fórmulas, no lote e na sessão
+import json
+import pickle
+from datetime import date
+
+import numpy as np
+import pytest
+
+import main_lote
+from core import constants, formulas, lote
+from core.incerteza import Discreta, simular_preco_servico
+from core.parametros import Parametros, carregar_perfil, compilar_parametros, parametros_de_constantes
+from core.processamento_lote import converter_registro, processar_fluxo
+from core.registros import Servico
+from core.sessao import SessaoCalculo
+from core.validacao import CHAVES_ACOES_GANHAS, validar_dados_simulacao
+
+HOJE = date(2025, 6, 30)
+DADOS = dict(dict.fromkeys(CHAVES_ACOES_GANHAS, 0),
+             nome_advogado="Ana", data_graduacao=date(2008, 2, 10), data_oab=date(2009, 3, 1),
+             datas_pos_graduacao=[date(2012, 6, 15)], total_acoes_defendidas=120, acoes_ganhas_civil=40,
+             area_servico_atual="Civil", gastos_educacao=25000.0, horas_trabalhadas_fds_total=800,
+             taxa_horaria_base_minima=180.0, horas_estimadas_servico=12.5,
+             nivel_complexidade_servico="Alta", nivel_urgencia_servico="Imediata")
+
+PERFIL_TOML = """
+nome = "Escritório A"
+versao = "2025.2"
+PESO_ANO_POS_OAB = 0.04
+HORAS_NORMAIS_POR_ANO = 1760
+
+[MULTIPLICADOR_URGENCIA]
+Normal = 1.0
+Moderada = 1.1
+Alta = 1.3
+Imediata = 1.5
+"""
+
+
+@pytest.fixture
+def perfil_a(tmp_path):
+    caminho = tmp_path / "escritorio_a.toml"
+    caminho.write_text(PERFIL_TOML, encoding="utf-8")
+    return carregar_perfil(str(caminho))
+
+
+@pytest.fixture
+def perfil_b(tmp_path):
+    caminho = tmp_path / "escritorio_b.json"
+    caminho.write_text(json.dumps({'versao': 3, 'PESO_VOLUME_ACOES': 0.09,
+                                   'MULTIPLICADOR_COMPLEXIDADE': {"Baixa": 1, "Média": 1.3, "Alta": 1.7}}),
+                       encoding="utf-8")
+    return carregar_perfil(str(caminho))
+
+
+def test_carregar_perfis(perfil_a, perfil_b):
+    assert (perfil_a.nome, perfil_a.versao, perfil_a.PESO_ANO_POS_OAB) == ("Escritório A", "2025.2", 0.04)
+    assert perfil_a.PESO_VOLUME_ACOES == constants.PESO_VOLUME_ACOES # Ausente no perfil: vem de constants
+    assert (perfil_b.nome, perfil_b.versao) == ("escritorio_b", "3")
+    assert perfil_b.NIVEIS_COMPLEXIDADE == ("Baixa", "Média", "Alta")
+    assert perfil_b.TABELA_COMPLEXIDADE == (1.0, 1.3, 1.7, 1.0) # 1.0 no fim: código -1
+
+
+def test_perfil_imutavel(perfil_a):
+    with pytest.raises(AttributeError):
+        perfil_a.PESO_ANO_POS_OAB = 1.0
+    with pytest.raises(AttributeError):
+        del perfil_a.nome
+    with pytest.raises(TypeError):
+        perfil_a.MULTIPLICADOR_URGENCIA['Imediata'] = 9.0
+    alterado = perfil_a.com_alteracoes({'MULTIPLICADOR_URGENCIA.Imediata': 2.0})
+    assert perfil_a.MULTIPLICADOR_URGENCIA['Imediata'] == 1.5 and alterado.MULTIPLICADOR_URGENCIA['Imediata'] == 2.0
+    assert alterado.impressao != perfil_a.impressao and alterado != perfil_a
+
+
+def test_perfis_isolados_entre_si_e_de_constants(perfil_a, perfil_b):
+    tabela_original = dict(constants.MULTIPLICADOR_URGENCIA)
+    padrao = formulas.calcular_simulacao(DADOS, data_referencia=HOJE)['preco_horario_sugerido']
+    preco_a = formulas.calcular_simulacao(DADOS, data_referencia=HOJE, parametros=perfil_a)['preco_horario_sugerido']
+    preco_b = formulas.calcular_simulacao(DADOS, data_referencia=HOJE, parametros=perfil_b)['preco_horario_sugerido']
+    assert len({padrao, preco_a, preco_b}) == 3
+    assert formulas.calcular_simulacao(DADOS, data_referencia=HOJE)['preco_horario_sugerido'] == padrao
+    assert constants.MULTIPLICADOR_URGENCIA == tabela_original
+
+
+def test_lote_e_sessao_iguais_ao_escalar(perfil_a, perfil_b):
+    for perfil in (perfil_a, perfil_b):
+        esperado = formulas.calcular_simulacao(DADOS, data_referencia=HOJE, parametros=perfil)
+        resultado = lote.calcular_lote(lote.colunas_de_dados([DADOS], perfil), HOJE.toordinal(), perfil)
+        assert np.isclose(resultado['preco_final'][0], esperado['preco_horario_sugerido'], rtol=1e-12)
+        sessao = SessaoCalculo(DADOS, HOJE, perfil)
+        assert sessao.calcular()['preco_horario_sugerido'] == esperado['preco_horario_sugerido']
+    sessao.definir_parametros(perfil_a) # Troca de perfil: tudo é recalculado com o novo
+    assert sessao.calcular()['preco_horario_sugerido'] == \
+        formulas.calcular_simulacao(DADOS, data_referencia=HOJE, parametros=perfil_a)['preco_horario_sugerido']
+
+
+def test_impressao_depende_da_ordem_das_tabelas():
+    tabela = {"Baixa": 1.0, "Média": 1.3, "Alta": 1.7}
+    invertida = dict(reversed(tabela.items()))
+    um = compilar_parametros({'MULTIPLICADOR_COMPLEXIDADE': tabela})
+    outro = compilar_parametros({'MULTIPLICADOR_COMPLEXIDADE': invertida})
+    assert um.TABELA_COMPLEXIDADE != outro.TABELA_COMPLEXIDADE # Códigos de nível diferentes
+    assert um.impressao != outro.impressao and um != outro
+    assert compilar_parametros({'MULTIPLICADOR_COMPLEXIDADE': dict(tabela)}).impressao == um.impressao
+    assert compilar_parametros({'HORAS_NORMAIS_POR_ANO': 1760}).impressao == \
+        compilar_parametros({'HORAS_NORMAIS_POR_ANO': 1760.0}).impressao
+
+
+def test_pickle_pelo_conteudo(perfil_a):
+    copia = pickle.loads(pickle.dumps(perfil_a))
+    assert isinstance(copia, Parametros) and copia == perfil_a and copia.impressao == perfil_a.impressao
+    assert copia.TABELA_URGENCIA == perfil_a.TABELA_URGENCIA
+
+
+@pytest.mark.parametrize('valores', [{'PESO_INEXISTENTE': 1}, {'PESO_ANO_POS_OAB': -1}, {'PESO_ANO_POS_OAB': "0.1"},
+                                     {'HORAS_NORMAIS_POR_ANO': 0}, {'MIN_ACOES_PARA_SUCESSO_GERAL': 2.5},
+                                     {'MULTIPLICADOR_URGENCIA': {}}])
+def test_valores_invalidos(valores):
+    with pytest.raises(ValueError):
+        compilar_parametros(valores)
+
+
+def test_perfil_de_constantes_reproduz_o_padrao():
+    perfil = parametros_de_constantes()
+    assert formulas.calcular_simulacao(DADOS, data_referencia=HOJE, parametros=perfil)['preco_horario_sugerido'] == \
+        formulas.calcular_simulacao(DADOS, data_referencia=HOJE)['preco_horario_sugerido']
+
+
+# Perfil com níveis próprios (nenhum nome em comum com core.constants)
+NIVEIS_PROPRIOS = {'MULTIPLICADOR_COMPLEXIDADE': {"Simples": 1.0, "Complexa": 2.0},
+                   'MULTIPLICADOR_URGENCIA': {"Padrão": 1.0, "Expressa": 1.8}}
+REGISTRO = {
+    'nome_advogado': "Ana", 'data_graduacao': "10/02/2008", 'data_oab': "01/03/2009",
+    'datas_pos_graduacao': "15/06/2012", 'total_acoes_defendidas': "120", 'acoes_ganhas_civil': "40",
+    'area_servico_atual': "Civil", 'gastos_educacao': "25000", 'horas_trabalhadas_fds_total': "800",
+    'taxa_horaria_base_minima': "180", 'horas_estimadas_servico': "10",
+}
+
+
+@pytest.fixture
+def perfil_niveis():
+    return compilar_parametros({**NIVEIS_PROPRIOS, 'PESO_ANO_POS_OAB': 0.05}, "Níveis próprios")
+
+
+def test_niveis_do_perfil_na_conversao_e_na_validacao(perfil_niveis):
+    dados = converter_registro({**REGISTRO, 'nivel_complexidade_servico': "Complexa"}, HOJE, perfil_niveis)
+    assert (dados['nivel_complexidade_servico'], dados['nivel_urgencia_servico']) == ("Complexa", "Padrão")
+    validar_dados_simulacao(dados, HOJE, perfil_niveis)
+    with pytest.raises(ValueError, match="complexidade"):
+        validar_dados_simulacao(dados, HOJE) # Sem o perfil, "Complexa" não existe
+    with pytest.raises(ValueError, match="complexidade"):
+        converter_registro({**REGISTRO, 'nivel_complexidade_servico': "Complexa"}, HOJE)
+    with pytest.raises(ValueError, match="urgência"):
+        converter_registro({**REGISTRO, 'nivel_urgencia_servico': "Alta"}, HOJE, perfil_niveis)
+    servico = Servico(area_servico_atual="Civil", horas_estimadas_servico=5, parametros=perfil_niveis)
+    assert (servico.nivel_complexidade_servico, servico.nivel_urgencia_servico) == ("Simples", "Padrão")
+
+
+def test_fluxo_com_perfil_igual_ao_escalar(perfil_niveis):
+    registros = [{**REGISTRO, 'nivel_complexidade_servico': "Complexa", 'nivel_urgencia_servico': "Expressa"},
+                 REGISTRO, {**REGISTRO, 'nivel_complexidade_servico': "Alta"}]
+    ok, padrao, erro = processar_fluxo(registros, tamanho_bloco=2, hoje=HOJE, parametros=perfil_niveis)
+    assert (ok['status'], padrao['status'], erro['status']) == ('ok', 'ok', 'erro')
+    for linha, registro in ((ok, registros[0]), (padrao, registros[1])):
+        dados = converter_registro(registro, HOJE, perfil_niveis)
+        calculos = formulas.calcular_simulacao(dados, data_referencia=HOJE, parametros=perfil_niveis)
+        assert linha['preco_final'] == pytest.approx(calculos['preco_horario_sugerido'], rel=1e-12)
+    assert ok['preco_final'] == pytest.approx(padrao['preco_final'] * 2.0 * 1.8, rel=1e-12)
+
+
+def test_monte_carlo_usa_as_tabelas_do_perfil(perfil_niveis):
+    resultado = simular_preco_servico(200.0, 10, "Complexa", "Expressa", n_simulacoes=10, semente=1,
+                                      parametros=perfil_niveis)
+    esperado, _ = formulas.calcular_preco_final_servico(
+        200.0, {'horas_estimadas_servico': 10, 'nivel_complexidade_servico': "Complexa",
+                'nivel_urgencia_servico': "Expressa"}, parametros=perfil_niveis)
+    assert resultado['preco_p50'] == pytest.approx(esperado, rel=1e-12) and esperado == pytest.approx(7200.0)
+    with pytest.raises(ValueError, match="complexidade"):
+        simular_preco_servico(200.0, 10, Discreta({"Alta": 1}), "Padrão", parametros=perfil_niveis)
+
+
+def test_main_lote_com_perfil(tmp_path, perfil_niveis, capsys):
+    caminho_perfil = tmp_path / "perfil.json"
+    caminho_perfil.write_text(json.dumps(NIVEIS_PROPRIOS), encoding="utf-8")
+    entrada = tmp_path / "perfis.jsonl"
+    entrada.write_text(json.dumps({**REGISTRO, 'nivel_urgencia_servico': "Expressa"}) + "\n", encoding="utf-8")
+    saida = tmp_path / "resultados.jsonl"
+    argumentos = [str(entrada), "-o", str(saida), "--data-referencia", "30/06/2025"]
+    assert main_lote.main(argumentos) == 1 # Sem o perfil, "Expressa" é um nível inválido
+    assert main_lote.main([*argumentos, "--parametros", str(caminho_perfil)]) == 0
+    linha = json.loads(saida.read_text(encoding="utf-8"))
+    assert linha['status'] == 'ok'
+    with pytest.raises(SystemExit):
+        main_lote.main([*argumentos, "--parametros", str(tmp_path / "inexistente.json")])
+    assert "Perfil de parâmetros inválido" in capsys.readouterr().err
@@ -0,0 +1,107 @@
+# test_previa.py
+# Prévia ao vivo da GUI (gui/previa.py): erros por campo, números não finitos e o caminho incremental
+from datetime import date
+
+import pytest
+
+from core import formulas
+from core.sessao import SessaoCalculo
+from gui.previa import PreviaPreco, converter_campo
+
+HOJE = date(2025, 6, 30)
+TEXTOS = {
+    'data_graduacao': "10/02/2008", 'data_oab': "01/03/2009", 'total_acoes_defendidas': "120",
+    'acoes_ganhas_civil': "40", 'area_servico_atual': "Civil", 'gastos_educacao': "25.000,00",
+    'horas_trabalhadas_fds_total': "800", 'taxa_horaria_base_minima': "180", 'horas_estimadas_servico': "12,5",
+    'nivel_complexidade_servico': "Alta", 'nivel_urgencia_servico': "Normal", 'percentual_exito': "10",
+}
+
+
+def _previa() -> PreviaPreco:
+    previa = PreviaPreco(HOJE)
+    for chave, texto in TEXTOS.items():
+        previa.alterar(chave, texto)
+    previa.alterar_pos(["15/06/2012", ""])
+    return previa
+
+
+@pytest.mark.parametrize('texto', ["nan", "NaN", "inf", "-inf", "Infinity", "1e400"])
+@pytest.mark.parametrize('chave', ['gastos_educacao', 'horas_estimadas_servico', 'taxa_horaria_base_minima',
+                                   'percentual_exito', 'valor_estimado_causa_ganha'])
+def test_numeros_nao_finitos_sao_rejeitados(chave, texto):
+    with pytest.raises(ValueError, match=chave):
+        converter_campo(chave, texto, HOJE)
+
+
+@pytest.mark.parametrize('chave, texto, trecho', [
+    ('data_oab', "31/02/2020", "Data da OAB"),
+    ('data_graduacao', "01/01/2026", "futuro"),
+    ('total_acoes_defendidas', "-1", "inteiro"),
+    ('acoes_ganhas_civil', "2,5", "inteiro"),
+    ('area_servico_atual', "Penal", "Opção inválida"),
+    ('horas_estimadas_servico', "0,05", "mínimo"),
+    ('taxa_horaria_base_minima', "0,5", "mínimo"),
+    ('percentual_exito', "101", "entre 0 e 100"),
+    ('gastos_educacao', "-10", "negativo"),
+    ('gastos_educacao', "abc", "Insira um número"),
+])
+def test_erro_por_campo(chave, texto, trecho):
+    with pytest.raises(ValueError, match=trecho):
+        converter_campo(chave, texto, HOJE)
+    previa = _previa()
+    anterior = previa.valores[chave]
+    previa.alterar(chave, texto)
+    assert list(previa.erros) == [chave] and trecho in previa.erros[chave]
+    assert previa.valores[chave] == anterior # O último valor válido é mantido
+    with pytest.raises(ValueError, match=trecho):
+        previa.calcular()
+    previa.alterar(chave, TEXTOS[chave]) # Corrigido o campo, a prévia volta
+    assert not previa.erros and previa.calcular()['preco_horario_sugerido'] > 0
+
+
+def test_conversao_no_formato_brasileiro():
+    assert converter_campo('gastos_educacao', " 1.234,56 ", HOJE) == 1234.56
+    assert converter_campo('gastos_educacao', "", HOJE) == 0.0
+    assert converter_campo('total_acoes_defendidas', "", HOJE) == 0
+    assert converter_campo('data_oab', "01/03/2009", HOJE) == date(2009, 3, 1)
+
+
+def test_campos_obrigatorios_e_regras_entre_campos():
+    previa = PreviaPreco(HOJE)
+    with pytest.raises(ValueError, match="Preencha 'Data de Graduação'"):
+        previa.calcular()
+    previa = _previa()
+    previa.alterar('data_oab', "01/03/2007") # Válida sozinha, mas anterior à graduação
+    assert not previa.erros
+    with pytest.raises(ValueError, match="anterior"):
+        previa.calcular()
+
+
+def test_cada_alteracao_atualiza_a_sessao_uma_vez(monkeypatch):
+    chamadas = []
+    original = SessaoCalculo.atualizar
+
+    def _espiao(self, campos=None, **outros):
+        chamadas.append({**(campos or {}), **outros})
+        return original(self, campos, **outros)
+
+    monkeypatch.setattr(SessaoCalculo, 'atualizar', _espiao)
+    previa = _previa()
+    primeira = previa.calcular()
+    assert chamadas == [] # Antes da primeira prévia completa não há sessão
+    assert primeira == formulas.calcular_simulacao(previa.valores, data_referencia=HOJE)
+
+    previa.alterar('horas_estimadas_servico', "40")
+    assert chamadas == [{'horas_estimadas_servico': 40.0}]
+    calculos = previa.calcular()
+    assert previa._sessao.recalculados == ('preco', 'exito')
+    assert calculos == formulas.calcular_simulacao(previa.valores, data_referencia=HOJE)
+
+    previa.alterar('gastos_educacao', "30.000")
+    previa.calcular()
+    assert len(chamadas) == 2
+    assert previa._sessao.recalculados == ('Investimento Educacional', 'taxa', 'preco', 'exito')
+
+    previa.alterar('gastos_educacao', "nan") # Inválido: a sessão não é tocada
+    previa.alterar('nome_advogado', "Bia")   # Campo ignorado pela prévia
+    assert len(chamadas) == 2
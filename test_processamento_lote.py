@@ -0,0 +1,90 @@
+# test_processamento_lote.py
+# Leitura, validação e precificação em fluxo de core/processamento_lote.py
+import io
+import json
+from datetime import date
+
+import pytest
+
+from core import formulas
+from core.processamento_lote import (RegistroInvalido, converter_registro, escrever_resultados, ler_registros,
+                                     processar_fluxo)
+
+HOJE = date(2025, 6, 30)
+
+REGISTRO = {
+    'nome_advogado': "Ana", 'data_graduacao': "10/02/2008", 'data_oab': "01/03/2009",
+    'datas_pos_graduacao': "15/06/2012;20/11/2016", 'total_acoes_defendidas': "120",
+    'acoes_ganhas_civil': "40", 'acoes_ganhas_trabalhista': "15", 'area_servico_atual': "Civil",
+    'gastos_educacao': "25.000,00", 'horas_trabalhadas_fds_total': "800", 'taxa_horaria_base_minima': "180",
+    'horas_estimadas_servico': "12,5", 'nivel_complexidade_servico': "Alta", 'nivel_urgencia_servico': "Normal",
+}
+
+
+def _jsonl(*linhas: str) -> io.StringIO:
+    return io.StringIO("".join(linha + "\n" for linha in linhas))
+
+
+def test_jsonl_invalido_vira_linha_de_erro_e_o_resto_e_precificado():
+    entrada = _jsonl(json.dumps(REGISTRO), "{quebrado", "", "[1, 2]", json.dumps({**REGISTRO, 'nome_advogado': "Bia"}))
+    registros = list(ler_registros(entrada, 'jsonl'))
+    assert len(registros) == 4
+    assert isinstance(registros[1], RegistroInvalido) and "Linha 2" in registros[1].mensagem
+    assert isinstance(registros[2], RegistroInvalido) and "Linha 4" in registros[2].mensagem
+
+    saida = list(processar_fluxo(registros, hoje=HOJE))
+    assert [linha['status'] for linha in saida] == ['ok', 'erro', 'erro', 'ok']
+    assert saida[1]['erro'].startswith("Linha 2: JSON inválido")
+    assert "objeto JSON" in saida[2]['erro']
+    assert saida[3]['nome_advogado'] == "Bia" and saida[3]['preco_final'] > 0
+
+
+def test_erros_de_validacao_nao_interrompem_o_bloco():
+    registros = [REGISTRO, {**REGISTRO, 'data_oab': "31/02/2020"}, {**REGISTRO, 'total_acoes_defendidas': "-1"}, REGISTRO]
+    saida = list(processar_fluxo(registros, tamanho_bloco=3, hoje=HOJE))
+    assert [linha['status'] for linha in saida] == ['ok', 'erro', 'erro', 'ok']
+    assert [linha['linha'] for linha in saida] == [1, 2, 3, 4]
+    assert saida[0]['preco_final'] == saida[3]['preco_final']
+
+
+@pytest.mark.parametrize('valor', [3.7, "3.7", "3,5", "abc"])
+def test_inteiro_nao_inteiro_e_rejeitado(valor):
+    with pytest.raises(ValueError, match="total_acoes_defendidas"):
+        converter_registro({**REGISTRO, 'total_acoes_defendidas': valor})
+
+
+@pytest.mark.parametrize('chave, valor', [('horas_estimadas_servico', True), ('total_acoes_defendidas', False),
+                                         ('horas_estimadas_servico', float("nan")), ('gastos_educacao', float("inf")),
+                                         ('taxa_horaria_base_minima', "nan"), ('gastos_educacao', "-inf"),
+                                         ('horas_estimadas_servico', "1e400")])
+def test_booleanos_e_nao_finitos_sao_rejeitados(chave, valor):
+    with pytest.raises(ValueError, match=chave):
+        converter_registro({**REGISTRO, chave: valor})
+
+
+@pytest.mark.parametrize('campos, mensagem', [({'data_oab': "01/03/2000"}, "Data da OAB"),
+                                              ({'datas_pos_graduacao': "15/06/2012;01/01/2007"}, "Data de Pós 1")])
+def test_datas_anteriores_a_graduacao(campos, mensagem):
+    (linha,) = processar_fluxo([{**REGISTRO, **campos}], hoje=HOJE)
+    assert linha['status'] == 'erro' and linha['erro'].startswith(mensagem) and "graduação" in linha['erro']
+
+
+def test_numeros_no_formato_brasileiro():
+    dados = converter_registro({**REGISTRO, 'total_acoes_defendidas': 120.0})
+    assert dados['total_acoes_defendidas'] == 120 and isinstance(dados['total_acoes_defendidas'], int)
+    assert dados['gastos_educacao'] == 25000.0
+    assert dados['horas_estimadas_servico'] == 12.5
+
+
+def test_preco_do_fluxo_igual_ao_escalar():
+    (linha,) = processar_fluxo([REGISTRO], hoje=HOJE)
+    calculos = formulas.calcular_simulacao(converter_registro(REGISTRO), data_referencia=HOJE)
+    assert linha['preco_final'] == pytest.approx(calculos['preco_horario_sugerido'], rel=1e-12)
+    assert linha['taxa_horaria_sugerida'] == pytest.approx(calculos['taxa_horaria_sugerida'], rel=1e-12)
+
+
+def test_escrever_resultados_conta_por_status():
+    saida = processar_fluxo([REGISTRO, RegistroInvalido("Linha 2: JSON inválido.")], hoje=HOJE)
+    arquivo = io.StringIO()
+    assert escrever_resultados(saida, arquivo, 'csv') == {'ok': 1, 'erro': 1, 'rejeitado': 0}
+    assert arquivo.getvalue().splitlines()[0].startswith("linha,nome_advogado,status")
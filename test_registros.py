@@ -0,0 +1,75 @@
+# test_registros.py
+# Registros tipados de core/registros.py
+from datetime import date
+
+import pytest
+
+from core import formulas
+from core.registros import PerfilAdvogado, Servico, dados_simulacao, registros_de_dados
+
+HOJE = date(2025, 6, 30)
+
+PERFIL = dict(nome_advogado="Ana", data_graduacao=date(2008, 2, 10), data_oab=date(2009, 3, 1),
+              datas_pos_graduacao=[date(2016, 11, 20), date(2012, 6, 15), date(2012, 6, 15)],
+              total_acoes_defendidas=120, acoes_ganhas_civil=40, gastos_educacao=25000.0,
+              horas_trabalhadas_fds_total=800, taxa_horaria_base_minima=180.0)
+SERVICO = dict(area_servico_atual="Civil", horas_estimadas_servico=12.5, nivel_complexidade_servico="Alta")
+
+
+@pytest.mark.parametrize('valor', [3.7, "3.0", "abc", None, -1])
+def test_inteiro_invalido_tem_mensagem_do_campo(valor):
+    with pytest.raises(ValueError, match=r"^Valor inválido para 'acoes_ganhas_civil'\. Insira um número inteiro >= 0\.$"):
+        PerfilAdvogado(**{**PERFIL, 'acoes_ganhas_civil': valor}, hoje=HOJE)
+
+
+@pytest.mark.parametrize('valor, esperado', [(3, 3), (3.0, 3), ("3", 3), (" 3 ", 3)])
+def test_inteiro_valido(valor, esperado):
+    perfil = PerfilAdvogado(**{**PERFIL, 'acoes_ganhas_civil': valor}, hoje=HOJE)
+    assert perfil.acoes_ganhas_civil == esperado and type(perfil.acoes_ganhas_civil) is int
+
+
+def test_ida_e_volta_pelo_dicionario_dados():
+    perfil, servico = PerfilAdvogado(**PERFIL, hoje=HOJE), Servico(**SERVICO)
+    assert perfil.datas_pos_graduacao == (date(2012, 6, 15), date(2016, 11, 20))
+    dados = dados_simulacao(perfil, servico)
+    assert registros_de_dados(dados, HOJE) == (perfil, servico)
+    assert formulas.calcular_simulacao(dados, data_referencia=HOJE)['preco_horario_sugerido'] > 0
+
+
+def test_registros_nao_sao_hasheaveis():
+    perfil = PerfilAdvogado(**PERFIL, hoje=HOJE)
+    with pytest.raises(TypeError):
+        hash(perfil)
+    with pytest.raises(AttributeError):
+        perfil.campo_inexistente = 1
+
+
+def test_datas_em_texto_sao_convertidas_ou_rejeitadas_com_valueerror():
+    perfil = PerfilAdvogado(**{**PERFIL, 'data_graduacao': "10/02/2008", 'datas_pos_graduacao': ["15/06/2012"]},
+                            hoje=HOJE)
+    assert perfil.data_graduacao == date(2008, 2, 10) and perfil.datas_pos_graduacao == (date(2012, 6, 15),)
+    for valor in ("31/02/2008", "ontem", 2008, None):
+        with pytest.raises(ValueError, match="Data de Graduação inválida"):
+            PerfilAdvogado(**{**PERFIL, 'data_graduacao': valor}, hoje=HOJE)
+
+
+@pytest.mark.parametrize('campos, mensagem', [({'data_oab': date(2000, 1, 1)}, "Data da OAB não pode ser anterior"),
+                                              ({'datas_pos_graduacao': [date(2007, 1, 1)]}, "Data de Pós 1 anterior")])
+def test_datas_anteriores_a_graduacao(campos, mensagem):
+    with pytest.raises(ValueError, match=mensagem):
+        PerfilAdvogado(**{**PERFIL, **campos}, hoje=HOJE)
+
+
+@pytest.mark.parametrize('classe, campos, chave', [
+    (PerfilAdvogado, PERFIL, 'gastos_educacao'), (PerfilAdvogado, PERFIL, 'taxa_horaria_base_minima'),
+    (Servico, SERVICO, 'horas_estimadas_servico'), (Servico, SERVICO, 'percentual_exito'),
+    (Servico, SERVICO, 'valor_estimado_causa_ganha')])
+@pytest.mark.parametrize('valor', [float("nan"), float("inf"), True, "abc"])
+def test_numeros_nao_finitos_e_booleanos_sao_rejeitados(classe, campos, chave, valor):
+    with pytest.raises(ValueError, match=chave):
+        classe(**{**campos, chave: valor}, hoje=HOJE)
+
+
+def test_booleano_nao_e_inteiro():
+    with pytest.raises(ValueError, match="acoes_ganhas_civil"):
+        PerfilAdvogado(**{**PERFIL, 'acoes_ganhas_civil': True}, hoje=HOJE)
@@ -0,0 +1,44 @@
+# test_relatorios.py
+# Modelo do relatório (reports/modelo.py) e escritores leves (reports/exportadores.py)
+import csv
+import io
+import json
+from datetime import date
+
+from core import formulas
+from core.validacao import CHAVES_ACOES_GANHAS
+from reports import exportadores, modelo
+
+DADOS = dict(dict.fromkeys(CHAVES_ACOES_GANHAS, 0),
+             nome_advogado="Ana", data_graduacao=date(2008, 2, 10), data_oab=date(2009, 3, 1),
+             datas_pos_graduacao=[date(2012, 6, 15)], total_acoes_defendidas=120, acoes_ganhas_civil=40,
+             area_servico_atual="Civil", gastos_educacao=25000.0, horas_trabalhadas_fds_total=800,
+             taxa_horaria_base_minima=180.0, horas_estimadas_servico=12.5, valor_estimado_causa_ganha=90000.0,
+             nivel_complexidade_servico="Alta", nivel_urgencia_servico="Normal", percentual_exito=10.0)
+HOJE = date(2025, 6, 30)
+
+
+def _relatorio():
+    return modelo.montar_relatorio(DADOS, formulas.calcular_simulacao(DADOS, data_referencia=HOJE))
+
+
+def test_espacos_do_layout_original():
+    dados, _, preco, _ = _relatorio().secoes
+    espacos = [(i, item[3]) for i, item in enumerate(dados.itens) if item[0] == 'espaco']
+    assert [altura for _, altura in espacos] == [0.2, 0.2, 0.4, 0.2]
+    assert dados.itens[espacos[2][0] + 1][:2] == ('subtitulo', "Dados do Serviço Específico")
+    i = next(i for i, item in enumerate(preco.itens) if item[1] == "Preço Base (Taxa * Horas)")
+    assert preco.itens[i - 1] == ('espaco', "", "", 0.3)
+
+
+def test_exportadores_ignoram_espacos():
+    texto_json = exportadores.exportar_texto(DADOS, formulas.calcular_simulacao(DADOS, data_referencia=HOJE), 'json')
+    itens = [item for secao in json.loads(texto_json)['secoes'] for item in secao['itens']]
+    assert itens and all(item['tipo'] != 'espaco' for item in itens)
+
+    arquivo = io.StringIO()
+    exportadores.escrever_csv(arquivo, _relatorio())
+    arquivo.seek(0)
+    linhas = list(csv.DictReader(arquivo))
+    assert all(linha['tipo'] != 'espaco' for linha in linhas)
+    assert sum(linha['tipo'] == 'linha' for linha in linhas) == sum(item[0] == 'linha' for _, *item in _relatorio().itens())
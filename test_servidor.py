@@ -0,0 +1,137 @@
+# test_servidor.py
+# Serviço HTTP/JSON de precificação (api/servidor.py), numa porta livre e numa thread
+import http.client
+import json
+import socket
+import threading
+from datetime import date
+
+import pytest
+
+from api import servidor as modulo_servidor
+from api.servidor import ServicoPrecificacao
+from core import formulas
+from core.processamento_lote import converter_registro
+
+PERFIL = {
+    'nome_advogado': "Ana", 'data_graduacao': "10/02/2008", 'data_oab': "01/03/2009",
+    'datas_pos_graduacao': ["15/06/2012"], 'total_acoes_defendidas': 120, 'acoes_ganhas_civil': 40,
+    'area_servico_atual': "Civil", 'gastos_educacao': 25000, 'horas_trabalhadas_fds_total': 800,
+    'taxa_horaria_base_minima': 180, 'horas_estimadas_servico': 10,
+}
+
+
+@pytest.fixture(scope="module")
+def servidor():
+    servico = ServicoPrecificacao(("127.0.0.1", 0))
+    thread = threading.Thread(target=servico.serve_forever, daemon=True)
+    thread.start()
+    yield servico
+    servico.shutdown()
+    servico.server_close()
+
+
+@pytest.fixture
+def conexao(servidor):
+    conexao = http.client.HTTPConnection("127.0.0.1", servidor.server_address[1], timeout=10)
+    yield conexao
+    conexao.close()
+
+
+def _post(conexao, rota: str, corpo: dict) -> tuple[int, dict]:
+    conexao.request("POST", rota, json.dumps(corpo), {'Content-Type': "application/json"})
+    resposta = conexao.getresponse()
+    return resposta.status, json.loads(resposta.read())
+
+
+def _bruto(servidor, pedido: bytes) -> bytes:
+    """Envia um pedido HTTP cru e lê até o servidor fechar a conexão."""
+    with socket.create_connection(("127.0.0.1", servidor.server_address[1]), timeout=10) as sock:
+        sock.sendall(pedido)
+        partes = []
+        while parte := sock.recv(65536):
+            partes.append(parte)
+    return b"".join(partes)
+
+
+def test_varios_pedidos_na_mesma_conexao(conexao):
+    conexao.request("GET", "/saude")
+    resposta = conexao.getresponse()
+    assert resposta.status == 200 and json.loads(resposta.read())['status'] == 'ok'
+    portas = set()
+    for _ in range(3):
+        status, corpo = _post(conexao, "/taxa", {'perfil': PERFIL})
+        assert status == 200 and corpo['taxa_horaria_sugerida'] > 0
+        portas.add(conexao.sock.getsockname()[1])
+    assert len(portas) == 1 # Keep-alive: nenhuma reconexão
+
+
+def test_precificar_varios_servicos_igual_ao_escalar(conexao):
+    servicos = [{'horas_estimadas_servico': 10}, {'horas_estimadas_servico': 40, 'nivel_urgencia_servico': "Alta"},
+                {'horas_estimadas_servico': 0}]
+    status, corpo = _post(conexao, "/precificar", {'perfil': PERFIL, 'servicos': servicos})
+    assert status == 200
+    ok, outro, erro = corpo['resultados']
+    assert erro['status'] == 'erro'
+    dados = converter_registro({**PERFIL, **servicos[1]})
+    calculos = formulas.calcular_simulacao(dados, data_referencia=date.today())
+    assert outro['preco_final'] == pytest.approx(calculos['preco_horario_sugerido'], rel=1e-12)
+    assert ok['taxa_horaria_sugerida'] == outro['taxa_horaria_sugerida']
+
+
+@pytest.mark.parametrize('campo, valor', [('area_servico_atual', ["Civil"]), ('nivel_complexidade_servico', {}),
+                                          ('datas_pos_graduacao', [["15/06/2012"]]), ('nome_advogado', {'a': 1})])
+def test_valores_compostos_sao_rejeitados(conexao, campo, valor):
+    status, corpo = _post(conexao, "/taxa", {'perfil': {**PERFIL, campo: valor}})
+    assert status == 422 and campo in corpo['erro']
+    status, corpo = _post(conexao, "/precificar", {'perfil': PERFIL, 'servicos': [{campo: valor}, {}]})
+    assert status == 200 and [r['status'] for r in corpo['resultados']] == ['erro', 'ok']
+
+
+@pytest.mark.parametrize('tamanho', [b"abc", b"-5"])
+def test_content_length_invalido(servidor, tamanho):
+    resposta = _bruto(servidor, b"POST /taxa HTTP/1.1\r\nHost: x\r\nContent-Length: " + tamanho + b"\r\n\r\n{}")
+    assert resposta.startswith(b"HTTP/1.1 400")
+    assert resposta.count(b"HTTP/1.1") == 1 # Conexão fechada pelo servidor logo após o erro
+
+
+def test_erros_do_pedido(conexao):
+    conexao.request("POST", "/taxa", b"{quebrado", {'Content-Length': "9"})
+    resposta = conexao.getresponse()
+    assert resposta.status == 400 and "JSON" in json.loads(resposta.read())['erro']
+    assert _post(conexao, "/taxa", {})[0] == 400
+    assert _post(conexao, "/inexistente", {})[0] == 404
+    assert _post(conexao, "/relatorio?formato=doc", {'perfil': PERFIL})[0] == 400
+    assert _post(conexao, "/taxa", {'perfil': {**PERFIL, 'data_oab': "31/02/2020"}})[0] == 422
+
+
+def test_relatorio_leve(conexao):
+    conexao.request("POST", "/relatorio?formato=json", json.dumps({'perfil': PERFIL}))
+    resposta = conexao.getresponse()
+    assert resposta.status == 200 and resposta.getheader('Content-Type').startswith("application/json")
+    assert json.loads(resposta.read())['advogado'] == "Ana"
+
+
+@pytest.mark.parametrize('constante', ["NaN", "Infinity", "-Infinity"])
+def test_constantes_nao_finitas_sao_rejeitadas(conexao, constante):
+    corpo = json.dumps({'perfil': PERFIL})[:-2] + f', "gastos_educacao": {constante}}}}}'
+    conexao.request("POST", "/taxa", corpo, {'Content-Type': "application/json"})
+    resposta = conexao.getresponse()
+    assert resposta.status == 400 and constante.lstrip("-") in json.loads(resposta.read())['erro']
+
+
+@pytest.mark.parametrize('campo', ['gastos_educacao', 'horas_estimadas_servico', 'total_acoes_defendidas'])
+def test_booleanos_em_campos_numericos(conexao, campo):
+    status, corpo = _post(conexao, "/taxa", {'perfil': {**PERFIL, campo: True}})
+    assert status == 422 and campo in corpo['erro']
+    status, corpo = _post(conexao, "/precificar", {'perfil': PERFIL, 'servicos': [{'horas_estimadas_servico': True}, {}]})
+    assert status == 200 and [r['status'] for r in corpo['resultados']] == ['erro', 'ok']
+
+
+def test_resposta_nunca_leva_nan(conexao, monkeypatch):
+    monkeypatch.setitem(modulo_servidor.ROTAS, ('GET', '/nan'), lambda *_: ({'valor': float("nan")}, None))
+    conexao.request("GET", "/nan")
+    resposta = conexao.getresponse()
+    texto = resposta.read().decode("utf-8")
+    assert resposta.status == 500 and "NaN" not in texto
+    assert json.loads(texto) == {'erro': "Erro interno do servidor."}
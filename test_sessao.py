@@ -0,0 +1,130 @@
+# test_sessao.py
+# Sessão de cálculo incremental (core/sessao.py): equivalência com calcular_simulacao e etapas recalculadas
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from core import constants, formulas
+from core.sessao import CAMPOS_EXITO, CAMPOS_PRECO, DEPENDENCIAS_FATORES, SessaoCalculo
+from core.validacao import CHAVES_ACOES_GANHAS
+
+HOJE = date(2025, 6, 30)
+DADOS = dict(dict.fromkeys(CHAVES_ACOES_GANHAS, 0),
+             nome_advogado="Ana", data_graduacao=date(2008, 2, 10), data_oab=date(2009, 3, 1),
+             datas_pos_graduacao=[date(2012, 6, 15)], total_acoes_defendidas=120, acoes_ganhas_civil=40,
+             area_servico_atual="Civil", gastos_educacao=25000.0, horas_trabalhadas_fds_total=800,
+             taxa_horaria_base_minima=180.0, horas_estimadas_servico=12.5, valor_estimado_causa_ganha=90000.0,
+             nivel_complexidade_servico="Alta", nivel_urgencia_servico="Normal", percentual_exito=10.0)
+
+ETAPAS = (*DEPENDENCIAS_FATORES, 'taxa', 'preco', 'exito')
+
+
+def _data(rng: random.Random, inicio: date, fim: date) -> date:
+    return inicio + timedelta(days=rng.randrange((fim - inicio).days + 1))
+
+
+# Campo -> sorteio de um valor válido (faixas de datas disjuntas mantêm graduação <= OAB <= pós-graduações)
+SORTEIOS = {
+    'data_graduacao': lambda rng: _data(rng, date(1990, 1, 1), date(2004, 12, 31)),
+    'data_oab': lambda rng: _data(rng, date(2005, 1, 1), date(2009, 12, 31)),
+    'datas_pos_graduacao': lambda rng: sorted(_data(rng, date(2010, 1, 1), date(2024, 12, 31))
+                                              for _ in range(rng.randrange(4))),
+    'total_acoes_defendidas': lambda rng: rng.randrange(0, 600),
+    **{chave: (lambda rng: rng.randrange(0, 60)) for chave in CHAVES_ACOES_GANHAS},
+    'area_servico_atual': lambda rng: rng.choice(constants.AREAS_ATUACAO),
+    'gastos_educacao': lambda rng: round(rng.uniform(0, 200000), 2),
+    'horas_trabalhadas_fds_total': lambda rng: rng.randrange(0, 3000),
+    'taxa_horaria_base_minima': lambda rng: round(rng.uniform(50, 800), 2),
+    'horas_estimadas_servico': lambda rng: rng.choice([0, 1, 2.5, 10, 40, 120]),
+    'nivel_complexidade_servico': lambda rng: rng.choice(constants.NIVEIS_COMPLEXIDADE),
+    'nivel_urgencia_servico': lambda rng: rng.choice(constants.NIVEIS_URGENCIA),
+    'percentual_exito': lambda rng: rng.choice([0.0, 5.0, 10.0, 33.3]),
+    'valor_estimado_causa_ganha': lambda rng: round(rng.uniform(0, 1e6), 2),
+}
+
+
+def _etapas_esperadas(campos: set[str], data_mudou: bool = False) -> tuple[str, ...]:
+    """Etapas que uma alteração deve recalcular, derivadas direto do grafo (fatores -> taxa -> preço -> êxito)."""
+    sujas = {fator for fator, dependencias in DEPENDENCIAS_FATORES.items() if campos & set(dependencias)}
+    if data_mudou:
+        sujas |= {'Tempo Experiência', 'Dedicação (Horas Extras)'}
+    if sujas or 'taxa_horaria_base_minima' in campos:
+        sujas.add('taxa')
+    if 'taxa' in sujas or campos & CAMPOS_PRECO:
+        sujas.add('preco')
+    if 'preco' in sujas or campos & CAMPOS_EXITO:
+        sujas.add('exito')
+    return tuple(etapa for etapa in ETAPAS if etapa in sujas)
+
+
+def test_sequencias_aleatorias_iguais_ao_calculo_completo():
+    rng = random.Random(20240611)
+    campos = sorted(SORTEIOS)
+    for _ in range(3000):
+        sessao = SessaoCalculo(DADOS, HOJE)
+        sessao.calcular()
+        dados, referencia = dict(DADOS), HOJE
+        for _ in range(rng.randrange(1, 5)):
+            alterados, data_mudou = set(), False
+            for campo in rng.sample(campos, rng.randrange(1, 4)):
+                valor = SORTEIOS[campo](rng)
+                if valor != dados[campo]:
+                    alterados.add(campo)
+                dados[campo] = valor
+                sessao.atualizar({campo: valor})
+            if rng.random() < 0.1:
+                nova = _data(rng, date(2024, 1, 1), date(2030, 12, 31))
+                data_mudou, referencia = nova != referencia, nova
+                sessao.definir_data_referencia(nova)
+            calculos = sessao.calcular()
+            assert calculos == formulas.calcular_simulacao(dados, data_referencia=referencia)
+            assert sessao.recalculados == _etapas_esperadas(alterados, data_mudou)
+
+
+@pytest.mark.parametrize('campo, valor, etapas', [
+    ('gastos_educacao', 30000.0, ('Investimento Educacional', 'taxa', 'preco', 'exito')),
+    ('taxa_horaria_base_minima', 200.0, ('Investimento Educacional', 'taxa', 'preco', 'exito')),
+    ('data_oab', date(2010, 1, 1), ('Tempo Experiência', 'Dedicação (Horas Extras)', 'taxa', 'preco', 'exito')),
+    ('datas_pos_graduacao', [], ('Tempo Experiência', 'Especialização (Pós)', 'taxa', 'preco', 'exito')),
+    ('acoes_ganhas_civil', 41, ('Experiência Prática (Casos)', 'taxa', 'preco', 'exito')),
+    ('area_servico_atual', "Trabalhista", ('Experiência Prática (Casos)', 'taxa', 'preco', 'exito')),
+    ('horas_estimadas_servico', 40, ('preco', 'exito')),
+    ('nivel_urgencia_servico', "Imediata", ('preco', 'exito')),
+    ('percentual_exito', 20.0, ('exito',)),
+    ('nome_advogado', "Bia", ()),
+])
+def test_recalcula_so_as_etapas_afetadas(campo, valor, etapas):
+    sessao = SessaoCalculo(DADOS, HOJE)
+    assert sessao.calcular() and sessao.recalculados == ETAPAS # Primeiro cálculo: tudo
+    sessao.atualizar({campo: valor})
+    calculos = sessao.calcular()
+    assert sessao.recalculados == etapas
+    assert calculos == formulas.calcular_simulacao({**DADOS, campo: valor}, data_referencia=HOJE)
+
+
+def test_valor_igual_e_segunda_leitura_nao_recalculam():
+    sessao = SessaoCalculo(DADOS, HOJE)
+    sessao.calcular()
+    assert sessao.atualizar(gastos_educacao=DADOS['gastos_educacao'],
+                            datas_pos_graduacao=list(DADOS['datas_pos_graduacao'])) == set()
+    sessao.calcular()
+    assert sessao.recalculados == ()
+    sessao.atualizar(horas_estimadas_servico=1)
+    sessao.calcular()
+    sessao.calcular()
+    assert sessao.recalculados == ()
+
+
+def test_data_de_referencia_e_lista_do_chamador():
+    sessao = SessaoCalculo(DADOS, HOJE)
+    sessao.calcular()
+    sessao.definir_data_referencia(date(2030, 1, 1))
+    sessao.calcular()
+    assert sessao.recalculados == ('Tempo Experiência', 'Dedicação (Horas Extras)', 'taxa', 'preco', 'exito')
+    pos = [date(2015, 1, 1)]
+    sessao.atualizar(datas_pos_graduacao=pos)
+    pos.append(date(2016, 1, 1)) # Alterar a lista depois não afeta a sessão...
+    assert sessao.calcular() == formulas.calcular_simulacao({**DADOS, 'datas_pos_graduacao': [date(2015, 1, 1)]},
+                                                            data_referencia=date(2030, 1, 1))
+    assert sessao.atualizar(datas_pos_graduacao=pos) # ...e reenviá-la é percebido como mudança
@@ -0,0 +1,207 @@
+# test_tarefas.py
+# Fila assíncrona de tarefas (api/tarefas.py): admissão, contrapressão, cancelamento, retenção e consulta
+import asyncio
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from api import tarefas
+from api.tarefas import FilaCheia, FilaTarefas
+
+REGISTRO = {
+    'nome_advogado': "Ana", 'data_graduacao': "10/02/2008", 'data_oab': "01/03/2009",
+    'datas_pos_graduacao': ["15/06/2012"], 'total_acoes_defendidas': 120, 'acoes_ganhas_civil': 40,
+    'area_servico_atual': "Civil", 'gastos_educacao': 25000, 'horas_trabalhadas_fds_total': 800,
+    'taxa_horaria_base_minima': 180, 'horas_estimadas_servico': 10,
+}
+
+
+@pytest.fixture
+def portao(monkeypatch):
+    """Renderização em threads, presa até o teste liberar o portão (sem processos)."""
+    liberado = threading.Event()
+
+    def _renderizar(dados, formato, hoje):
+        liberado.wait(10)
+        return f"{dados['nome_advogado']}.{formato}".encode("utf-8")
+
+    monkeypatch.setattr(tarefas, '_renderizar', _renderizar)
+    monkeypatch.setattr(FilaTarefas, '_novo_pool', lambda self: ThreadPoolExecutor(self.limite_relatorios))
+    yield liberado
+    liberado.set() # Não deixa threads presas se o teste falhar
+
+
+async def _ocupar_trabalhador(fila: FilaTarefas):
+    """Envia um relatório e espera o (único) trabalhador pegá-lo, deixando a fila vazia."""
+    tarefa = fila.enviar_relatorio(REGISTRO)
+    while tarefa.estado != 'executando':
+        await asyncio.sleep(0)
+    return tarefa
+
+
+def test_fila_cheia_recusa_na_hora(portao):
+    async def cenario():
+        async with FilaTarefas(limite_relatorios=1, capacidade_relatorios=2) as fila:
+            em_execucao = await _ocupar_trabalhador(fila)
+            na_fila = [fila.enviar_relatorio(REGISTRO) for _ in range(2)]
+            quantidade = len(fila._tarefas)
+            with pytest.raises(FilaCheia):
+                fila.enviar_relatorio(REGISTRO)
+            assert len(fila._tarefas) == quantidade # A recusa não cria tarefa
+            assert fila.estatisticas() == {'na_fila': 2, 'executando': 1, 'concluidas': 0, 'erros': 0,
+                                           'descartadas': 1}
+            portao.set()
+            for tarefa in [em_execucao, *na_fila]:
+                assert (await fila.aguardar(tarefa.id, timeout=10)).resultado == b"Ana.pdf"
+            assert fila.estatisticas()['concluidas'] == 3
+
+    asyncio.run(cenario())
+
+
+def test_contrapressao_aguarda_vaga(portao):
+    async def cenario():
+        async with FilaTarefas(limite_relatorios=1, capacidade_relatorios=1) as fila:
+            await _ocupar_trabalhador(fila)
+            fila.enviar_relatorio(REGISTRO)
+            produtor = asyncio.create_task(fila.enviar_relatorio_aguardando(REGISTRO, 'json'))
+            await asyncio.sleep(0.05)
+            assert not produtor.done() # Suspenso até abrir vaga
+            portao.set()
+            tarefa = await asyncio.wait_for(produtor, 10)
+            assert (await fila.aguardar(tarefa.id, timeout=10)).resultado == b"Ana.json"
+            assert fila.estatisticas()['descartadas'] == 0
+
+    asyncio.run(cenario())
+
+
+def test_cancelar_libera_a_vaga(portao):
+    async def cenario():
+        async with FilaTarefas(limite_relatorios=1, capacidade_relatorios=2) as fila:
+            em_execucao = await _ocupar_trabalhador(fila)
+            primeira, segunda = fila.enviar_relatorio(REGISTRO), fila.enviar_relatorio(REGISTRO)
+            assert fila.cancelar(primeira.id) and primeira.estado == 'cancelada'
+            assert fila.estatisticas()['na_fila'] == 1
+            terceira = fila.enviar_relatorio(REGISTRO) # A vaga da cancelada já está livre
+            assert not fila.cancelar(primeira.id) # Já finalizada
+            assert not fila.cancelar(em_execucao.id) # Em execução vai até o fim
+            assert not fila.cancelar(999)
+            portao.set()
+            for tarefa in (em_execucao, segunda, terceira):
+                assert (await fila.aguardar(tarefa.id, timeout=10)).estado == 'concluida'
+            assert primeira.resultado is None
+
+    asyncio.run(cenario())
+
+
+def test_cancelar_libera_produtor_aguardando(portao):
+    async def cenario():
+        async with FilaTarefas(limite_relatorios=1, capacidade_relatorios=1) as fila:
+            await _ocupar_trabalhador(fila)
+            na_fila = fila.enviar_relatorio(REGISTRO)
+            produtor = asyncio.create_task(fila.enviar_relatorio_aguardando(REGISTRO))
+            await asyncio.sleep(0.05)
+            fila.cancelar(na_fila.id)
+            tarefa = await asyncio.wait_for(produtor, 1) # Entrou sem esperar o trabalhador
+            assert tarefa.estado == 'na_fila' and fila.estatisticas()['na_fila'] == 1
+            portao.set()
+            assert (await fila.aguardar(tarefa.id, timeout=10)).estado == 'concluida'
+
+    asyncio.run(cenario())
+
+
+def test_retencao_descarta_as_mais_antigas():
+    fila = FilaTarefas(tarefas_guardadas=3)
+    ids = [fila.precificar(REGISTRO).id for _ in range(5)]
+    assert [fila.consultar(i) is not None for i in ids] == [False, False, True, True, True]
+    assert len(fila._tarefas) == 3
+    with pytest.raises(ValueError):
+        FilaTarefas(tarefas_guardadas=0)
+
+
+def test_consulta_de_estado():
+    async def cenario():
+        fila = FilaTarefas()
+        ok = fila.precificar(REGISTRO)
+        resumo = ok.resumo()
+        assert resumo['estado'] == 'concluida' and resumo['resultado']['preco_final'] > 0
+        json.dumps(resumo) # Serializável como está
+        erro = fila.precificar({**REGISTRO, 'data_oab': "31/02/2020"})
+        assert erro.estado == 'erro' and erro.erro and erro.resultado is None
+        assert fila.consultar(ok.id) is ok and fila.consultar(999) is None
+        assert (await fila.aguardar(ok.id, timeout=1)) is ok
+        with pytest.raises(KeyError):
+            await fila.aguardar(999)
+        with pytest.raises(RuntimeError): # Relatórios exigem a fila iniciada
+            fila.enviar_relatorio(REGISTRO)
+
+    asyncio.run(cenario())
+
+
+def test_aguardar_com_timeout(portao):
+    async def cenario():
+        async with FilaTarefas(limite_relatorios=1) as fila:
+            tarefa = fila.enviar_relatorio(REGISTRO)
+            with pytest.raises(asyncio.TimeoutError):
+                await fila.aguardar(tarefa.id, timeout=0.05)
+            with pytest.raises(ValueError):
+                fila.enviar_relatorio(REGISTRO, formato='doc')
+            portao.set()
+            assert (await fila.aguardar(tarefa.id, timeout=10)).resumo()['tamanho'] == len(b"Ana.pdf")
+
+    asyncio.run(cenario())
+
+
+def test_encerrar_cancela_o_que_esta_na_fila(portao):
+    async def cenario():
+        fila = FilaTarefas(limite_relatorios=1, capacidade_relatorios=4)
+        await fila.iniciar()
+        await _ocupar_trabalhador(fila)
+        na_fila = [fila.enviar_relatorio(REGISTRO) for _ in range(3)]
+        portao.set()
+        await fila.encerrar()
+        assert {tarefa.estado for tarefa in na_fila} == {'cancelada'}
+
+    asyncio.run(cenario())
+
+
+class _PoolQuebrado(ThreadPoolExecutor):
+    """Pool cujo processo "morreu": toda submissão falha com BrokenProcessPool."""
+
+    def submit(self, *args, **kwargs):
+        futuro = Future()
+        futuro.set_exception(BrokenProcessPool("processo encerrado"))
+        return futuro
+
+
+def test_pool_quebrado_e_recriado(monkeypatch):
+    pools = []
+
+    def _novo_pool(self):
+        pools.append(_PoolQuebrado(1) if not pools else ThreadPoolExecutor(1))
+        return pools[-1]
+
+    monkeypatch.setattr(FilaTarefas, '_novo_pool', _novo_pool)
+    monkeypatch.setattr(tarefas, '_renderizar', lambda dados, formato, hoje: b"ok")
+
+    async def cenario():
+        async with FilaTarefas(limite_relatorios=1) as fila:
+            perdida = await fila.aguardar(fila.enviar_relatorio(REGISTRO).id, timeout=10)
+            assert perdida.estado == 'erro' and "interrompido" in perdida.erro
+            assert len(pools) == 2 and fila._pool is pools[1]
+            seguinte = await fila.aguardar(fila.enviar_relatorio(REGISTRO).id, timeout=10)
+            assert seguinte.estado == 'concluida' and seguinte.resultado == b"ok"
+
+    asyncio.run(cenario())
+
+
+def test_relatorio_num_processo_do_pool():
+    async def cenario():
+        async with FilaTarefas(limite_relatorios=1) as fila:
+            tarefa = await fila.aguardar(fila.enviar_relatorio(REGISTRO, formato='json').id, timeout=60)
+            assert tarefa.estado == 'concluida', tarefa.erro
+            assert json.loads(tarefa.resultado)['advogado'] == "Ana"
+
+    asyncio.run(cenario())
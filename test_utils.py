@@ -0,0 +1,78 @@
+# test_utils.py
+# Formatação pt_BR e leitura de datas de core/utils.py (e a versão em coluna de core/lote.py)
+import locale
+import random
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from core import lote
+from core.utils import formatar_moeda, formatar_moeda_lote, formatar_numero, formatar_numero_lote, parse_data
+
+
+@pytest.mark.parametrize('valor, esperado', [
+    (0, "R$ 0,00"), (1234.5, "R$ 1.234,50"), (1234567.891, "R$ 1.234.567,89"),
+    (-1234.5, "-R$ 1.234,50"), (None, "N/A"), ("abc", "Inválido"),
+])
+def test_formatar_moeda(valor, esperado):
+    assert formatar_moeda(valor) == esperado
+
+
+def test_formatar_numero():
+    assert formatar_numero(1234567.8912, 3) == "1.234.567,891"
+    assert formatar_numero(12, 0) == "12"
+    assert formatar_numero(None) == "N/A"
+
+
+def test_formatacao_nao_depende_do_locale():
+    anterior = locale.setlocale(locale.LC_ALL)
+    try:
+        locale.setlocale(locale.LC_ALL, "C")
+        assert formatar_moeda(9876.5) == "R$ 9.876,50"
+    finally:
+        locale.setlocale(locale.LC_ALL, anterior)
+
+
+def test_versoes_em_lote_iguais_as_escalares():
+    valores = [0.0, 1.005, -42.42, 1e9, None, 1234.5]
+    assert formatar_moeda_lote(valores) == [formatar_moeda(v) for v in valores]
+    assert formatar_numero_lote(valores, 1) == [formatar_numero(v, 1) for v in valores]
+    assert formatar_moeda_lote(np.array([1.5, -2.25])) == ["R$ 1,50", "-R$ 2,25"]
+
+
+def _parse_strptime(texto: str) -> date | None:
+    """Implementação de referência (a anterior, por tentativa com strptime)."""
+    for formato in ("%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d", "%d%m%Y"):
+        try:
+            data_obj = datetime.strptime(texto.strip(), formato).date()
+        except ValueError:
+            continue
+        return data_obj if 1900 <= data_obj.year <= date.today().year + 1 else None
+    return None
+
+
+def test_parse_data_igual_ao_strptime():
+    sorteio = random.Random(7)
+    textos = []
+    for _ in range(3000):
+        data_obj = date(1890, 1, 1) + timedelta(days=sorteio.randint(0, 60000))
+        textos += [data_obj.strftime("%d/%m/%Y"), data_obj.strftime("%d-%m-%Y"),
+                   data_obj.strftime("%Y-%m-%d"), data_obj.strftime("%d%m%Y")]
+    textos += ["31/02/2020", "29/02/2023", "29/02/2024", "00/01/2000", "1/2/2003", " 05/06/2007 ", "2020/01/01", "abc"]
+    for texto in textos:
+        assert parse_data(texto) == _parse_strptime(texto), texto
+
+
+@pytest.mark.parametrize('texto', [None, "", "   ", "10/10", "１０/１０/２０１０"])
+def test_parse_data_invalidas(texto):
+    assert parse_data(texto) is None
+
+
+def test_ordinais_de_textos_iguais_ao_parse_escalar():
+    textos = ["01/03/2009", "2015-12-31", "inválida", "", None, "01/03/2009"]
+    ordinais, validos = lote.ordinais_de_textos(textos)
+    esperados = [parse_data(t).toordinal() if isinstance(t, str) and parse_data(t) else 0 for t in textos]
+    assert ordinais.tolist() == esperados
+    assert validos.tolist() == [o > 0 for o in esperados]
+    assert lote.ordinais_para_datetime64(ordinais)[1] == np.datetime64("2015-12-31")